@@ -2,11 +2,105 @@
 #include <pybind11/stl.h>
 #include <pybind11/numpy.h>
 #include "../include/evaluator.hpp"
+#include <algorithm>
+#include <optional>
+#include <string>
+#include <utility>
+#include <vector>
 #include <cuda_runtime.h>
 
 namespace py = pybind11;
 using namespace pybind11::literals; // to enable _a literal
 
+// Names of exam::SimdLevel values, indexed by the enum value
+const std::vector<std::string> simd_level_names = {"scalar", "sse2", "avx2"};
+
+using EvaluateFn = void (*)(const int8_t*, size_t, const int8_t*, size_t, exam::ScoringRule, exam::Result*);
+
+// CPU evaluators accepted by evaluate_into, by mode name
+const std::vector<std::pair<std::string, EvaluateFn>> into_evaluators = {
+    {"serial", exam::evaluate_serial},
+    {"openmp", exam::evaluate_openmp},
+    {"pthreads", exam::evaluate_pthreads},
+    {"simd", exam::evaluate_simd},
+    {"openmp_simd", exam::evaluate_simd_openmp},
+    {"pthreads_simd", exam::evaluate_simd_pthreads},
+};
+
+// Moves a C++ vector to the heap and exposes it as a NumPy array that owns the buffer (no copy).
+template <typename T>
+py::array_t<T> vector_to_array(std::vector<T>&& values) {
+    auto* owned = new std::vector<T>(std::move(values));
+    py::capsule owner(owned, [](void* p) { delete static_cast<std::vector<T>*>(p); });
+    return py::array_t<T>({owned->size()}, {sizeof(T)}, owned->data(), owner);
+}
+
+// Validates the inputs, runs the given evaluator and returns a structured array
+// (fields: score, correct, wrong, blank) backed by the C++ result buffer.
+template <EvaluateFn Evaluate>
+py::array_t<exam::Result> evaluate_to_array(py::array_t<int8_t, py::array::c_style | py::array::forcecast> answers_arr,
+                                            py::array_t<int8_t, py::array::c_style | py::array::forcecast> key_arr,
+                                            exam::ScoringRule rule) {
+    py::buffer_info answers_buf = answers_arr.request();
+    py::buffer_info key_buf = key_arr.request();
+
+    if (answers_buf.ndim != 2)
+        throw py::value_error("answers_arr must be a 2D array");
+    if (key_buf.ndim != 1)
+        throw py::value_error("key_arr must be a 1D array");
+
+    size_t num_students = answers_buf.shape[0];
+    size_t num_questions = answers_buf.shape[1];
+
+    if (num_questions != static_cast<size_t>(key_buf.shape[0]))
+        throw py::value_error("Number of questions in answers_arr must match length of key_arr");
+
+    std::vector<exam::Result> results(num_students);
+    {
+        // The buffers stay alive through the argument references; Python objects are built after reacquiring the GIL
+        py::gil_scoped_release release;
+        Evaluate(static_cast<const int8_t*>(answers_buf.ptr), num_students,
+                 static_cast<const int8_t*>(key_buf.ptr), num_questions, rule, results.data());
+    }
+    return vector_to_array(std::move(results));
+}
+
+using WeightedEvaluateFn = void (*)(const int8_t*, size_t, const int8_t*, size_t, exam::QuestionWeights, exam::Result*);
+using WeightArray = py::array_t<double, py::array::c_style | py::array::forcecast>;
+
+// Same as evaluate_to_array but with per-question correct/wrong/blank weights (one value per question each).
+template <WeightedEvaluateFn Evaluate>
+py::array_t<exam::Result> evaluate_weighted_to_array(py::array_t<int8_t, py::array::c_style | py::array::forcecast> answers_arr,
+                                                     py::array_t<int8_t, py::array::c_style | py::array::forcecast> key_arr,
+                                                     WeightArray correct_arr, WeightArray wrong_arr, WeightArray blank_arr) {
+    py::buffer_info answers_buf = answers_arr.request();
+    py::buffer_info key_buf = key_arr.request();
+
+    if (answers_buf.ndim != 2)
+        throw py::value_error("answers_arr must be a 2D array");
+    if (key_buf.ndim != 1)
+        throw py::value_error("key_arr must be a 1D array");
+
+    size_t num_students = answers_buf.shape[0];
+    size_t num_questions = answers_buf.shape[1];
+
+    if (num_questions != static_cast<size_t>(key_buf.shape[0]))
+        throw py::value_error("Number of questions in answers_arr must match length of key_arr");
+    for (const WeightArray* weights_arr : {&correct_arr, &wrong_arr, &blank_arr}) {
+        if (weights_arr->ndim() != 1 || static_cast<size_t>(weights_arr->shape(0)) != num_questions)
+            throw py::value_error("Weight arrays must be 1D with one weight per question");
+    }
+
+    exam::QuestionWeights weights{correct_arr.data(), wrong_arr.data(), blank_arr.data()};
+    std::vector<exam::Result> results(num_students);
+    {
+        py::gil_scoped_release release;
+        Evaluate(static_cast<const int8_t*>(answers_buf.ptr), num_students,
+                 static_cast<const int8_t*>(key_buf.ptr), num_questions, weights, results.data());
+    }
+    return vector_to_array(std::move(results));
+}
+
 PYBIND11_MODULE(pyevalcore, m) {
     m.doc() = "pyevalcore: A C++ extension for evaluating expressions.";
 
@@ -23,6 +117,10 @@ PYBIND11_MODULE(pyevalcore, m) {
         .def_readwrite("wrong", &exam::Result::wrong)
         .def_readwrite("blank", &exam::Result::blank);
 
+    PYBIND11_NUMPY_DTYPE(exam::Result, score, correct, wrong, blank);
+    m.attr("RESULT_DTYPE") = py::dtype::of<exam::Result>();
+    m.attr("ANNULLED_KEY") = exam::kAnnulledKey;
+
     m.def("run_serial", [](py::array_t<int8_t> answers_arr, py::array_t<int8_t> key_arr, exam::ScoringRule rule) {
         py::buffer_info answers_buf = answers_arr.request();
         py::buffer_info key_buf = key_arr.request();
@@ -42,7 +140,10 @@ PYBIND11_MODULE(pyevalcore, m) {
         const int8_t* key_ptr = static_cast<int8_t*>(key_buf.ptr);
 
         std::vector<exam::Result> results(num_students);
-        exam::evaluate_serial(answers_ptr, num_students, key_ptr, num_questions, rule, results.data());
+        {
+            py::gil_scoped_release release;  // Only the evaluation runs without the GIL
+            exam::evaluate_serial(answers_ptr, num_students, key_ptr, num_questions, rule, results.data());
+        }
 
         // Convert results to a list of dictionaries for easier DataFrame conversion in Python
         py::list py_results;
@@ -57,6 +158,20 @@ PYBIND11_MODULE(pyevalcore, m) {
         return py_results;
     }, "Evaluates answers in serial mode.");
 
+    m.def("encode_answers", [](py::array_t<uint8_t, py::array::c_style | py::array::forcecast> cells_arr, int8_t invalid_code) {
+        py::buffer_info cells_buf = cells_arr.request();
+
+        py::array_t<int8_t> encoded(cells_buf.shape);
+        py::buffer_info encoded_buf = encoded.request();
+
+        {
+            py::gil_scoped_release release;
+            exam::encode_answers(static_cast<const uint8_t*>(cells_buf.ptr), static_cast<size_t>(cells_buf.size), static_cast<int8_t*>(encoded_buf.ptr), invalid_code);
+        }
+        return encoded;
+    }, "Encodes single-byte answer cells ('A'-'D') into int8 codes (0-3, -1 for blank, invalid_code otherwise) using a lookup table.",
+       py::arg("cells"), py::arg("invalid_code") = -1);
+
     m.def("get_device_count", [](){
         int count;
         cudaGetDeviceCount(&count);
@@ -82,7 +197,10 @@ PYBIND11_MODULE(pyevalcore, m) {
         const int8_t* key_ptr = static_cast<int8_t*>(key_buf.ptr);
 
         std::vector<exam::Result> results(num_students);
-        exam::evaluate_cuda(answers_ptr, num_students, key_ptr, num_questions, rule, results.data());
+        {
+            py::gil_scoped_release release;  // Only the evaluation runs without the GIL
+            exam::evaluate_cuda(answers_ptr, num_students, key_ptr, num_questions, rule, results.data());
+        }
 
         // Convert results to a list of dictionaries for easier DataFrame conversion in Python
         py::list py_results;
@@ -116,7 +234,10 @@ PYBIND11_MODULE(pyevalcore, m) {
         const int8_t* key_ptr = static_cast<int8_t*>(key_buf.ptr);
 
         std::vector<exam::Result> results(num_students);
-        exam::evaluate_openmp(answers_ptr, num_students, key_ptr, num_questions, rule, results.data());
+        {
+            py::gil_scoped_release release;  // Only the evaluation runs without the GIL
+            exam::evaluate_openmp(answers_ptr, num_students, key_ptr, num_questions, rule, results.data());
+        }
 
         // Convert results to a list of dictionaries for easier DataFrame conversion in Python
         py::list py_results;
@@ -150,7 +271,10 @@ PYBIND11_MODULE(pyevalcore, m) {
         const int8_t* key_ptr = static_cast<int8_t*>(key_buf.ptr);
 
         std::vector<exam::Result> results(num_students);
-        exam::evaluate_pthreads(answers_ptr, num_students, key_ptr, num_questions, rule, results.data());
+        {
+            py::gil_scoped_release release;  // Only the evaluation runs without the GIL
+            exam::evaluate_pthreads(answers_ptr, num_students, key_ptr, num_questions, rule, results.data());
+        }
 
         // Convert results to a list of dictionaries for easier DataFrame conversion in Python
         py::list py_results;
@@ -164,4 +288,400 @@ PYBIND11_MODULE(pyevalcore, m) {
         }
         return py_results;
     }, "Evaluates answers in pthreads mode.");
+
+    // Columnar entry points: return a structured NumPy array instead of a list of dicts
+    m.def("run_serial_array", &evaluate_to_array<exam::evaluate_serial>,
+          "Evaluates answers in serial mode and returns a structured array (score, correct, wrong, blank).");
+    m.def("run_openmp_array", &evaluate_to_array<exam::evaluate_openmp>,
+          "Evaluates answers in OpenMP mode and returns a structured array (score, correct, wrong, blank).");
+    m.def("run_cuda_array", &evaluate_to_array<exam::evaluate_cuda>,
+          "Evaluates answers in CUDA mode and returns a structured array (score, correct, wrong, blank).");
+    m.def("run_pthreads_array", &evaluate_to_array<exam::evaluate_pthreads>,
+          "Evaluates answers in pthreads mode and returns a structured array (score, correct, wrong, blank).");
+
+    // Branch-free SIMD kernels (AVX2/SSE2 selected at runtime, scalar fallback)
+    m.def("run_simd_array", &evaluate_to_array<exam::evaluate_simd>,
+          "Evaluates answers with the SIMD kernel on one thread and returns a structured array.");
+    m.def("run_openmp_simd_array", &evaluate_to_array<exam::evaluate_simd_openmp>,
+          "Evaluates answers in OpenMP mode with the SIMD inner loop and returns a structured array.");
+    m.def("run_pthreads_simd_array", &evaluate_to_array<exam::evaluate_simd_pthreads>,
+          "Evaluates answers in pthreads mode with the SIMD inner loop and returns a structured array.");
+    m.def("simd_instruction_set", []() {
+        return simd_level_names.at(static_cast<size_t>(exam::simd_level()));
+    }, "Returns the instruction set used by the SIMD kernels ('avx2', 'sse2' or 'scalar').");
+    m.def("set_simd_instruction_set", [](const std::string& name) {
+        auto it = std::find(simd_level_names.begin(), simd_level_names.end(), name);
+        if (it == simd_level_names.end())
+            throw py::value_error("instruction set must be 'scalar', 'sse2' or 'avx2'");
+        exam::SimdLevel level = exam::set_simd_level(static_cast<exam::SimdLevel>(it - simd_level_names.begin()));
+        return simd_level_names.at(static_cast<size_t>(level));
+    }, py::arg("name"),
+       "Limits the SIMD kernels to the given instruction set (capped at what the CPU supports); returns the effective one.");
+
+    // Writes into a caller-provided result buffer (e.g. a window of a memory-mapped results file) instead of allocating one
+    m.def("evaluate_into", [](py::array_t<int8_t, py::array::c_style | py::array::forcecast> answers_arr,
+                              py::array_t<int8_t, py::array::c_style | py::array::forcecast> key_arr,
+                              exam::ScoringRule rule,
+                              py::array_t<exam::Result, py::array::c_style> out_arr,
+                              const std::string& mode) {
+        const auto evaluator = std::find_if(into_evaluators.begin(), into_evaluators.end(),
+                                            [&mode](const auto& entry) { return entry.first == mode; });
+        if (evaluator == into_evaluators.end())
+            throw py::value_error("mode must be one of 'serial', 'openmp', 'pthreads', 'simd', 'openmp_simd' or 'pthreads_simd'");
+
+        py::buffer_info answers_buf = answers_arr.request();
+        py::buffer_info key_buf = key_arr.request();
+        if (answers_buf.ndim != 2)
+            throw py::value_error("answers_arr must be a 2D array");
+        if (key_buf.ndim != 1)
+            throw py::value_error("key_arr must be a 1D array");
+        size_t num_students = answers_buf.shape[0];
+        size_t num_questions = answers_buf.shape[1];
+        if (num_questions != static_cast<size_t>(key_buf.shape[0]))
+            throw py::value_error("Number of questions in answers_arr must match length of key_arr");
+        if (out_arr.ndim() != 1 || static_cast<size_t>(out_arr.shape(0)) != num_students)
+            throw py::value_error("out must be a 1D array with one entry per student");
+
+        exam::Result* out = out_arr.mutable_data();
+        {
+            py::gil_scoped_release release;
+            evaluator->second(static_cast<const int8_t*>(answers_buf.ptr), num_students,
+                              static_cast<const int8_t*>(key_buf.ptr), num_questions, rule, out);
+        }
+    }, py::arg("answers"), py::arg("key"), py::arg("rule"), py::arg("out").noconvert(), py::arg("mode") = "openmp_simd",
+       "Evaluates answers with the given CPU mode and writes the results into out (RESULT_DTYPE, one entry per student).");
+
+    // Weighted scoring: per-question correct/wrong/blank weights instead of the scalar ScoringRule
+    m.def("run_weighted_serial_array", &evaluate_weighted_to_array<exam::evaluate_weighted_serial>,
+          py::arg("answers"), py::arg("key"), py::arg("correct"), py::arg("wrong"), py::arg("blank"),
+          "Evaluates answers in serial mode with per-question weights and returns a structured array.");
+    m.def("run_weighted_openmp_array", &evaluate_weighted_to_array<exam::evaluate_weighted_openmp>,
+          py::arg("answers"), py::arg("key"), py::arg("correct"), py::arg("wrong"), py::arg("blank"),
+          "Evaluates answers in OpenMP mode with per-question weights and returns a structured array.");
+    m.def("run_weighted_pthreads_array", &evaluate_weighted_to_array<exam::evaluate_weighted_pthreads>,
+          py::arg("answers"), py::arg("key"), py::arg("correct"), py::arg("wrong"), py::arg("blank"),
+          "Evaluates answers in pthreads mode with per-question weights and returns a structured array.");
+
+    // Section subscores (students x sections) computed in the same pass as the totals
+    m.def("run_sections_array", [](py::array_t<int8_t, py::array::c_style | py::array::forcecast> answers_arr,
+                                   py::array_t<int8_t, py::array::c_style | py::array::forcecast> key_arr,
+                                   py::array_t<int32_t, py::array::c_style | py::array::forcecast> sections_arr,
+                                   size_t num_sections, exam::ScoringRule rule) {
+        py::buffer_info answers_buf = answers_arr.request();
+        py::buffer_info key_buf = key_arr.request();
+        py::buffer_info sections_buf = sections_arr.request();
+
+        if (answers_buf.ndim != 2)
+            throw py::value_error("answers_arr must be a 2D array");
+        if (key_buf.ndim != 1 || sections_buf.ndim != 1)
+            throw py::value_error("key_arr and sections must be 1D arrays");
+
+        size_t num_students = answers_buf.shape[0];
+        size_t num_questions = answers_buf.shape[1];
+
+        if (num_questions != static_cast<size_t>(key_buf.shape[0]) || num_questions != static_cast<size_t>(sections_buf.shape[0]))
+            throw py::value_error("key_arr and sections must have one entry per question");
+
+        const int32_t* sections_ptr = static_cast<const int32_t*>(sections_buf.ptr);
+        for (size_t j = 0; j < num_questions; ++j) {
+            if (sections_ptr[j] < -1 || (sections_ptr[j] >= 0 && static_cast<size_t>(sections_ptr[j]) >= num_sections))
+                throw py::value_error("sections contains an index outside [-1, num_sections)");
+        }
+
+        std::vector<exam::Result> results(num_students);
+        py::array_t<double> subscores({num_students, num_sections});
+        double* subscores_ptr = static_cast<double*>(subscores.request().ptr);
+        {
+            py::gil_scoped_release release;
+            exam::evaluate_sections(static_cast<const int8_t*>(answers_buf.ptr), num_students,
+                                    static_cast<const int8_t*>(key_buf.ptr), num_questions,
+                                    sections_ptr, num_sections, rule, results.data(), subscores_ptr);
+        }
+        return py::make_tuple(vector_to_array(std::move(results)), subscores);
+    }, "Evaluates answers and returns (results, subscores) where subscores is a students x sections matrix.",
+       py::arg("answers"), py::arg("key"), py::arg("sections"), py::arg("num_sections"), py::arg("rule"));
+
+    m.def("combine_sections", [](py::array_t<double, py::array::c_style | py::array::forcecast> subscores_arr,
+                                 py::array_t<double, py::array::c_style | py::array::forcecast> coefficients_arr) {
+        py::buffer_info subscores_buf = subscores_arr.request();
+        py::buffer_info coefficients_buf = coefficients_arr.request();
+
+        if (subscores_buf.ndim != 2 || coefficients_buf.ndim != 2)
+            throw py::value_error("subscores and coefficients must be 2D arrays");
+        if (subscores_buf.shape[1] != coefficients_buf.shape[1])
+            throw py::value_error("coefficients must have one column per section");
+
+        size_t num_students = subscores_buf.shape[0];
+        size_t num_sections = subscores_buf.shape[1];
+        size_t num_careers = coefficients_buf.shape[0];
+
+        py::array_t<double> composites({num_students, num_careers});
+        double* composites_ptr = static_cast<double*>(composites.request().ptr);
+        {
+            py::gil_scoped_release release;
+            exam::combine_sections(static_cast<const double*>(subscores_buf.ptr), num_students, num_sections,
+                                   static_cast<const double*>(coefficients_buf.ptr), num_careers, composites_ptr);
+        }
+        return composites;
+    }, "Combines section subscores (students x sections) with career coefficients (careers x sections) into composites (students x careers).",
+       py::arg("subscores"), py::arg("coefficients"));
+
+    // Incremental rescoring: applies only the delta of the changed questions to previous results
+    m.def("rescore_questions", [](py::array_t<int8_t, py::array::c_style | py::array::forcecast> answers_arr,
+                                  py::array_t<exam::Result, py::array::c_style | py::array::forcecast> results_arr,
+                                  py::array_t<int32_t, py::array::c_style | py::array::forcecast> questions_arr,
+                                  py::array_t<int8_t, py::array::c_style | py::array::forcecast> old_key_arr,
+                                  py::array_t<int8_t, py::array::c_style | py::array::forcecast> new_key_arr,
+                                  exam::ScoringRule rule) {
+        py::buffer_info answers_buf = answers_arr.request();
+        py::buffer_info results_buf = results_arr.request();
+        py::buffer_info questions_buf = questions_arr.request();
+        py::buffer_info old_key_buf = old_key_arr.request();
+        py::buffer_info new_key_buf = new_key_arr.request();
+
+        if (answers_buf.ndim != 2)
+            throw py::value_error("answers_arr must be a 2D array");
+        if (results_buf.ndim != 1 || questions_buf.ndim != 1 || old_key_buf.ndim != 1 || new_key_buf.ndim != 1)
+            throw py::value_error("results, questions, old_key and new_key must be 1D arrays");
+
+        size_t num_students = answers_buf.shape[0];
+        size_t num_questions = answers_buf.shape[1];
+        size_t num_changed = questions_buf.shape[0];
+
+        if (num_students != static_cast<size_t>(results_buf.shape[0]))
+            throw py::value_error("results must have one entry per student");
+        if (num_changed != static_cast<size_t>(old_key_buf.shape[0]) || num_changed != static_cast<size_t>(new_key_buf.shape[0]))
+            throw py::value_error("old_key and new_key must have one entry per changed question");
+
+        const int32_t* questions_ptr = static_cast<const int32_t*>(questions_buf.ptr);
+        for (size_t c = 0; c < num_changed; ++c) {
+            if (questions_ptr[c] < 0 || static_cast<size_t>(questions_ptr[c]) >= num_questions)
+                throw py::value_error("questions contains an index outside answers_arr");
+        }
+
+        const exam::Result* previous = static_cast<const exam::Result*>(results_buf.ptr);
+        std::vector<exam::Result> results(previous, previous + num_students);
+        {
+            py::gil_scoped_release release;
+            exam::rescore_questions(static_cast<const int8_t*>(answers_buf.ptr), num_students, num_questions,
+                                    questions_ptr, static_cast<const int8_t*>(old_key_buf.ptr),
+                                    static_cast<const int8_t*>(new_key_buf.ptr), num_changed, rule, results.data());
+        }
+        return vector_to_array(std::move(results));
+    }, "Rescores previous results after key corrections, touching only the changed questions (ANNULLED_KEY annuls a question).",
+       py::arg("answers"), py::arg("results"), py::arg("questions"), py::arg("old_key"), py::arg("new_key"), py::arg("rule"));
+
+    // Ranking: merit order and competition/dense ranks with an optional secondary key
+    m.def("rank_scores", [](py::array_t<double, py::array::c_style | py::array::forcecast> scores_arr,
+                            std::optional<py::array_t<double, py::array::c_style | py::array::forcecast>> tiebreak_arr,
+                            const std::string& method) {
+        py::buffer_info scores_buf = scores_arr.request();
+        if (scores_buf.ndim != 1)
+            throw py::value_error("scores must be a 1D array");
+        if (method != "competition" && method != "dense")
+            throw py::value_error("method must be 'competition' or 'dense'");
+        size_t num_students = scores_buf.shape[0];
+
+        const double* tiebreak_ptr = NULL;
+        if (tiebreak_arr) {
+            py::buffer_info tiebreak_buf = tiebreak_arr->request();
+            if (tiebreak_buf.ndim != 1 || static_cast<size_t>(tiebreak_buf.shape[0]) != num_students)
+                throw py::value_error("tiebreak must have one entry per student");
+            tiebreak_ptr = static_cast<const double*>(tiebreak_buf.ptr);
+        }
+
+        py::array_t<int32_t> order(num_students);
+        py::array_t<uint32_t> ranks(num_students);
+        int32_t* order_ptr = static_cast<int32_t*>(order.request().ptr);
+        uint32_t* ranks_ptr = static_cast<uint32_t*>(ranks.request().ptr);
+        exam::RankMethod rank_method = (method == "dense") ? exam::RankMethod::Dense : exam::RankMethod::Competition;
+        {
+            py::gil_scoped_release release;
+            exam::rank_scores(static_cast<const double*>(scores_buf.ptr), tiebreak_ptr, num_students, rank_method, order_ptr, ranks_ptr);
+        }
+        return py::make_tuple(order, ranks);
+    }, "Returns (order, ranks): student indices in merit order and the competition or dense rank of each student.",
+       py::arg("scores"), py::arg("tiebreak") = py::none(), py::arg("method") = "competition");
+
+    // Admission: top-k per column (career) with partial selection instead of full sorts
+    m.def("select_top_k", [](py::array_t<double, py::array::c_style | py::array::forcecast> scores_arr,
+                             py::array_t<uint32_t, py::array::c_style | py::array::forcecast> vacancies_arr,
+                             std::optional<py::array_t<double, py::array::c_style | py::array::forcecast>> tiebreak_arr,
+                             std::optional<py::array_t<int32_t, py::array::c_style | py::array::forcecast>> applicant_arr,
+                             bool include_ties) {
+        py::buffer_info scores_buf = scores_arr.request();
+        py::buffer_info vacancies_buf = vacancies_arr.request();
+        if (scores_buf.ndim != 1 && scores_buf.ndim != 2)
+            throw py::value_error("scores must be a 1D array or a 2D array (students x careers)");
+        size_t num_students = scores_buf.shape[0];
+        size_t num_columns = scores_buf.ndim == 2 ? scores_buf.shape[1] : 1;
+        if (vacancies_buf.ndim != 1 || static_cast<size_t>(vacancies_buf.shape[0]) != num_columns)
+            throw py::value_error("vacancies must have one entry per score column");
+
+        const double* tiebreak_ptr = NULL;
+        if (tiebreak_arr) {
+            py::buffer_info tiebreak_buf = tiebreak_arr->request();
+            if (tiebreak_buf.ndim != 1 || static_cast<size_t>(tiebreak_buf.shape[0]) != num_students)
+                throw py::value_error("tiebreak must have one entry per student");
+            tiebreak_ptr = static_cast<const double*>(tiebreak_buf.ptr);
+        }
+        const int32_t* applicant_ptr = NULL;
+        if (applicant_arr) {
+            py::buffer_info applicant_buf = applicant_arr->request();
+            if (applicant_buf.ndim != 1 || static_cast<size_t>(applicant_buf.shape[0]) != num_students)
+                throw py::value_error("applicant_column must have one entry per student");
+            applicant_ptr = static_cast<const int32_t*>(applicant_buf.ptr);
+        }
+
+        std::vector<std::vector<int32_t>> selected;
+        {
+            py::gil_scoped_release release;
+            exam::select_top_k(static_cast<const double*>(scores_buf.ptr), num_students, num_columns, tiebreak_ptr,
+                               applicant_ptr, static_cast<const uint32_t*>(vacancies_buf.ptr), include_ties, selected);
+        }
+        py::list admitted;
+        for (auto& column : selected) {
+            admitted.append(vector_to_array(std::move(column)));
+        }
+        return admitted;
+    }, "Returns, per score column, the indices of the top vacancies[c] students in merit order (plus ties at the cutoff).",
+       py::arg("scores"), py::arg("vacancies"), py::arg("tiebreak") = py::none(), py::arg("applicant_column") = py::none(),
+       py::arg("include_ties") = true);
+
+    // Item analysis: option frequencies, difficulty and upper/lower-group discrimination per question
+    m.def("item_analysis", [](py::array_t<int8_t, py::array::c_style | py::array::forcecast> answers_arr,
+                              py::array_t<int8_t, py::array::c_style | py::array::forcecast> key_arr,
+                              py::array_t<double, py::array::c_style | py::array::forcecast> scores_arr,
+                              double group_fraction) {
+        py::buffer_info answers_buf = answers_arr.request();
+        py::buffer_info key_buf = key_arr.request();
+        py::buffer_info scores_buf = scores_arr.request();
+
+        if (answers_buf.ndim != 2)
+            throw py::value_error("answers_arr must be a 2D array");
+        if (key_buf.ndim != 1 || scores_buf.ndim != 1)
+            throw py::value_error("key_arr and scores must be 1D arrays");
+        if (group_fraction < 0.0 || group_fraction > 0.5)
+            throw py::value_error("group_fraction must be in [0, 0.5]");
+
+        size_t num_students = answers_buf.shape[0];
+        size_t num_questions = answers_buf.shape[1];
+
+        if (num_questions != static_cast<size_t>(key_buf.shape[0]))
+            throw py::value_error("Number of questions in answers_arr must match length of key_arr");
+        if (num_students != static_cast<size_t>(scores_buf.shape[0]))
+            throw py::value_error("scores must have one entry per student");
+
+        py::array_t<uint64_t> option_counts({num_questions, exam::kItemOptions});
+        py::array_t<double> difficulty(num_questions);
+        py::array_t<double> discrimination(num_questions);
+        uint64_t* counts_ptr = static_cast<uint64_t*>(option_counts.request().ptr);
+        double* difficulty_ptr = static_cast<double*>(difficulty.request().ptr);
+        double* discrimination_ptr = static_cast<double*>(discrimination.request().ptr);
+        {
+            py::gil_scoped_release release;
+            exam::item_analysis(static_cast<const int8_t*>(answers_buf.ptr), num_students,
+                                static_cast<const int8_t*>(key_buf.ptr), num_questions,
+                                static_cast<const double*>(scores_buf.ptr), group_fraction,
+                                counts_ptr, difficulty_ptr, discrimination_ptr);
+        }
+        return py::dict("option_counts"_a = option_counts, "difficulty"_a = difficulty, "discrimination"_a = discrimination);
+    }, "Computes per-question option counts (A, B, C, D, blank), difficulty and upper/lower-group discrimination.",
+       py::arg("answers"), py::arg("key"), py::arg("scores"), py::arg("group_fraction") = 0.27);
+
+    // Multi-version (tema) scoring: one key row per version, selected per student
+    m.def("run_versions_array", [](py::array_t<int8_t, py::array::c_style | py::array::forcecast> answers_arr,
+                                   py::array_t<int8_t, py::array::c_style | py::array::forcecast> keys_arr,
+                                   py::array_t<int32_t, py::array::c_style | py::array::forcecast> version_index_arr,
+                                   exam::ScoringRule rule) {
+        py::buffer_info answers_buf = answers_arr.request();
+        py::buffer_info keys_buf = keys_arr.request();
+        py::buffer_info index_buf = version_index_arr.request();
+
+        if (answers_buf.ndim != 2)
+            throw py::value_error("answers_arr must be a 2D array");
+        if (keys_buf.ndim != 2)
+            throw py::value_error("keys_arr must be a 2D array (versions x questions)");
+        if (index_buf.ndim != 1)
+            throw py::value_error("version_index must be a 1D array");
+
+        size_t num_students = answers_buf.shape[0];
+        size_t num_questions = answers_buf.shape[1];
+        size_t num_versions = keys_buf.shape[0];
+
+        if (num_questions != static_cast<size_t>(keys_buf.shape[1]))
+            throw py::value_error("Number of questions in answers_arr must match the columns of keys_arr");
+        if (num_students != static_cast<size_t>(index_buf.shape[0]))
+            throw py::value_error("version_index must have one entry per student");
+
+        const int32_t* index_ptr = static_cast<const int32_t*>(index_buf.ptr);
+        for (size_t i = 0; i < num_students; ++i) {
+            if (index_ptr[i] < 0 || static_cast<size_t>(index_ptr[i]) >= num_versions)
+                throw py::value_error("version_index contains an index outside keys_arr");
+        }
+
+        std::vector<exam::Result> results(num_students);
+        {
+            py::gil_scoped_release release;
+            exam::evaluate_versions(static_cast<const int8_t*>(answers_buf.ptr), num_students,
+                                    static_cast<const int8_t*>(keys_buf.ptr), num_versions, index_ptr,
+                                    num_questions, rule, results.data());
+        }
+        return vector_to_array(std::move(results));
+    }, "Evaluates students of several exam versions in one pass (keys_arr: versions x questions, version_index: row per student).");
+
+    // Persistent pthreads pool (created lazily by run_pthreads*, joined at interpreter exit)
+    m.def("set_pthreads_pool_size", &exam::set_pthreads_pool_size, py::arg("num_threads"), py::call_guard<py::gil_scoped_release>(),
+          "Sets the number of threads of the pthreads pool (0 = hardware concurrency); the pool is rebuilt on next use.");
+    m.def("pthreads_pool_size", &exam::pthreads_pool_size, "Returns the number of threads used by the pthreads pool.");
+    m.def("shutdown_pthreads_pool", &exam::shutdown_pthreads_pool, py::call_guard<py::gil_scoped_release>(), "Joins and releases the pthreads pool threads.");
+    py::module_::import("atexit").attr("register")(py::cpp_function(&exam::shutdown_pthreads_pool));
+
+    // Packed mode: answers stored as bitplanes and scored with AND + popcount
+    m.def("pack_answers", [](py::array_t<int8_t, py::array::c_style | py::array::forcecast> answers_arr) {
+        py::buffer_info answers_buf = answers_arr.request();
+        if (answers_buf.ndim != 2)
+            throw py::value_error("answers_arr must be a 2D array");
+
+        size_t num_students = answers_buf.shape[0];
+        size_t num_questions = answers_buf.shape[1];
+        size_t row_words = exam::kPackedPlanes * exam::packed_words(num_questions);
+
+        py::array_t<uint64_t> packed({num_students, row_words});
+        uint64_t* packed_ptr = static_cast<uint64_t*>(packed.request().ptr);
+        bool in_domain;
+        {
+            py::gil_scoped_release release;
+            in_domain = exam::pack_answers(static_cast<const int8_t*>(answers_buf.ptr), num_students, num_questions, packed_ptr);
+        }
+        if (!in_domain)
+            throw py::value_error("answers_arr contains codes outside -1..3; normalize invalid answers to blank before packing");
+        return packed;
+    }, "Packs an int8 answer matrix (codes -1..3) into bitplanes (low bit, high bit, answered) of 64-bit words per student.");
+
+    m.def("run_packed_array", [](py::array_t<uint64_t, py::array::c_style | py::array::forcecast> packed_arr,
+                                 py::array_t<int8_t, py::array::c_style | py::array::forcecast> key_arr,
+                                 exam::ScoringRule rule) {
+        py::buffer_info packed_buf = packed_arr.request();
+        py::buffer_info key_buf = key_arr.request();
+
+        if (packed_buf.ndim != 2)
+            throw py::value_error("packed_arr must be a 2D array");
+        if (key_buf.ndim != 1)
+            throw py::value_error("key_arr must be a 1D array");
+
+        size_t num_students = packed_buf.shape[0];
+        size_t num_questions = key_buf.shape[0];
+
+        if (static_cast<size_t>(packed_buf.shape[1]) != exam::kPackedPlanes * exam::packed_words(num_questions))
+            throw py::value_error("Width of packed_arr does not match the packed size of key_arr");
+
+        std::vector<exam::Result> results(num_students);
+        {
+            py::gil_scoped_release release;
+            exam::evaluate_packed(static_cast<const uint64_t*>(packed_buf.ptr), num_students,
+                                  static_cast<const int8_t*>(key_buf.ptr), num_questions, rule, results.data());
+        }
+        return vector_to_array(std::move(results));
+    }, "Evaluates packed answers (see pack_answers) and returns a structured array (score, correct, wrong, blank).");
 }
\ No newline at end of file
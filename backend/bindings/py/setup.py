@@ -54,7 +54,7 @@ class CustomBuildExt(_build_ext):
 ext_modules = [
     Pybind11Extension(
         "pyevalcore",
-        ["pyevalcore_binding.cpp", "../../src/evaluator_serial.cpp", "../../src/evaluator_openmp.cpp", os.path.join(os.path.abspath("../.."), "src", "evaluator_cuda.cu"), os.path.join(os.path.abspath("../.."), "src", "evaluator_pthreads.cpp")],
+        ["pyevalcore_binding.cpp", "../../src/evaluator_serial.cpp", "../../src/evaluator_openmp.cpp", os.path.join(os.path.abspath("../.."), "src", "evaluator_cuda.cu"), os.path.join(os.path.abspath("../.."), "src", "evaluator_pthreads.cpp"), "../../src/encoder.cpp", "../../src/evaluator_packed.cpp", "../../src/evaluator_versions.cpp", "../../src/evaluator_weighted.cpp", "../../src/evaluator_sections.cpp", "../../src/item_analysis.cpp", "../../src/evaluator_rescore.cpp", "../../src/evaluator_simd.cpp", "../../src/ranking.cpp"],
         include_dirs=[pybind11.get_include(), "../../include", os.path.join(os.path.abspath("../../.."), 'vcpkg/installed/x64-windows/include'), os.path.join(os.path.abspath("../../.."), 'vcpkg/installed/x64-windows/include/pthreads')],
         language="c++",
     ),
@@ -3,6 +3,7 @@
 
 #include <cstdint>
 #include <cstddef>
+#include <vector>
 
 namespace exam {
 
@@ -19,6 +20,35 @@ struct Result {
     uint32_t blank;
 };
 
+#if defined(__CUDACC__)
+#define EXAM_HOST_DEVICE __host__ __device__
+#else
+#define EXAM_HOST_DEVICE
+#endif
+
+// Puntaje de una regla a partir de los conteos (el blanco no suma). Todos los kernels con ScoringRule (y el
+// backend NumPy) usan esta fórmula en lugar de sumar pregunta a pregunta, para que cualquier modo devuelva
+// exactamente el mismo double; por eso el modo no forma parte de la clave de la caché de resultados.
+EXAM_HOST_DEVICE inline double rule_score(uint32_t correct, uint32_t wrong, ScoringRule rule) {
+#if defined(__CUDA_ARCH__)
+    // nvcc fusiona a*b + c*d en un FMA por defecto; los intrínsecos _rn fuerzan el redondeo de la CPU
+    return __dadd_rn(__dmul_rn(correct, rule.correct), __dmul_rn(wrong, rule.wrong));
+#else
+#if defined(__clang__)
+#pragma clang fp contract(off)
+#endif
+    return correct * rule.correct + wrong * rule.wrong;
+#endif
+}
+
+// Pesos por pregunta (arreglos de num_questions elementos) para la puntuación ponderada.
+// A diferencia de ScoringRule, el peso de blanco sí se suma al puntaje.
+struct QuestionWeights {
+    const double* correct;
+    const double* wrong;
+    const double* blank;
+};
+
 enum class Mode { Serial, OpenMP, Cuda, Pthreads };
 
 void evaluate_serial(const int8_t* answers, size_t num_students, const int8_t* key, size_t num_questions, ScoringRule rule, Result* out);
@@ -26,6 +56,77 @@ void evaluate_openmp(const int8_t* answers, size_t num_students, const int8_t* k
 void evaluate_cuda(const int8_t* answers, size_t num_students, const int8_t* key, size_t num_questions, ScoringRule rule, Result* out);
 void evaluate_pthreads(const int8_t* answers, size_t num_students, const int8_t* key, size_t num_questions, ScoringRule rule, Result* out);
 
+// Kernels SIMD sin saltos (comparación + máscara + popcount, 16 o 32 respuestas por instrucción). El conjunto de
+// instrucciones se detecta en tiempo de ejecución (AVX2, SSE2 o escalar); set_simd_level permite forzar uno menor
+// y devuelve el nivel efectivo. evaluate_simd_range evalúa los estudiantes [start, end).
+enum class SimdLevel { Scalar = 0, SSE2 = 1, AVX2 = 2 };
+SimdLevel simd_level();
+SimdLevel set_simd_level(SimdLevel level);
+void evaluate_simd_range(const int8_t* answers, size_t start_student, size_t end_student, const int8_t* key, size_t num_questions, ScoringRule rule, Result* out);
+void evaluate_simd(const int8_t* answers, size_t num_students, const int8_t* key, size_t num_questions, ScoringRule rule, Result* out);
+void evaluate_simd_openmp(const int8_t* answers, size_t num_students, const int8_t* key, size_t num_questions, ScoringRule rule, Result* out);
+void evaluate_simd_pthreads(const int8_t* answers, size_t num_students, const int8_t* key, size_t num_questions, ScoringRule rule, Result* out);
+
+// Evalúa estudiantes de varias versiones (temas) en una sola pasada: keys es una matriz versiones x preguntas
+// y version_index indica, por estudiante, la fila de keys que le corresponde.
+void evaluate_versions(const int8_t* answers, size_t num_students, const int8_t* keys, size_t num_versions, const int32_t* version_index, size_t num_questions, ScoringRule rule, Result* out);
+
+// Puntuación ponderada por pregunta en los backends CPU; evaluate_weighted_range evalúa los estudiantes [start, end)
+void evaluate_weighted_range(const int8_t* answers, size_t start_student, size_t end_student, const int8_t* key, size_t num_questions, QuestionWeights weights, Result* out);
+void evaluate_weighted_serial(const int8_t* answers, size_t num_students, const int8_t* key, size_t num_questions, QuestionWeights weights, Result* out);
+void evaluate_weighted_openmp(const int8_t* answers, size_t num_students, const int8_t* key, size_t num_questions, QuestionWeights weights, Result* out);
+void evaluate_weighted_pthreads(const int8_t* answers, size_t num_students, const int8_t* key, size_t num_questions, QuestionWeights weights, Result* out);
+
+// Subpuntajes por sección en la misma pasada que el total: section_of_question asigna a cada pregunta una
+// sección en [0, num_sections) (o -1 si no pertenece a ninguna) y subscores es una matriz estudiantes x secciones.
+void evaluate_sections(const int8_t* answers, size_t num_students, const int8_t* key, size_t num_questions, const int32_t* section_of_question, size_t num_sections, ScoringRule rule, Result* out, double* subscores);
+// Puntajes compuestos por carrera: composites (estudiantes x carreras) = subscores x coefficients^T,
+// con coefficients una matriz carreras x secciones.
+void combine_sections(const double* subscores, size_t num_students, size_t num_sections, const double* coefficients, size_t num_careers, double* composites);
+
+// Recalificación incremental tras corregir la clave: aplica a results (de la evaluación con la clave anterior)
+// solo la diferencia de las num_changed preguntas indicadas a los conteos, cuyas claves anterior y nueva se reciben
+// en old_key/new_key, y recalcula el puntaje con rule_score. Una clave kAnnulledKey marca la pregunta como anulada
+// (no suma, no resta ni cuenta como blanco).
+constexpr int8_t kAnnulledKey = -3;
+void rescore_questions(const int8_t* answers, size_t num_students, size_t num_questions, const int32_t* questions, const int8_t* old_key, const int8_t* new_key, size_t num_changed, ScoringRule rule, Result* results);
+
+// Análisis de ítems: option_counts (preguntas x kItemOptions: A, B, C, D, blanco), dificultad (proporción de
+// aciertos) y discriminación (proporción de aciertos del grupo superior menos la del inferior, cada grupo con
+// group_fraction de los estudiantes ordenados por scores).
+constexpr size_t kItemOptions = 5;
+void item_analysis(const int8_t* answers, size_t num_students, const int8_t* key, size_t num_questions, const double* scores, double group_fraction, uint64_t* option_counts, double* difficulty, double* discrimination);
+
+// Ranking por mérito (mayor puntaje, luego mayor tiebreak; tiebreak puede ser NULL). order recibe los índices en
+// orden de mérito y ranks el puesto de cada estudiante: competición (1, 2, 2, 4) o denso (1, 2, 2, 3).
+enum class RankMethod { Competition = 0, Dense = 1 };
+void rank_scores(const double* scores, const double* tiebreak, size_t num_students, RankMethod method, int32_t* order, uint32_t* ranks);
+// Admitidos por columna de scores (estudiantes x columnas, p. ej. compuestos por carrera) con selección parcial:
+// los vacancies[c] mejores (más los empatados con el último si include_ties) en orden de mérito. Con
+// applicant_column (puede ser NULL) cada estudiante solo compite en la columna que eligió (-1 = ninguna).
+void select_top_k(const double* scores, size_t num_students, size_t num_columns, const double* tiebreak, const int32_t* applicant_column, const uint32_t* vacancies, bool include_ties, std::vector<std::vector<int32_t>>& selected);
+
+// Pool persistente de evaluate_pthreads: se crea en la primera evaluación con pthreads_pool_size() hilos
+// (0 = hardware_concurrency) y vive hasta shutdown_pthreads_pool() o un cambio de tamaño. Las evaluaciones
+// concurrentes lo comparten; un pool retirado mientras se usa se elimina al terminar la última que lo usaba.
+void set_pthreads_pool_size(size_t num_threads);
+size_t pthreads_pool_size();
+void shutdown_pthreads_pool();
+
+// Codifica celdas de un byte ('A'-'D', mayúsculas o minúsculas) a 0-3; espacio, tabulador y NUL son blanco (-1)
+// y cualquier otro byte recibe invalid_code (por defecto -1, es decir, se evalúa como blanco).
+void encode_answers(const uint8_t* cells, size_t count, int8_t* out, int8_t invalid_code = -1);
+
+// Representación empaquetada: por estudiante, tres planos de bits de packed_words(num_questions) palabras
+// de 64 bits cada uno (bit bajo de la opción, bit alto de la opción y "respondida"). Los planos no distinguen
+// un blanco (-1) de un código inválido, que evaluate_serial no cuenta en ninguna categoría: pack_answers devuelve
+// false si encuentra códigos fuera de -1..3 (normalizar antes con encode_answers). La evaluación cuenta
+// correctas/incorrectas/blancos con AND + popcount.
+constexpr size_t kPackedPlanes = 3;
+size_t packed_words(size_t num_questions);
+bool pack_answers(const int8_t* answers, size_t num_students, size_t num_questions, uint64_t* out);
+void evaluate_packed(const uint64_t* packed, size_t num_students, const int8_t* key, size_t num_questions, ScoringRule rule, Result* out);
+
 } // namespace exam
 
 #endif // EVALUATOR_HPP
\ No newline at end of file
@@ -0,0 +1,41 @@
+#include "../include/evaluator.hpp"
+
+namespace exam {
+
+namespace {
+
+// Marca de los bytes fuera de dominio dentro de la tabla; se reemplaza por invalid_code al codificar
+constexpr int8_t kInvalidMarker = -128;
+
+// Tabla de traducción byte -> código de respuesta (A-D -> 0-3, espacios/NUL -> blanco, resto -> inválido)
+struct AnswerLookupTable {
+    int8_t codes[256];
+
+    AnswerLookupTable() {
+        for (int i = 0; i < 256; ++i) {
+            codes[i] = kInvalidMarker;
+        }
+        codes[' '] = -1; codes['\0'] = -1; codes['\t'] = -1;
+        codes['A'] = 0; codes['a'] = 0;
+        codes['B'] = 1; codes['b'] = 1;
+        codes['C'] = 2; codes['c'] = 2;
+        codes['D'] = 3; codes['d'] = 3;
+    }
+};
+
+const AnswerLookupTable kAnswerTable;
+
+} // namespace
+
+void encode_answers(const uint8_t* cells, size_t count, int8_t* out, int8_t invalid_code) {
+    // Copia local de la tabla con el código inválido solicitado
+    int8_t table[256];
+    for (int i = 0; i < 256; ++i) {
+        table[i] = (kAnswerTable.codes[i] == kInvalidMarker) ? invalid_code : kAnswerTable.codes[i];
+    }
+    for (size_t i = 0; i < count; ++i) {
+        out[i] = table[cells[i]];
+    }
+}
+
+} // namespace exam
@@ -23,25 +23,22 @@ __global__ void evaluateKernel(const int8_t* d_answers, size_t num_students, siz
         uint32_t correct_count = 0;
         uint32_t wrong_count = 0;
         uint32_t blank_count = 0;
-        double score = 0.0;
 
+        // Mismas reglas que evaluate_serial: blanco, correcta, incorrecta (0-3) y los demás códigos no cuentan
         for (size_t i = 0; i < num_questions; ++i) {
             int8_t student_answer = d_answers[student_idx * num_questions + i];
             int8_t correct_answer = d_key[i];
 
-            if (student_answer == correct_answer) {
-                correct_count++;
-                score += rule.correct;
-            } else if (student_answer == -1) {
+            if (student_answer == -1) {
                 blank_count++;
-                score += rule.blank;
-            } else {
+            } else if (student_answer == correct_answer) {
+                correct_count++;
+            } else if (student_answer >= 0 && student_answer <= 3) {
                 wrong_count++;
-                score += rule.wrong;
             }
         }
 
-        d_results[student_idx].score = score;
+        d_results[student_idx].score = rule_score(correct_count, wrong_count, rule);
         d_results[student_idx].correct = correct_count;
         d_results[student_idx].wrong = wrong_count;
         d_results[student_idx].blank = blank_count;
@@ -0,0 +1,98 @@
+#include "evaluator.hpp"
+#include <vector>
+#include <omp.h>
+#if defined(_MSC_VER)
+#include <intrin.h>
+#endif
+
+namespace exam {
+
+namespace {
+
+inline uint32_t popcount64(uint64_t word) {
+#if defined(_MSC_VER)
+    return static_cast<uint32_t>(__popcnt64(word));
+#else
+    return static_cast<uint32_t>(__builtin_popcountll(word));
+#endif
+}
+
+} // namespace
+
+size_t packed_words(size_t num_questions) {
+    return (num_questions + 63) / 64;
+}
+
+bool pack_answers(const int8_t* answers, size_t num_students, size_t num_questions, uint64_t* out) {
+    const size_t words = packed_words(num_questions);
+    const size_t row_words = kPackedPlanes * words;
+    int out_of_domain = 0;
+
+    #pragma omp parallel for schedule(static) reduction(|:out_of_domain)
+    for (ptrdiff_t i = 0; i < static_cast<ptrdiff_t>(num_students); ++i) {
+        const int8_t* row = answers + i * num_questions;
+        uint64_t* lo = out + i * row_words;
+        uint64_t* hi = lo + words;
+        uint64_t* answered = hi + words;
+        for (size_t w = 0; w < words; ++w) {
+            // Construye cada palabra en registros, sin saltos; los códigos fuera de -1..3 se señalan al terminar
+            const size_t begin = w * 64;
+            const size_t end = (begin + 64 < num_questions) ? begin + 64 : num_questions;
+            uint64_t lo_word = 0, hi_word = 0, answered_word = 0;
+            for (size_t j = begin; j < end; ++j) {
+                const uint8_t code = static_cast<uint8_t>(row[j]);
+                const uint64_t valid = code <= 3;
+                out_of_domain |= !valid & (code != 0xFF);
+                const unsigned shift = static_cast<unsigned>(j - begin);
+                answered_word |= valid << shift;
+                lo_word |= (valid & code) << shift;
+                hi_word |= (valid & (code >> 1)) << shift;
+            }
+            lo[w] = lo_word;
+            hi[w] = hi_word;
+            answered[w] = answered_word;
+        }
+    }
+    return out_of_domain == 0;
+}
+
+void evaluate_packed(const uint64_t* packed, size_t num_students, const int8_t* key, size_t num_questions, ScoringRule rule, Result* out) {
+    const size_t words = packed_words(num_questions);
+    const size_t row_words = kPackedPlanes * words;
+
+    // Planos de la clave; las preguntas con clave inválida quedan fuera de key_valid y nunca cuentan como correctas
+    std::vector<uint64_t> key_lo(words, 0), key_hi(words, 0), key_valid(words, 0);
+    for (size_t j = 0; j < num_questions; ++j) {
+        if (key[j] < 0 || key[j] > 3) {
+            continue;
+        }
+        const uint64_t bit = uint64_t{1} << (j % 64);
+        key_valid[j / 64] |= bit;
+        if (key[j] & 1) key_lo[j / 64] |= bit;
+        if (key[j] & 2) key_hi[j / 64] |= bit;
+    }
+
+    #pragma omp parallel for schedule(static)
+    for (ptrdiff_t i = 0; i < static_cast<ptrdiff_t>(num_students); ++i) {
+        const uint64_t* lo = packed + i * row_words;
+        const uint64_t* hi = lo + words;
+        const uint64_t* answered = hi + words;
+        uint32_t correct = 0;
+        uint32_t num_answered = 0;
+
+        for (size_t w = 0; w < words; ++w) {
+            // Coincidencia bit a bit de la opción (lo, hi) con la clave, solo en preguntas respondidas
+            const uint64_t match = ~(lo[w] ^ key_lo[w]) & ~(hi[w] ^ key_hi[w]) & answered[w] & key_valid[w];
+            correct += popcount64(match);
+            num_answered += popcount64(answered[w]);
+        }
+
+        const uint32_t wrong = num_answered - correct;
+        out[i].correct = correct;
+        out[i].wrong = wrong;
+        out[i].blank = static_cast<uint32_t>(num_questions) - num_answered;
+        out[i].score = rule_score(correct, wrong, rule);
+    }
+}
+
+} // namespace exam
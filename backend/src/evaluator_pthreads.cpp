@@ -1,92 +1,294 @@
 #include <pthread.h>
 #include <vector>
-#include <numeric>
+#include <atomic>
+#include <algorithm>
 #include "evaluator.hpp"
 #include <thread> // Para std::thread::hardware_concurrency()
 
 namespace exam {
 
-// Estructura para pasar datos a cada hilo
-struct ThreadData {
+namespace {
+
+// Número de estudiantes que un hilo toma de la cola compartida en cada paso
+constexpr size_t kStudentsPerTask = 256;
+
+// Trabajo publicado en el pool: los hilos reparten los estudiantes dinámicamente con un contador atómico
+struct Job {
     const int8_t* answers;
     size_t num_students;
     const int8_t* key;
     size_t num_questions;
     ScoringRule rule;
+    const QuestionWeights* weights;  // Si no es NULL se usa la puntuación ponderada por pregunta
+    bool simd;                       // Usar el kernel SIMD (evaluate_simd_range) en lugar del escalar
     Result* out;
-    size_t start_student;
-    size_t end_student;
-};
+    std::atomic<size_t> next_student;
+    size_t active = 0;               // Hilos que están evaluando bloques del trabajo (protegido por el mutex del pool)
 
-// Función worker para cada hilo
-void* worker(void* arg) {
-    ThreadData* data = static_cast<ThreadData*>(arg);
+    bool pending() const { return next_student.load() < num_students; }
+};
 
-    for (size_t i = data->start_student; i < data->end_student; ++i) {
-        double score = 0.0;
+void evaluate_range(const Job& job, size_t start_student, size_t end_student) {
+    for (size_t i = start_student; i < end_student; ++i) {
         uint32_t correct = 0;
         uint32_t wrong = 0;
         uint32_t blank = 0;
 
-        for (size_t j = 0; j < data->num_questions; ++j) {
-            int8_t answer = data->answers[i * data->num_questions + j];
+        for (size_t j = 0; j < job.num_questions; ++j) {
+            int8_t answer = job.answers[i * job.num_questions + j];
             if (answer == -1) {
                 blank++;
-            } else if (answer == data->key[j]) {
+            } else if (answer == job.key[j]) {
                 correct++;
-                score += data->rule.correct;
             } else if (answer >= 0 && answer <= 3) {
                 wrong++;
-                score += data->rule.wrong;
             }
         }
 
-        data->out[i].score = score;
-        data->out[i].correct = correct;
-        data->out[i].wrong = wrong;
-        data->out[i].blank = blank;
+        job.out[i].score = rule_score(correct, wrong, job.rule);
+        job.out[i].correct = correct;
+        job.out[i].wrong = wrong;
+        job.out[i].blank = blank;
     }
-    return NULL;
 }
 
-// Función principal para la evaluación con Pthreads
-void evaluate_pthreads(const int8_t* answers, size_t num_students, const int8_t* key, size_t num_questions, ScoringRule rule, Result* out) {
-    unsigned int num_threads_supported = std::thread::hardware_concurrency();
-    size_t num_threads = (num_threads_supported > 0) ? num_threads_supported : 1;
-    if (num_students < num_threads) {
-        num_threads = num_students;
+// Toma bloques de estudiantes de la cola hasta agotarla
+void drain_job(Job& job) {
+    for (;;) {
+        size_t start = job.next_student.fetch_add(kStudentsPerTask);
+        if (start >= job.num_students) {
+            break;
+        }
+        size_t end = std::min(start + kStudentsPerTask, job.num_students);
+        if (job.weights != NULL) {
+            evaluate_weighted_range(job.answers, start, end, job.key, job.num_questions, *job.weights, job.out);
+        } else if (job.simd) {
+            evaluate_simd_range(job.answers, start, end, job.key, job.num_questions, job.rule, job.out);
+        } else {
+            evaluate_range(job, start, end);
+        }
     }
+}
 
-    std::vector<pthread_t> threads(num_threads);
-    std::vector<ThreadData> thread_data(num_threads);
-
-    size_t students_per_thread = num_students / num_threads;
-    size_t remaining_students = num_students % num_threads;
-
-    size_t current_student_idx = 0;
-    for (size_t i = 0; i < num_threads; ++i) {
-        thread_data[i].answers = answers;
-        thread_data[i].num_students = num_students; // No se usa directamente en el worker loop, pero se mantiene por consistencia
-        thread_data[i].key = key;
-        thread_data[i].num_questions = num_questions;
-        thread_data[i].rule = rule;
-        thread_data[i].out = out;
-        thread_data[i].start_student = current_student_idx;
-        
-        size_t end_idx = current_student_idx + students_per_thread;
-        if (i < remaining_students) {
-            end_idx++; // Distribuir los estudiantes restantes
+// Pool de hilos persistente: num_threads - 1 hilos de trabajo más los hilos que llaman a run(). Varias
+// evaluaciones concurrentes (p. ej. dos trabajos de /run con el GIL liberado) comparten el pool: cada una
+// publica su trabajo en la lista, lo evalúa desde su hilo y espera solo a que se suelte el suyo, mientras
+// los hilos del pool toman bloques del trabajo más antiguo que aún tiene estudiantes pendientes.
+class ThreadPool {
+public:
+    explicit ThreadPool(size_t num_threads) : threads_(num_threads > 1 ? num_threads - 1 : 0) {
+        pthread_mutex_init(&mutex_, NULL);
+        pthread_cond_init(&work_cv_, NULL);
+        pthread_cond_init(&done_cv_, NULL);
+        for (size_t i = 0; i < threads_.size(); ++i) {
+            pthread_create(&threads_[i], NULL, &ThreadPool::worker_main, this);
         }
-        thread_data[i].end_student = end_idx;
-        current_student_idx = end_idx;
+    }
 
-        pthread_create(&threads[i], NULL, worker, &thread_data[i]);
+    ~ThreadPool() {
+        pthread_mutex_lock(&mutex_);
+        stop_ = true;
+        pthread_cond_broadcast(&work_cv_);
+        pthread_mutex_unlock(&mutex_);
+        for (size_t i = 0; i < threads_.size(); ++i) {
+            pthread_join(threads_[i], NULL);
+        }
+        pthread_cond_destroy(&done_cv_);
+        pthread_cond_destroy(&work_cv_);
+        pthread_mutex_destroy(&mutex_);
     }
 
-    // Esperar a que todos los hilos terminen
-    for (size_t i = 0; i < num_threads; ++i) {
-        pthread_join(threads[i], NULL);
+    size_t size() const { return threads_.size() + 1; }
+
+    // Publica el trabajo, participa en él y espera a que todos los hilos que lo tomaron lo suelten
+    void run(Job& job) {
+        pthread_mutex_lock(&mutex_);
+        jobs_.push_back(&job);
+        job.active = 1;  // El hilo que llama
+        pthread_cond_broadcast(&work_cv_);
+        pthread_mutex_unlock(&mutex_);
+
+        drain_job(job);
+
+        pthread_mutex_lock(&mutex_);
+        --job.active;
+        while (job.active > 0) {
+            pthread_cond_wait(&done_cv_, &mutex_);
+        }
+        // Ningún hilo puede tomarlo después: solo se toman trabajos de la lista, con el mutex
+        jobs_.erase(std::find(jobs_.begin(), jobs_.end(), &job));
+        pthread_mutex_unlock(&mutex_);
     }
+
+    // Evaluaciones que comparten el pool en este momento (usado por el contador de referencias global)
+    size_t users = 0;
+    bool retired = false;
+
+private:
+    // Trabajo más antiguo con estudiantes pendientes (NULL si no hay); se llama con el mutex tomado
+    Job* next_job() {
+        for (Job* job : jobs_) {
+            if (job->pending()) {
+                return job;
+            }
+        }
+        return NULL;
+    }
+
+    static void* worker_main(void* arg) {
+        ThreadPool* pool = static_cast<ThreadPool*>(arg);
+        pthread_mutex_lock(&pool->mutex_);
+        for (;;) {
+            Job* job = NULL;
+            while (!pool->stop_ && (job = pool->next_job()) == NULL) {
+                pthread_cond_wait(&pool->work_cv_, &pool->mutex_);
+            }
+            if (pool->stop_) {
+                pthread_mutex_unlock(&pool->mutex_);
+                return NULL;
+            }
+            ++job->active;
+            pthread_mutex_unlock(&pool->mutex_);
+
+            drain_job(*job);
+
+            pthread_mutex_lock(&pool->mutex_);
+            if (--job->active == 0) {
+                pthread_cond_broadcast(&pool->done_cv_);
+            }
+        }
+    }
+
+    std::vector<pthread_t> threads_;
+    pthread_mutex_t mutex_;
+    pthread_cond_t work_cv_;
+    pthread_cond_t done_cv_;
+    std::vector<Job*> jobs_;
+    bool stop_ = false;
+};
+
+// Estado global del pool. El mutex protege solo el puntero y el tamaño, no la evaluación: un pool que se
+// redimensiona o se cierra mientras lo usan otras evaluaciones se retira y lo elimina la última que termina.
+pthread_mutex_t g_pool_mutex = PTHREAD_MUTEX_INITIALIZER;
+ThreadPool* g_pool = NULL;
+size_t g_pool_size = 0;  // 0 = std::thread::hardware_concurrency()
+
+// Quita el pool global; se elimina ahora si nadie lo usa o al terminar la última evaluación (con g_pool_mutex)
+void retire_pool() {
+    if (g_pool == NULL) {
+        return;
+    }
+    if (g_pool->users == 0) {
+        delete g_pool;
+    } else {
+        g_pool->retired = true;
+    }
+    g_pool = NULL;
+}
+
+size_t resolve_pool_size(size_t requested) {
+    if (requested > 0) {
+        return requested;
+    }
+    unsigned int num_threads_supported = std::thread::hardware_concurrency();
+    return (num_threads_supported > 0) ? num_threads_supported : 1;
+}
+
+} // namespace
+
+void set_pthreads_pool_size(size_t num_threads) {
+    pthread_mutex_lock(&g_pool_mutex);
+    g_pool_size = num_threads;
+    if (g_pool != NULL && g_pool->size() != resolve_pool_size(num_threads)) {
+        retire_pool();  // Se vuelve a crear con el nuevo tamaño en la próxima evaluación
+    }
+    pthread_mutex_unlock(&g_pool_mutex);
+}
+
+size_t pthreads_pool_size() {
+    pthread_mutex_lock(&g_pool_mutex);
+    size_t size = resolve_pool_size(g_pool_size);
+    pthread_mutex_unlock(&g_pool_mutex);
+    return size;
+}
+
+void shutdown_pthreads_pool() {
+    pthread_mutex_lock(&g_pool_mutex);
+    retire_pool();
+    pthread_mutex_unlock(&g_pool_mutex);
+}
+
+namespace {
+
+// Reparte el trabajo en el pool (o lo evalúa en el hilo actual si es pequeño)
+void run_job(Job& job) {
+    // Con un solo bloque de trabajo no vale la pena despertar al pool
+    if (job.num_students <= kStudentsPerTask) {
+        drain_job(job);
+        return;
+    }
+
+    pthread_mutex_lock(&g_pool_mutex);
+    if (g_pool == NULL) {
+        g_pool = new ThreadPool(resolve_pool_size(g_pool_size));  // Creación perezosa en la primera llamada
+    }
+    ThreadPool* pool = g_pool;
+    ++pool->users;
+    pthread_mutex_unlock(&g_pool_mutex);
+
+    // Sin g_pool_mutex: las evaluaciones concurrentes se reparten el pool en lugar de esperar su turno
+    pool->run(job);
+
+    pthread_mutex_lock(&g_pool_mutex);
+    if (--pool->users == 0 && pool->retired) {
+        delete pool;
+    }
+    pthread_mutex_unlock(&g_pool_mutex);
+}
+
+} // namespace
+
+// Función principal para la evaluación con Pthreads
+void evaluate_pthreads(const int8_t* answers, size_t num_students, const int8_t* key, size_t num_questions, ScoringRule rule, Result* out) {
+    Job job;
+    job.answers = answers;
+    job.num_students = num_students;
+    job.key = key;
+    job.num_questions = num_questions;
+    job.rule = rule;
+    job.weights = NULL;
+    job.simd = false;
+    job.out = out;
+    job.next_student.store(0);
+    run_job(job);
+}
+
+void evaluate_simd_pthreads(const int8_t* answers, size_t num_students, const int8_t* key, size_t num_questions, ScoringRule rule, Result* out) {
+    Job job;
+    job.answers = answers;
+    job.num_students = num_students;
+    job.key = key;
+    job.num_questions = num_questions;
+    job.rule = rule;
+    job.weights = NULL;
+    job.simd = true;
+    job.out = out;
+    job.next_student.store(0);
+    run_job(job);
+}
+
+void evaluate_weighted_pthreads(const int8_t* answers, size_t num_students, const int8_t* key, size_t num_questions, QuestionWeights weights, Result* out) {
+    Job job;
+    job.answers = answers;
+    job.num_students = num_students;
+    job.key = key;
+    job.num_questions = num_questions;
+    job.rule = ScoringRule{0.0, 0.0, 0.0};
+    job.weights = &weights;
+    job.simd = false;
+    job.out = out;
+    job.next_student.store(0);
+    run_job(job);
 }
 
-} // namespace exam
\ No newline at end of file
+} // namespace exam
@@ -0,0 +1,53 @@
+#include "../include/evaluator.hpp"
+
+namespace exam {
+
+namespace {
+
+enum Outcome : int { kNone = 0, kCorrect = 1, kWrong = 2, kBlank = 3 };
+
+// Mismo orden de comprobaciones que evaluate_serial; una pregunta anulada no cuenta en ninguna categoría
+inline int outcome(int8_t answer, int8_t key) {
+    if (key == kAnnulledKey) return kNone;
+    if (answer == -1) return kBlank;
+    if (answer == key) return kCorrect;
+    if (answer >= 0 && answer <= 3) return kWrong;
+    return kNone;
+}
+
+// Aporta sign veces el resultado de una pregunta a los conteos
+inline void apply(int result, int sign, int64_t& correct, int64_t& wrong, int64_t& blank) {
+    if (result == kCorrect) {
+        correct += sign;
+    } else if (result == kWrong) {
+        wrong += sign;
+    } else if (result == kBlank) {
+        blank += sign;
+    }
+}
+
+} // namespace
+
+void rescore_questions(const int8_t* answers, size_t num_students, size_t num_questions, const int32_t* questions, const int8_t* old_key, const int8_t* new_key, size_t num_changed, ScoringRule rule, Result* results) {
+    #pragma omp parallel for schedule(static)
+    for (ptrdiff_t i = 0; i < static_cast<ptrdiff_t>(num_students); ++i) {
+        const int8_t* row = answers + i * num_questions;
+        int64_t correct = 0;
+        int64_t wrong = 0;
+        int64_t blank = 0;
+
+        for (size_t c = 0; c < num_changed; ++c) {
+            const int8_t answer = row[questions[c]];
+            apply(outcome(answer, old_key[c]), -1, correct, wrong, blank);
+            apply(outcome(answer, new_key[c]), 1, correct, wrong, blank);
+        }
+
+        results[i].correct = static_cast<uint32_t>(results[i].correct + correct);
+        results[i].wrong = static_cast<uint32_t>(results[i].wrong + wrong);
+        results[i].blank = static_cast<uint32_t>(results[i].blank + blank);
+        // Puntaje recalculado desde los conteos: idéntico al de una evaluación completa con la clave nueva
+        results[i].score = rule_score(results[i].correct, results[i].wrong, rule);
+    }
+}
+
+} // namespace exam
@@ -0,0 +1,57 @@
+#include "evaluator.hpp"
+#include <omp.h>
+
+namespace exam {
+
+void evaluate_sections(const int8_t* answers, size_t num_students, const int8_t* key, size_t num_questions, const int32_t* section_of_question, size_t num_sections, ScoringRule rule, Result* out, double* subscores) {
+    #pragma omp parallel for schedule(dynamic, 64)
+    for (ptrdiff_t i = 0; i < static_cast<ptrdiff_t>(num_students); ++i) {
+        double* student_subscores = subscores + i * num_sections;
+        for (size_t s = 0; s < num_sections; ++s) {
+            student_subscores[s] = 0.0;
+        }
+        uint32_t correct = 0;
+        uint32_t wrong = 0;
+        uint32_t blank = 0;
+
+        for (size_t j = 0; j < num_questions; ++j) {
+            int8_t answer = answers[i * num_questions + j];
+            double points = 0.0;
+            if (answer == -1) {
+                blank++;
+            } else if (answer == key[j]) {
+                correct++;
+                points = rule.correct;
+            } else if (answer >= 0 && answer <= 3) {
+                wrong++;
+                points = rule.wrong;
+            }
+            // Las preguntas sin sección (índice negativo) solo cuentan para el total
+            if (section_of_question[j] >= 0) {
+                student_subscores[section_of_question[j]] += points;
+            }
+        }
+
+        out[i].score = rule_score(correct, wrong, rule);
+        out[i].correct = correct;
+        out[i].wrong = wrong;
+        out[i].blank = blank;
+    }
+}
+
+void combine_sections(const double* subscores, size_t num_students, size_t num_sections, const double* coefficients, size_t num_careers, double* composites) {
+    #pragma omp parallel for schedule(static)
+    for (ptrdiff_t i = 0; i < static_cast<ptrdiff_t>(num_students); ++i) {
+        const double* student_subscores = subscores + i * num_sections;
+        for (size_t c = 0; c < num_careers; ++c) {
+            const double* career_coefficients = coefficients + c * num_sections;
+            double composite = 0.0;
+            for (size_t s = 0; s < num_sections; ++s) {
+                composite += career_coefficients[s] * student_subscores[s];
+            }
+            composites[i * num_careers + c] = composite;
+        }
+    }
+}
+
+} // namespace exam
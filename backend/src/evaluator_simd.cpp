@@ -0,0 +1,196 @@
+#include "evaluator.hpp"
+#include <algorithm>
+#include <omp.h>
+
+#if defined(__x86_64__) || defined(_M_X64) || defined(__i386__) || defined(_M_IX86)
+#define EXAM_SIMD_X86 1
+#include <immintrin.h>
+#if defined(_MSC_VER)
+#include <intrin.h>
+// MSVC permite usar los intrínsecos AVX2 sin banderas de compilación; la elección se hace en tiempo de ejecución
+#define EXAM_TARGET_SSE2
+#define EXAM_TARGET_AVX2
+#else
+#define EXAM_TARGET_SSE2 __attribute__((target("sse2")))
+#define EXAM_TARGET_AVX2 __attribute__((target("avx2")))
+#endif
+#else
+#define EXAM_SIMD_X86 0
+#endif
+
+namespace exam {
+
+namespace {
+
+// Bloque de estudiantes por tarea en el modo OpenMP con kernel SIMD
+constexpr size_t kSimdStudentsPerTask = 256;
+
+inline uint32_t popcount32(uint32_t mask) {
+#if defined(_MSC_VER)
+    // Sin __popcnt: la ruta SSE2 debe funcionar también en CPU sin la instrucción POPCNT
+    mask = mask - ((mask >> 1) & 0x55555555u);
+    mask = (mask & 0x33333333u) + ((mask >> 2) & 0x33333333u);
+    return (((mask + (mask >> 4)) & 0x0F0F0F0Fu) * 0x01010101u) >> 24;
+#else
+    return static_cast<uint32_t>(__builtin_popcount(mask));
+#endif
+}
+
+// Mismas reglas que evaluate_serial para las preguntas [start_question, num_questions) de una fila
+inline void count_scalar(const int8_t* row, const int8_t* key, size_t start_question, size_t num_questions, uint32_t& correct, uint32_t& wrong, uint32_t& blank) {
+    for (size_t j = start_question; j < num_questions; ++j) {
+        const int8_t answer = row[j];
+        if (answer == -1) {
+            blank++;
+        } else if (answer == key[j]) {
+            correct++;
+        } else if (answer >= 0 && answer <= 3) {
+            wrong++;
+        }
+    }
+}
+
+inline void store_result(uint32_t correct, uint32_t wrong, uint32_t blank, ScoringRule rule, Result& out) {
+    out.score = rule_score(correct, wrong, rule);
+    out.correct = correct;
+    out.wrong = wrong;
+    out.blank = blank;
+}
+
+void evaluate_range_scalar(const int8_t* answers, size_t start_student, size_t end_student, const int8_t* key, size_t num_questions, ScoringRule rule, Result* out) {
+    for (size_t i = start_student; i < end_student; ++i) {
+        uint32_t correct = 0, wrong = 0, blank = 0;
+        count_scalar(answers + i * num_questions, key, 0, num_questions, correct, wrong, blank);
+        store_result(correct, wrong, blank, rule, out[i]);
+    }
+}
+
+#if EXAM_SIMD_X86
+
+// Compara 16 respuestas con la clave y acumula las máscaras: blanco (== -1), correcta (== clave y no blanco)
+// e incorrecta (0-3 sin coincidir). El rango 0-3 se comprueba sin signo: min(a, 3) == a.
+EXAM_TARGET_SSE2
+inline void count_sse2(__m128i a, __m128i k, uint32_t& correct, uint32_t& wrong, uint32_t& blank) {
+    const __m128i is_blank = _mm_cmpeq_epi8(a, _mm_set1_epi8(-1));
+    const __m128i is_match = _mm_cmpeq_epi8(a, k);
+    const __m128i in_range = _mm_cmpeq_epi8(_mm_min_epu8(a, _mm_set1_epi8(3)), a);
+    blank += popcount32(static_cast<uint32_t>(_mm_movemask_epi8(is_blank)));
+    correct += popcount32(static_cast<uint32_t>(_mm_movemask_epi8(_mm_andnot_si128(is_blank, is_match))));
+    wrong += popcount32(static_cast<uint32_t>(_mm_movemask_epi8(_mm_andnot_si128(is_match, in_range))));
+}
+
+EXAM_TARGET_SSE2
+void evaluate_range_sse2(const int8_t* answers, size_t start_student, size_t end_student, const int8_t* key, size_t num_questions, ScoringRule rule, Result* out) {
+    const size_t vector_end = num_questions - num_questions % 16;
+    for (size_t i = start_student; i < end_student; ++i) {
+        const int8_t* row = answers + i * num_questions;
+        uint32_t correct = 0, wrong = 0, blank = 0;
+        for (size_t j = 0; j < vector_end; j += 16) {
+            count_sse2(_mm_loadu_si128(reinterpret_cast<const __m128i*>(row + j)),
+                       _mm_loadu_si128(reinterpret_cast<const __m128i*>(key + j)), correct, wrong, blank);
+        }
+        count_scalar(row, key, vector_end, num_questions, correct, wrong, blank);
+        store_result(correct, wrong, blank, rule, out[i]);
+    }
+}
+
+// Igual que la ruta SSE2 con 32 respuestas por instrucción; el resto de 16 usa SSE2 y el final es escalar
+EXAM_TARGET_AVX2
+void evaluate_range_avx2(const int8_t* answers, size_t start_student, size_t end_student, const int8_t* key, size_t num_questions, ScoringRule rule, Result* out) {
+    const size_t wide_end = num_questions - num_questions % 32;
+    const size_t vector_end = num_questions - num_questions % 16;
+    const __m256i minus_one = _mm256_set1_epi8(-1);
+    const __m256i three = _mm256_set1_epi8(3);
+    for (size_t i = start_student; i < end_student; ++i) {
+        const int8_t* row = answers + i * num_questions;
+        uint32_t correct = 0, wrong = 0, blank = 0;
+        for (size_t j = 0; j < wide_end; j += 32) {
+            const __m256i a = _mm256_loadu_si256(reinterpret_cast<const __m256i*>(row + j));
+            const __m256i k = _mm256_loadu_si256(reinterpret_cast<const __m256i*>(key + j));
+            const __m256i is_blank = _mm256_cmpeq_epi8(a, minus_one);
+            const __m256i is_match = _mm256_cmpeq_epi8(a, k);
+            const __m256i in_range = _mm256_cmpeq_epi8(_mm256_min_epu8(a, three), a);
+            blank += popcount32(static_cast<uint32_t>(_mm256_movemask_epi8(is_blank)));
+            correct += popcount32(static_cast<uint32_t>(_mm256_movemask_epi8(_mm256_andnot_si256(is_blank, is_match))));
+            wrong += popcount32(static_cast<uint32_t>(_mm256_movemask_epi8(_mm256_andnot_si256(is_match, in_range))));
+        }
+        for (size_t j = wide_end; j < vector_end; j += 16) {
+            count_sse2(_mm_loadu_si128(reinterpret_cast<const __m128i*>(row + j)),
+                       _mm_loadu_si128(reinterpret_cast<const __m128i*>(key + j)), correct, wrong, blank);
+        }
+        count_scalar(row, key, vector_end, num_questions, correct, wrong, blank);
+        store_result(correct, wrong, blank, rule, out[i]);
+    }
+}
+
+#endif // EXAM_SIMD_X86
+
+SimdLevel detect_simd_level() {
+#if EXAM_SIMD_X86
+#if defined(_MSC_VER)
+    int info[4];
+    __cpuid(info, 0);
+    const int max_leaf = info[0];
+    __cpuid(info, 1);
+    const bool has_sse2 = (info[3] & (1 << 26)) != 0;
+    // AVX2 requiere además que el sistema operativo guarde los registros YMM (OSXSAVE + XCR0)
+    const bool os_saves_ymm = (info[2] & (1 << 27)) != 0 && (info[2] & (1 << 28)) != 0 && (_xgetbv(0) & 6) == 6;
+    if (max_leaf >= 7 && os_saves_ymm) {
+        __cpuidex(info, 7, 0);
+        if (info[1] & (1 << 5)) return SimdLevel::AVX2;
+    }
+    return has_sse2 ? SimdLevel::SSE2 : SimdLevel::Scalar;
+#else
+    __builtin_cpu_init();
+    if (__builtin_cpu_supports("avx2")) return SimdLevel::AVX2;
+    if (__builtin_cpu_supports("sse2")) return SimdLevel::SSE2;
+    return SimdLevel::Scalar;
+#endif
+#else
+    return SimdLevel::Scalar;
+#endif
+}
+
+const SimdLevel g_detected_level = detect_simd_level();
+SimdLevel g_active_level = g_detected_level;
+
+} // namespace
+
+SimdLevel simd_level() {
+    return g_active_level;
+}
+
+SimdLevel set_simd_level(SimdLevel level) {
+    g_active_level = std::min(level, g_detected_level);
+    return g_active_level;
+}
+
+void evaluate_simd_range(const int8_t* answers, size_t start_student, size_t end_student, const int8_t* key, size_t num_questions, ScoringRule rule, Result* out) {
+    switch (g_active_level) {
+#if EXAM_SIMD_X86
+    case SimdLevel::AVX2:
+        evaluate_range_avx2(answers, start_student, end_student, key, num_questions, rule, out);
+        return;
+    case SimdLevel::SSE2:
+        evaluate_range_sse2(answers, start_student, end_student, key, num_questions, rule, out);
+        return;
+#endif
+    default:
+        evaluate_range_scalar(answers, start_student, end_student, key, num_questions, rule, out);
+    }
+}
+
+void evaluate_simd(const int8_t* answers, size_t num_students, const int8_t* key, size_t num_questions, ScoringRule rule, Result* out) {
+    evaluate_simd_range(answers, 0, num_students, key, num_questions, rule, out);
+}
+
+void evaluate_simd_openmp(const int8_t* answers, size_t num_students, const int8_t* key, size_t num_questions, ScoringRule rule, Result* out) {
+    const ptrdiff_t num_tasks = static_cast<ptrdiff_t>((num_students + kSimdStudentsPerTask - 1) / kSimdStudentsPerTask);
+    #pragma omp parallel for schedule(dynamic)
+    for (ptrdiff_t task = 0; task < num_tasks; ++task) {
+        const size_t start = static_cast<size_t>(task) * kSimdStudentsPerTask;
+        evaluate_simd_range(answers, start, std::min(start + kSimdStudentsPerTask, num_students), key, num_questions, rule, out);
+    }
+}
+
+} // namespace exam
@@ -0,0 +1,35 @@
+#include "evaluator.hpp"
+#include <omp.h>
+
+namespace exam {
+
+void evaluate_versions(const int8_t* answers, size_t num_students, const int8_t* keys, size_t num_versions, const int32_t* version_index, size_t num_questions, ScoringRule rule, Result* out) {
+    (void)num_versions;  // Los índices se validan antes de llamar (0 <= version_index[i] < num_versions)
+
+    #pragma omp parallel for schedule(dynamic, 64)
+    for (ptrdiff_t i = 0; i < static_cast<ptrdiff_t>(num_students); ++i) {
+        // Fila de la matriz de claves correspondiente a la versión (tema) del estudiante
+        const int8_t* key = keys + static_cast<size_t>(version_index[i]) * num_questions;
+        uint32_t correct = 0;
+        uint32_t wrong = 0;
+        uint32_t blank = 0;
+
+        for (size_t j = 0; j < num_questions; ++j) {
+            int8_t answer = answers[i * num_questions + j];
+            if (answer == -1) {
+                blank++;
+            } else if (answer == key[j]) {
+                correct++;
+            } else if (answer >= 0 && answer <= 3) {
+                wrong++;
+            }
+        }
+
+        out[i].score = rule_score(correct, wrong, rule);
+        out[i].correct = correct;
+        out[i].wrong = wrong;
+        out[i].blank = blank;
+    }
+}
+
+} // namespace exam
@@ -0,0 +1,48 @@
+#include "evaluator.hpp"
+#include <omp.h>
+
+namespace exam {
+
+void evaluate_weighted_range(const int8_t* answers, size_t start_student, size_t end_student, const int8_t* key, size_t num_questions, QuestionWeights weights, Result* out) {
+    for (size_t i = start_student; i < end_student; ++i) {
+        const int8_t* row = answers + i * num_questions;
+        double score = 0.0;
+        uint32_t correct = 0;
+        uint32_t wrong = 0;
+        uint32_t blank = 0;
+
+        // Sin saltos: cada pregunta suma su peso multiplicado por la condición (0 o 1); la reducción
+        // explícita permite reordenar la suma de doubles y vectorizar el bucle
+        #pragma omp simd reduction(+:score, correct, wrong, blank)
+        for (size_t j = 0; j < num_questions; ++j) {
+            const int8_t answer = row[j];
+            const int32_t is_blank = answer == -1;
+            const int32_t is_correct = (answer == key[j]) & !is_blank;
+            const int32_t is_wrong = (answer >= 0) & (answer <= 3) & !is_correct;
+            blank += is_blank;
+            correct += is_correct;
+            wrong += is_wrong;
+            score += is_correct * weights.correct[j] + is_wrong * weights.wrong[j] + is_blank * weights.blank[j];
+        }
+
+        out[i].score = score;
+        out[i].correct = correct;
+        out[i].wrong = wrong;
+        out[i].blank = blank;
+    }
+}
+
+void evaluate_weighted_serial(const int8_t* answers, size_t num_students, const int8_t* key, size_t num_questions, QuestionWeights weights, Result* out) {
+    evaluate_weighted_range(answers, 0, num_students, key, num_questions, weights, out);
+}
+
+void evaluate_weighted_openmp(const int8_t* answers, size_t num_students, const int8_t* key, size_t num_questions, QuestionWeights weights, Result* out) {
+    const ptrdiff_t block = 64;
+    #pragma omp parallel for schedule(dynamic, 1)
+    for (ptrdiff_t start = 0; start < static_cast<ptrdiff_t>(num_students); start += block) {
+        size_t end = static_cast<size_t>(start + block) < num_students ? static_cast<size_t>(start + block) : num_students;
+        evaluate_weighted_range(answers, static_cast<size_t>(start), end, key, num_questions, weights, out);
+    }
+}
+
+} // namespace exam
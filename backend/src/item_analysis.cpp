@@ -0,0 +1,67 @@
+#include "evaluator.hpp"
+#include <algorithm>
+#include <numeric>
+#include <vector>
+#include <omp.h>
+
+namespace exam {
+
+void item_analysis(const int8_t* answers, size_t num_students, const int8_t* key, size_t num_questions, const double* scores, double group_fraction, uint64_t* option_counts, double* difficulty, double* discrimination) {
+    // Grupos superior e inferior (p. ej. 27 %) según el puntaje total; nth_element es O(n)
+    const size_t group_size = static_cast<size_t>(group_fraction * static_cast<double>(num_students));
+    std::vector<int8_t> group(num_students, 0);
+    if (group_size > 0) {
+        std::vector<uint32_t> order(num_students);
+        std::iota(order.begin(), order.end(), 0);
+        auto by_score = [scores](uint32_t a, uint32_t b) { return scores[a] < scores[b]; };
+        std::nth_element(order.begin(), order.begin() + group_size, order.end(), by_score);
+        for (size_t k = 0; k < group_size; ++k) group[order[k]] = -1;
+        std::nth_element(order.begin() + group_size, order.end() - group_size, order.end(), by_score);
+        for (size_t k = num_students - group_size; k < num_students; ++k) group[order[k]] = 1;
+    }
+
+    // Columnas por pregunta: A, B, C, D, blanco, correctas del grupo superior, correctas del grupo inferior
+    const size_t stride = kItemOptions + 2;
+    std::vector<uint64_t> totals(num_questions * stride, 0);
+
+    #pragma omp parallel
+    {
+        // Reducción paralela: cada hilo acumula en su propia tabla y luego se suman
+        std::vector<uint64_t> local(num_questions * stride, 0);
+
+        #pragma omp for schedule(static)
+        for (ptrdiff_t i = 0; i < static_cast<ptrdiff_t>(num_students); ++i) {
+            const int8_t* row = answers + i * num_questions;
+            const int8_t student_group = group[i];
+            for (size_t j = 0; j < num_questions; ++j) {
+                const int8_t answer = row[j];
+                uint64_t* counts = local.data() + j * stride;
+                if (answer >= 0 && answer <= 3) {
+                    counts[answer]++;
+                    if (answer == key[j] && student_group != 0) {
+                        counts[student_group > 0 ? kItemOptions : kItemOptions + 1]++;
+                    }
+                } else if (answer == -1) {
+                    counts[kItemOptions - 1]++;
+                }
+            }
+        }
+
+        #pragma omp critical
+        for (size_t k = 0; k < totals.size(); ++k) {
+            totals[k] += local[k];
+        }
+    }
+
+    for (size_t j = 0; j < num_questions; ++j) {
+        const uint64_t* counts = totals.data() + j * stride;
+        std::copy(counts, counts + kItemOptions, option_counts + j * kItemOptions);
+        const bool valid_key = key[j] >= 0 && key[j] <= 3;
+        difficulty[j] = (valid_key && num_students > 0) ? static_cast<double>(counts[key[j]]) / num_students : 0.0;
+        discrimination[j] = (valid_key && group_size > 0)
+            ? (static_cast<double>(counts[kItemOptions]) - static_cast<double>(counts[kItemOptions + 1])) / group_size
+            : 0.0;
+    }
+}
+
+} // namespace exam
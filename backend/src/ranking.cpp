@@ -0,0 +1,120 @@
+#include "evaluator.hpp"
+#include <algorithm>
+#include <numeric>
+#include <omp.h>
+
+namespace exam {
+
+namespace {
+
+// Orden de mérito: mayor puntaje, luego mayor desempate; a igualdad total, menor índice (orden determinista)
+struct Better {
+    const double* scores;
+    size_t stride;
+    const double* tiebreak;
+
+    double score(int32_t i) const { return scores[static_cast<size_t>(i) * stride]; }
+    double secondary(int32_t i) const { return tiebreak != NULL ? tiebreak[i] : 0.0; }
+
+    bool tied(int32_t a, int32_t b) const {
+        return score(a) == score(b) && secondary(a) == secondary(b);
+    }
+
+    bool operator()(int32_t a, int32_t b) const {
+        if (score(a) != score(b)) return score(a) > score(b);
+        if (secondary(a) != secondary(b)) return secondary(a) > secondary(b);
+        return a < b;
+    }
+};
+
+struct Entry {
+    double score;
+    double secondary;
+    int32_t index;
+};
+
+inline Entry make_entry(const double* scores, size_t num_columns, size_t column, const double* tiebreak, int32_t i) {
+    return Entry{scores[static_cast<size_t>(i) * num_columns + column], tiebreak != NULL ? tiebreak[i] : 0.0, i};
+}
+
+// Mismo orden de mérito que Better, sobre entradas ya copiadas
+struct EntryBetter {
+    bool operator()(const Entry& a, const Entry& b) const {
+        if (a.score != b.score) return a.score > b.score;
+        if (a.secondary != b.secondary) return a.secondary > b.secondary;
+        return a.index < b.index;
+    }
+};
+
+} // namespace
+
+void rank_scores(const double* scores, const double* tiebreak, size_t num_students, RankMethod method, int32_t* order, uint32_t* ranks) {
+    std::iota(order, order + num_students, 0);
+    const Better better{scores, 1, tiebreak};
+    std::sort(order, order + num_students, better);
+
+    uint32_t rank = 0;
+    for (size_t position = 0; position < num_students; ++position) {
+        if (position == 0 || !better.tied(order[position - 1], order[position])) {
+            // Competición (1224): el rango salta tras un empate; denso (1223): avanza de uno en uno
+            rank = (method == RankMethod::Competition) ? static_cast<uint32_t>(position + 1) : rank + 1;
+        }
+        ranks[order[position]] = rank;
+    }
+}
+
+void select_top_k(const double* scores, size_t num_students, size_t num_columns, const double* tiebreak, const int32_t* applicant_column, const uint32_t* vacancies, bool include_ties, std::vector<std::vector<int32_t>>& selected) {
+    // Postulantes por columna (carrera) si cada estudiante elige una; sin applicant_column compiten todos en todas
+    std::vector<std::vector<int32_t>> applicants;
+    if (applicant_column != NULL) {
+        applicants.resize(num_columns);
+        for (size_t i = 0; i < num_students; ++i) {
+            const int32_t column = applicant_column[i];
+            if (column >= 0 && static_cast<size_t>(column) < num_columns) {
+                applicants[column].push_back(static_cast<int32_t>(i));
+            }
+        }
+    }
+
+    selected.assign(num_columns, std::vector<int32_t>());
+    #pragma omp parallel for schedule(dynamic)
+    for (ptrdiff_t c = 0; c < static_cast<ptrdiff_t>(num_columns); ++c) {
+        // Copia contigua (puntaje, desempate, índice): la selección no salta por la matriz con paso num_columns
+        std::vector<Entry> pool;
+        if (applicant_column != NULL) {
+            pool.reserve(applicants[c].size());
+            for (int32_t i : applicants[c]) {
+                pool.push_back(make_entry(scores, num_columns, c, tiebreak, i));
+            }
+        } else {
+            pool.reserve(num_students);
+            for (size_t i = 0; i < num_students; ++i) {
+                pool.push_back(make_entry(scores, num_columns, c, tiebreak, static_cast<int32_t>(i)));
+            }
+        }
+        const size_t k = std::min<size_t>(vacancies[c], pool.size());
+        if (k == 0) {
+            continue;
+        }
+
+        // Selección parcial O(m): los k mejores quedan antes de la posición k, sin ordenar el resto
+        std::nth_element(pool.begin(), pool.begin() + (k - 1), pool.end(), EntryBetter());
+        const Entry cutoff = pool[k - 1];  // El k-ésimo mejor: el último admitido
+        auto admitted_end = pool.begin() + k;
+        if (include_ties) {
+            // Empate en la última vacante: ingresan todos los que igualan al último admitido
+            admitted_end = std::partition(admitted_end, pool.end(), [&cutoff](const Entry& e) {
+                return e.score == cutoff.score && e.secondary == cutoff.secondary;
+            });
+        }
+        std::sort(pool.begin(), admitted_end, EntryBetter());
+
+        std::vector<int32_t>& admitted = selected[c];
+        admitted.reserve(admitted_end - pool.begin());
+        for (auto it = pool.begin(); it != admitted_end; ++it) {
+            admitted.push_back(it->index);
+        }
+    }
+}
+
+} // namespace exam
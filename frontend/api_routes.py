@@ -1,31 +1,391 @@
+from typing import List
 from fastapi import FastAPI, UploadFile, File, Form
-from starlette.responses import FileResponse, StreamingResponse
+from starlette.responses import FileResponse, StreamingResponse, JSONResponse
+from starlette.concurrency import run_in_threadpool
 import pandas as pd
+import numpy as np
 import io
 import json
 import os
+import time
 from datetime import datetime
 from frontend.utils.logger import Logger
 from frontend.config_utils import load_scoring_config
-from frontend.evaluation_logic import run_serial, run_openmp, run_cuda, run_pthreads
-from frontend.benchmark_logic import run_full_benchmark
+from frontend.evaluation_logic import run_serial, run_openmp, run_cuda, run_pthreads, run_packed, run_simd, run_openmp_simd, run_pthreads_simd, run_numpy, run_packed_planes, run_versions, run_weighted, run_sections, section_labels, career_coefficients, run_item_analysis, rescore, run_out_of_core
+from frontend.out_of_core import OUT_OF_CORE_MODES
+from frontend.jobs import job_queue, benchmark_queue, JOB_DONE, JOB_FAILED
+from frontend.benchmark_logic import run_sampled_benchmark, reserve_benchmark_slot, BENCHMARK_SAMPLE_ROWS, BENCHMARK_MIN_INTERVAL_S
+from frontend.backend_selection import choose_mode, AUTO_MODES
+from frontend.ranking import rank_results, admission_cutoffs, RANK_METHODS
+from frontend.ingestion import read_responses, read_answer_key, DEFAULT_KEY_VERSION, WEIGHT_COLS
+from frontend.dataset_cache import dataset_cache
+from frontend.dataset_registry import dataset_registry
+from frontend.results_cache import results_cache, results_key
+from frontend.encoding import encode_key, encode_values, ANNULLED_CODE
 
 logger = Logger()
 
+# Modos de ejecución aceptados por /run
+EVALUATION_MODES = {
+    "serial": run_serial,
+    "openmp": run_openmp,
+    "cuda": run_cuda,
+    "pthreads": run_pthreads,
+    "packed": run_packed,
+    "simd": run_simd,
+    "openmp_simd": run_openmp_simd,
+    "pthreads_simd": run_pthreads_simd,
+    "numpy": run_numpy,
+}
+
+# Regla de puntuación si scoring.json no define 'scoring'
+DEFAULT_SCORING_RULES = {"correct": 0.0, "wrong": 0.0, "blank": 0.0}
+
+def _evaluate_in_chunks(run_fn, students_df: pd.DataFrame, key, scoring_rules: dict, chunk_size: int, progress=None) -> pd.DataFrame:
+    """
+    Evalúa todos los estudiantes con run_fn, por bloques de chunk_size filas si chunk_size > 0.
+    key es la Serie de la clave (modos de una versión) o el DataFrame de claves (run_versions).
+    progress(completados, total), si se indica, se llama tras cada bloque.
+    """
+    if chunk_size <= 0:
+        results_df = run_fn(students_df, key, scoring_rules)
+        if progress is not None:
+            progress(len(students_df), len(students_df))
+        return results_df
+    all_results_list = []
+    for i in range(0, len(students_df), chunk_size):
+        all_results_list.append(run_fn(students_df.iloc[i:i + chunk_size], key, scoring_rules))
+        if progress is not None:
+            progress(min(i + chunk_size, len(students_df)), len(students_df))
+    return pd.concat(all_results_list, ignore_index=True)
+
+def _results_metrics(results_df: pd.DataFrame) -> dict:
+    """Métricas agregadas que acompañan a los resultados en /run y /rescore."""
+    return {
+        "total_students": len(results_df),
+        "average_score": results_df['score'].mean(),
+        "average_correct": results_df['correct'].mean(),
+        "average_wrong": results_df['wrong'].mean(),
+        "average_blank": results_df['blank'].mean(),
+    }
+
+def _corrected_key(key_rows: pd.DataFrame, corrections: dict) -> pd.Series:
+    """
+    Aplica correcciones {question_id: letra o código} a la columna 'correct_answer' de las filas de una
+    versión de la clave; None o una cadena vacía anulan la pregunta.
+    Lanza ValueError si una pregunta no existe o la respuesta corregida no es A-D.
+    """
+    corrected = key_rows['correct_answer'].copy()
+    question_ids = {str(question_id): row for row, question_id in key_rows['question_id'].items()}
+    for question_id, value in corrections.items():
+        if str(question_id) not in question_ids:
+            raise ValueError(f"Pregunta desconocida en las correcciones: {question_id}")
+        if value is None or str(value).strip() == '':
+            code = ANNULLED_CODE
+        else:
+            code = int(encode_values(np.array([value], dtype=object))[0])
+            if code < 0:
+                raise ValueError(f"Respuesta corregida no válida para la pregunta {question_id}: {value}")
+        corrected[question_ids[str(question_id)]] = code
+    return corrected
+
+def _next_free_version(used: set) -> str:
+    """Primera letra (A, B, C, ...) que aún no se usa como versión."""
+    code = ord(DEFAULT_KEY_VERSION)
+    while chr(code) in used:
+        code += 1
+    return chr(code)
+
+def _load_answer_keys(key_files: list) -> pd.DataFrame:
+    """
+    Lee una o varias claves de respuestas y las une en un DataFrame con 'version', 'question_id',
+    'correct_answer' y los pesos por pregunta (WEIGHT_COLS, NaN si el archivo no los trae).
+
+    Cada archivo puede traer su columna 'version'. Un archivo sin ella cuya versión por defecto ya fue
+    cargada por un archivo anterior recibe la siguiente letra libre (A, B, C, ... en el orden de subida).
+    """
+    frames = []
+    used_versions = set()
+    for key_file in key_files:
+        read_key = lambda source: read_answer_key(source, key_file.filename)
+        versions, question_ids, key_codes, weights, _ = dataset_cache.get_or_parse(key_file.file, 'answer_key', read_key, ('versions', 'question_ids', 'answers', 'weights', 'labels'), key_file.filename)
+        versions = np.asarray(versions)
+        if used_versions and (versions == DEFAULT_KEY_VERSION).all() and DEFAULT_KEY_VERSION in used_versions:
+            versions = np.full(len(versions), _next_free_version(used_versions))
+        used_versions.update(versions.tolist())
+        frame = pd.DataFrame({'version': versions, 'question_id': question_ids, 'correct_answer': key_codes})
+        frame[WEIGHT_COLS] = weights
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+# Filas por lote al transmitir resultados (/jobs/{job_id}/results): acota la memoria de cada fragmento
+RESULTS_STREAM_BATCH_ROWS = 10000
+RESULTS_STREAM_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+def _stream_results(results_df: pd.DataFrame, fmt: str, batch_rows: int = RESULTS_STREAM_BATCH_ROWS):
+    """
+    Genera los resultados como NDJSON (un objeto por línea) o CSV (con cabecera), por lotes de batch_rows filas.
+    El generador es síncrono: StreamingResponse lo consume en el threadpool sin bloquear el event loop.
+    """
+    if fmt == "csv":
+        yield results_df.iloc[:0].to_csv(index=False)
+    for start in range(0, len(results_df), batch_rows):
+        batch = results_df.iloc[start:start + batch_rows]
+        if fmt == "csv":
+            yield batch.to_csv(index=False, header=False)
+        else:
+            yield batch.to_json(orient='records', lines=True).rstrip('\n') + '\n'
+
+def _resolve_dataset(app: FastAPI, dataset_id: str = None) -> dict:
+    """
+    Entrada del registro para dataset_id, o la del último dataset cargado si no se indica.
+    Lanza KeyError si no hay datasets cargados o el indicado no existe.
+    """
+    dataset_id = dataset_id or getattr(app.state, 'current_dataset', None)
+    if dataset_id is None:
+        raise KeyError("Archivos de estudiantes o clave no cargados.")
+    return dataset_registry.get(dataset_id)
+
+def _find_job(job_id: str):
+    """Cola y estado de un trabajo de evaluación o de benchmark; (None, None) si no existe."""
+    for queue in (job_queue, benchmark_queue):
+        job = queue.get(job_id)
+        if job is not None:
+            return queue, job
+    return None, None
+
+def submit_benchmark(app: FastAPI, modes: list = None, sample_rows: int = None, dataset_id: str = None) -> dict:
+    """
+    Encola un benchmark sobre una muestra del dataset cargado, respetando el intervalo mínimo entre benchmarks
+    ('benchmark_min_interval_s' de scoring.json).
+
+    Args:
+        app (FastAPI): Aplicación (el dataset por defecto es el último cargado).
+        modes (list, optional): Modos a medir (por defecto, los disponibles).
+        sample_rows (int, optional): Tamaño de la muestra. Por defecto 'benchmark_sample_rows' de scoring.json.
+        dataset_id (str, optional): Dataset del registro sobre el que medir.
+
+    Returns:
+        dict: Respuesta de /benchmark/run ('job_id', o 'message' y 'retry_after' si no se encoló).
+    """
+    try:
+        dataset = _resolve_dataset(app, dataset_id)
+    except KeyError as e:
+        return {"status": "error", "message": e.args[0]}
+    unknown = [mode for mode in modes or [] if mode not in AUTO_MODES]
+    if unknown:
+        return {"status": "error", "message": f"Modos de benchmark no válidos: {', '.join(unknown)}"}
+
+    scoring_config_current = load_scoring_config()
+    wait_s = reserve_benchmark_slot(float(scoring_config_current.get('benchmark_min_interval_s', BENCHMARK_MIN_INTERVAL_S)))
+    if wait_s > 0:
+        return {"status": "error", "message": "Se ejecutó un benchmark recientemente.", "retry_after": round(wait_s, 1)}
+    if sample_rows is None:
+        sample_rows = int(scoring_config_current.get('benchmark_sample_rows', BENCHMARK_SAMPLE_ROWS))
+    scoring_rules = scoring_config_current.get('scoring', DEFAULT_SCORING_RULES)
+    key_df = dataset["key_df"]
+    key_series = key_df.loc[key_df['version'] == key_df['version'].iloc[0], 'correct_answer']
+
+    job_id = benchmark_queue.submit("benchmark", run_sampled_benchmark, dataset["students_df"], key_series, scoring_rules, modes, sample_rows)
+    logger.log("INFO", "benchmark", "Benchmark encolado.", extra={"job_id": job_id, "dataset_id": dataset["dataset_id"], "modes": modes, "sample_rows": sample_rows})
+    return {"status": "ok", "job_id": job_id, "status_url": f"/jobs/{job_id}"}
+
+def benchmark_scheduler(app: FastAPI, interval_s: float):
+    """
+    Bucle del benchmark periódico ('benchmark_schedule_minutes' de scoring.json): cada interval_s segundos
+    encola un benchmark del último dataset cargado, si lo hay.
+    """
+    while True:
+        time.sleep(interval_s)
+        response = submit_benchmark(app)
+        if response["status"] != "ok" and "retry_after" not in response:
+            logger.log("INFO", "benchmark", f"Benchmark programado omitido: {response['message']}")
+
+def _reject(message: str, **extra):
+    """Registra una configuración de evaluación no válida (RF-02) y devuelve el ValueError que se debe lanzar."""
+    logger.log("ERROR", "validation", message, extra={"rule_id": "RF-02", **extra})
+    return ValueError(message)
+
+def _evaluation_plan(dataset: dict, mode: str, scoring_config: dict) -> dict:
+    """
+    Decide cómo evaluar un dataset con la configuración actual: modo ('auto' se resuelve con el modelo de costo),
+    clave de la primera versión, pesos por pregunta, secciones, preguntas anuladas y evaluación fuera de memoria.
+    Lanza ValueError si la combinación no es válida.
+
+    Args:
+        dataset (dict): Entrada del registro de datasets.
+        mode (str): Modo pedido en /run (una clave de EVALUATION_MODES o 'auto').
+        scoring_config (dict): Configuración de scoring.json.
+
+    Returns:
+        dict: 'mode', 'run_fn', 'key_series', 'multi_version', 'weights_df', 'weighted', 'annulled',
+              'sections_config', 'use_sections', 'out_of_core', 'out_of_core_mb' y 'chunk_size'.
+    """
+    students_df = dataset["students_df"]
+    key_df = dataset["key_df"]
+    chunk_size = scoring_config.get('chunk_size', 0)
+    # Techo de memoria (MB) de la evaluación fuera de memoria; 0 evalúa todo en RAM
+    out_of_core_mb = float(scoring_config.get('out_of_core_memory_mb', 0))
+    # Clave de la primera versión: la única en exámenes de un solo tema y la usada por el benchmark
+    first_version = key_df['version'] == key_df['version'].iloc[0]
+
+    if mode == "auto":
+        # Modo con menor tiempo estimado por el modelo de costo calibrado (ver backend_selection)
+        candidates = list(OUT_OF_CORE_MODES) if out_of_core_mb > 0 else None
+        mode = choose_mode(len(students_df), int(first_version.sum()), chunk_size, candidates)
+        logger.log("INFO", "execution", f"Modo automático: se eligió {mode}.", extra={"mode": mode, "num_students": len(students_df), "chunk_size": chunk_size})
+    run_fn = EVALUATION_MODES.get(mode)
+    if run_fn is None:
+        raise _reject(f"Modo de ejecución no válido: {mode}", mode_attempted=mode)
+
+    multi_version = key_df['version'].nunique() > 1
+    # Pesos por pregunta de la clave (columnas weight_*); sin ellos se usa la regla escalar
+    weights_df = key_df.loc[first_version, WEIGHT_COLS].rename(columns=lambda col: col[len('weight_'):])
+    weighted = bool(weights_df.notna().to_numpy().any())
+    if weighted and multi_version:
+        raise _reject("Los pesos por pregunta no están soportados con varias versiones de clave.")
+    # Preguntas anuladas por /rescore: solo la evaluación de una versión sin pesos las aplica
+    annulled = bool((key_df['correct_answer'] == ANNULLED_CODE).any())
+
+    # Subpuntajes por sección y compuestos por carrera (claves 'sections' y 'careers' de scoring.json)
+    sections_config = scoring_config.get('sections') or {}
+    use_sections = bool(sections_config) and not multi_version and not weighted
+    if sections_config and not use_sections:
+        logger.log("INFO", "execution", "Subpuntajes por sección omitidos: no se calculan con varias versiones ni con pesos por pregunta.")
+    if annulled and (multi_version or weighted or use_sections):
+        raise _reject("Las preguntas anuladas solo se aplican en la evaluación de una versión sin pesos ni secciones.")
+    # Fuera de memoria: la matriz se lee del archivo .npy por ventanas
+    out_of_core = out_of_core_mb > 0 and not multi_version and not weighted and not use_sections
+    if out_of_core and mode not in OUT_OF_CORE_MODES:
+        raise _reject(f"El modo {mode} no soporta la evaluación fuera de memoria.", mode_attempted=mode)
+
+    return {
+        "mode": mode,
+        "run_fn": run_fn,
+        "key_series": key_df.loc[first_version, 'correct_answer'],
+        "multi_version": multi_version,
+        "weights_df": weights_df,
+        "weighted": weighted,
+        "annulled": annulled,
+        "sections_config": sections_config,
+        "use_sections": use_sections,
+        "out_of_core": out_of_core,
+        "out_of_core_mb": out_of_core_mb,
+        "chunk_size": chunk_size,
+    }
+
+def _evaluate_plan(dataset: dict, plan: dict, scoring_config: dict, progress=None) -> pd.DataFrame:
+    """
+    Evalúa un dataset según _evaluation_plan (sin consultar la caché de resultados) y retira del puntaje las
+    preguntas anuladas. progress(completados, total), si se indica, se llama tras cada bloque.
+    """
+    students_df = dataset["students_df"]
+    key_df = dataset["key_df"]
+    key_series = plan["key_series"]
+    scoring_rules = scoring_config.get('scoring', DEFAULT_SCORING_RULES)
+    chunk_size = plan["chunk_size"]
+
+    if plan["multi_version"]:
+        # Varias versiones: una sola pasada con la matriz de claves (el modo solo aplica al benchmark)
+        return _evaluate_in_chunks(run_versions, students_df, key_df, scoring_rules, chunk_size, progress)
+    if plan["use_sections"]:
+        first_version = key_df['version'] == key_df['version'].iloc[0]
+        sections = pd.Series(section_labels(key_df.loc[first_version, 'question_id'], plan["sections_config"]), index=key_series.index)
+        careers = career_coefficients(scoring_config.get('careers') or {})
+        run_sections_mode = lambda df, key, rule: run_sections(df, key, sections, rule, careers)
+        return _evaluate_in_chunks(run_sections_mode, students_df, key_series, scoring_rules, chunk_size, progress)
+    if plan["weighted"]:
+        run_weighted_mode = lambda df, key, rule: run_weighted(df, key, plan["weights_df"], rule, mode=plan["mode"])
+        return _evaluate_in_chunks(run_weighted_mode, students_df, key_series, scoring_rules, chunk_size, progress)
+
+    if plan["out_of_core"]:
+        # Con la entrada de la caché de datasets se evalúa su .npy directamente, sin copiar la matriz
+        cached = dataset_cache.get(dataset["cache_key"])
+        answers_source = cached['answers'] if cached is not None and 'answers' in cached else dataset["arrays"]["answers"]
+        results_df = run_out_of_core(answers_source, students_df['student_id'].to_numpy(), key_series, scoring_rules, plan["mode"], plan["out_of_core_mb"], progress)
+    elif plan["mode"] == 'packed':
+        # Planos de bits guardados con el dataset: se empaquetan una sola vez (menos de la mitad de la matriz int8)
+        packed = dataset_registry.packed_answers(dataset["dataset_id"])
+        results_df = run_packed_planes(packed, students_df['student_id'].to_numpy(), key_series, scoring_rules)
+        if progress is not None:
+            progress(len(students_df), len(students_df))
+    else:
+        results_df = _evaluate_in_chunks(plan["run_fn"], students_df, key_series, scoring_rules, chunk_size, progress)
+    # Los modos run_* evalúan las anuladas como clave inválida (-1); el delta las retira del puntaje
+    if plan["annulled"]:
+        results_df = rescore(results_df, dataset["arrays"]["answers"], encode_key(key_series), encode_key(key_series, keep_annulled=True), scoring_rules)
+    return results_df
+
+def _record_evaluation(dataset_id: str, plan: dict, results_df: pd.DataFrame, scoring_rules: dict):
+    """Guarda en el registro el estado de /rescore (solo una versión sin pesos ni secciones) y los resultados de /ranking."""
+    if not (plan["multi_version"] or plan["use_sections"] or plan["weighted"]):
+        # Estado para /rescore: resultados, clave y regla de esta evaluación
+        key_np = encode_key(plan["key_series"], keep_annulled=True)
+        dataset_registry.update(dataset_id, last_run={"results": results_df, "key": key_np, "rule": scoring_rules})
+    # Resultados de la última evaluación del dataset, para /ranking
+    dataset_registry.update(dataset_id, last_results=results_df)
+
+def evaluation_job(dataset: dict, mode: str, progress=None) -> dict:
+    """
+    Trabajo de /run: evalúa un dataset del registro con el modo indicado y guarda en él el estado de /rescore y
+    /ranking. Se ejecuta en el pool de job_queue (fuera del event loop); el benchmark va aparte (/benchmark/run).
+    Lanza ValueError si la configuración de la evaluación no es válida.
+
+    Returns:
+        dict: 'results' (DataFrame), 'metrics', 'mode' (el elegido, también con 'auto'), 'dataset_id' y 'cached'.
+    """
+    dataset_id = dataset["dataset_id"]
+    num_students = len(dataset["students_df"])
+    # Leer configuración de puntuación desde el archivo en cada ejecución
+    scoring_config = load_scoring_config()
+    scoring_rules = scoring_config.get('scoring', DEFAULT_SCORING_RULES)
+    plan = _evaluation_plan(dataset, mode, scoring_config)
+
+    try:
+        dataset_registry.update(dataset_id, last_run=None)
+        # Resultados memorizados: mismo dataset, clave y reglas (con cualquier modo en memoria) dan los mismos puntajes
+        memo_key = results_key(dataset["cache_key"], dataset["key_df"], scoring_config, plan["out_of_core"])
+        cached_results = results_cache.get(memo_key)
+        if progress is not None:
+            progress(0, num_students, 'evaluation')
+        if cached_results is None:
+            # La evaluación nativa libera el GIL: mientras corre en el pool de trabajos, el event loop sigue
+            # atendiendo otras peticiones (/jobs, /logs, callbacks de Dash)
+            results_df = _evaluate_plan(dataset, plan, scoring_config, progress)
+            results_cache.put(memo_key, results_df)
+        else:
+            results_df = cached_results
+            if progress is not None:
+                progress(num_students, num_students, 'evaluation')
+
+        _record_evaluation(dataset_id, plan, results_df, scoring_rules)
+        metrics = _results_metrics(results_df)
+        logger.log("INFO", "execution", "Evaluación completada exitosamente.", extra={"dataset_id": dataset_id, "mode": plan["mode"], "multi_version": plan["multi_version"], "weighted": plan["weighted"], "out_of_core": plan["out_of_core"], "cached": cached_results is not None, "metrics": metrics, "rule_ids": ["RF-05", "RF-08"]})
+    except Exception as e:
+        logger.log("ERROR", "execution", f"Error durante la evaluación: {str(e)}", extra={"error_details": str(e), "rule_id": "RF-08"})
+        raise
+
+    return {"results": results_df, "metrics": metrics, "mode": plan["mode"], "dataset_id": dataset_id, "cached": cached_results is not None}
+
 def setup_api_routes(app: FastAPI):
     @app.post("/upload")
-    async def upload_files(students_file: UploadFile = File(...), key_file: UploadFile = File(...)):
+    async def upload_files(students_file: UploadFile = File(...), key_file: List[UploadFile] = File(...), dataset_id: str = Form(None)):
         try:
-            students_content = await students_file.read()
-            key_content = await key_file.read()
-
-            app.state.students_df = pd.read_excel(io.BytesIO(students_content))
-            # Renombrar la columna 'DNI' a 'student_id' para que coincida con la lógica de evaluación
-            if 'DNI' in app.state.students_df.columns:
-                app.state.students_df.rename(columns={'DNI': 'student_id'}, inplace=True)
-            app.state.key_df = pd.read_excel(io.BytesIO(key_content))
-            logger.log("INFO", "file_upload", "Archivos cargados exitosamente.", extra={"students_file": students_file.filename, "key_file": key_file.filename})
-            return {"status": "ok"}
+            # UploadFile ya se almacena en un SpooledTemporaryFile (a disco si es grande);
+            # se lee por lotes en un hilo aparte para no bloquear el event loop.
+            # Si el contenido ya se parseó antes (mismo SHA-256) se carga desde la caché en disco.
+            # El lector (xlsx, csv, parquet/arrow o texto de lectora óptica) se elige por la extensión.
+            read_students = lambda source: read_responses(source, students_file.filename)
+            cache_key, arrays = await run_in_threadpool(dataset_cache.parse_cached, students_file.file, 'responses', read_students, ('student_ids', 'answers', 'versions'), students_file.filename)
+            # Se aceptan varias claves (una por versión/tema) enviando key_file más de una vez
+            key_df = await run_in_threadpool(_load_answer_keys, key_file)
+            # Cada carga es un dataset del registro; dataset_id (p. ej. el área) es opcional y repetirlo reemplaza
+            # ese dataset. Los demás endpoints usan el último cargado si no reciben dataset_id.
+            filenames = {"students_file": students_file.filename, "key_file": [f.filename for f in key_file]}
+            dataset_id = await run_in_threadpool(dataset_registry.register, cache_key, arrays, key_df, filenames, dataset_id or None)
+            app.state.current_dataset = dataset_id
+            logger.log("INFO", "file_upload", "Archivos cargados exitosamente.", extra={**filenames, "dataset_id": dataset_id, "versions": sorted(key_df['version'].unique().tolist()), "num_students": len(arrays[0])})
+            return {"status": "ok", "dataset_id": dataset_id}
         except Exception as e:
             logger.log("ERROR", "file_upload", f"Error al cargar archivos: {str(e)}", extra={"error_details": str(e)})
             return {"status": "error", "message": str(e)}
@@ -33,73 +393,175 @@ def setup_api_routes(app: FastAPI):
     @app.post("/run")
     async def run_evaluation(
         mode: str = Form(...),
+        dataset_id: str = Form(None),
     ):
         try:
-            if not hasattr(app.state, 'students_df') or not hasattr(app.state, 'key_df'):
-                logger.log("ERROR", "validation", "Archivos de estudiantes o clave no cargados.", extra={"rule_id": "RF-02"})
-                return {"status": "error", "message": "Archivos de estudiantes o clave no cargados."}
-
-            students_df = app.state.students_df
-            key_df = app.state.key_df
-            # Leer configuración de puntuación desde el archivo en cada ejecución
-            scoring_config_current = load_scoring_config()
-            chunk_size = scoring_config_current.get('chunk_size', 0)
-            scoring_rules = scoring_config_current.get('scoring', {"correct": 0.0, "wrong": 0.0, "blank": 0.0})
-
-            if chunk_size > 0:
-                all_results_list = []
-                num_students = len(students_df)
-                for i in range(0, num_students, chunk_size):
-                    chunk_df = students_df.iloc[i:i + chunk_size]
-                    if mode == "serial":
-                        chunk_results_df = run_serial(chunk_df, key_df['correct_answer'], scoring_rules)
-                    elif mode == "openmp":
-                        chunk_results_df = run_openmp(chunk_df, key_df['correct_answer'], scoring_rules)
-                    elif mode == "cuda":
-                        chunk_results_df = run_cuda(chunk_df, key_df['correct_answer'], scoring_rules)
-                    elif mode == "pthreads":
-                        chunk_results_df = run_pthreads(chunk_df, key_df['correct_answer'], scoring_rules)
-                    else:
-                        logger.log("ERROR", "validation", f"Modo de ejecución no válido: {mode}", extra={"rule_id": "RF-02", "mode_attempted": mode})
-                        return {"status": "error", "message": "Modo de ejecución no válido."}
-                    all_results_list.append(chunk_results_df)
-
-                results_df = pd.concat(all_results_list, ignore_index=True)
-            else:
-                if mode == "serial":
-                    results_df = run_serial(students_df, key_df['correct_answer'], scoring_rules)
-                elif mode == "openmp":
-                    results_df = run_openmp(students_df, key_df['correct_answer'], scoring_rules)
-                elif mode == "cuda":
-                    results_df = run_cuda(students_df, key_df['correct_answer'], scoring_rules)
-                elif mode == "pthreads":
-                    results_df = run_pthreads(students_df, key_df['correct_answer'], scoring_rules)
-                else:
-                    logger.log("ERROR", "validation", f"Modo de ejecución no válido: {mode}", extra={"rule_id": "RF-02", "mode_attempted": mode})
-                    return {"status": "error", "message": "Modo de ejecución no válido."}
-
-            # Convertir resultados a formato JSON para la respuesta
-            results_json = results_df.to_dict(orient='records')
-            metrics = {
-                "total_students": len(results_df),
-                "average_score": results_df['score'].mean(),
-                "average_correct": results_df['correct'].mean(),
-                "average_wrong": results_df['wrong'].mean(),
-                "average_blank": results_df['blank'].mean(),
-            }
-            logger.log("INFO", "execution", "Evaluación completada exitosamente.", extra={"mode": mode, "metrics": metrics, "rule_ids": ["RF-05", "RF-08"]})
-            
-            # Ejecutar el benchmark completo en segundo plano
+            dataset = await run_in_threadpool(_resolve_dataset, app, dataset_id)
+        except KeyError as e:
+            logger.log("ERROR", "validation", e.args[0], extra={"rule_id": "RF-02", "dataset_id": dataset_id})
+            return {"status": "error", "message": e.args[0]}
+        if mode != "auto" and mode not in EVALUATION_MODES:
+            logger.log("ERROR", "validation", f"Modo de ejecución no válido: {mode}", extra={"rule_id": "RF-02", "mode_attempted": mode})
+            return {"status": "error", "message": "Modo de ejecución no válido."}
+
+        # La evaluación se encola y se consulta en /jobs/{job_id}: la petición responde de inmediato.
+        # El trabajo conserva los arreglos del dataset aunque el registro lo descargue o se reemplace mientras espera.
+        job_id = job_queue.submit("run", evaluation_job, dict(dataset), mode)
+        logger.log("INFO", "execution", "Evaluación encolada.", extra={"job_id": job_id, "dataset_id": dataset["dataset_id"], "mode": mode})
+        return {"status": "ok", "job_id": job_id, "dataset_id": dataset["dataset_id"], "status_url": f"/jobs/{job_id}"}
+
+    @app.get("/jobs/{job_id}")
+    async def job_status(job_id: str):
+        queue, job = _find_job(job_id)
+        if job is None:
+            return {"status": "error", "message": f"Trabajo no encontrado: {job_id}"}
+        if job["status"] == JOB_DONE:
+            job["result_url"] = f"/jobs/{job_id}/result"
+            if job["kind"] == "run":
+                job["results_url"] = f"/jobs/{job_id}/results"
+        return {"status": "ok", "job": job}
+
+    @app.get("/jobs/{job_id}/result")
+    async def job_result(job_id: str, include_results: bool = True):
+        queue, job = _find_job(job_id)
+        if job is None:
+            return {"status": "error", "message": f"Trabajo no encontrado: {job_id}"}
+        if job["status"] == JOB_FAILED:
+            return {"status": "error", "message": job["error"]}
+        result = queue.result(job_id)
+        if result is None:
+            return {"status": "error", "message": f"El trabajo aún no termina (estado: {job['status']})."}
+        if job["kind"] == "benchmark":
+            return {"status": "ok", **result}
+        response = {"status": "ok", "metrics": result["metrics"], "mode": result["mode"], "dataset_id": result["dataset_id"], "cached": result["cached"], "total_rows": len(result["results"]), "results_url": f"/jobs/{job_id}/results"}
+        if include_results:
+            # Cuerpo JSON completo: para cohortes grandes conviene /jobs/{job_id}/results (transmitido por lotes)
+            response["results"] = await run_in_threadpool(result["results"].to_dict, orient='records')
+        return response
+
+    @app.get("/jobs/{job_id}/results")
+    async def job_results_stream(job_id: str, format: str = "ndjson", offset: int = 0, limit: int = None):
+        queue, job = _find_job(job_id)
+        if job is None or job["kind"] != "run":
+            return JSONResponse({"status": "error", "message": f"Evaluación no encontrada: {job_id}"}, status_code=404)
+        result = queue.result(job_id)
+        if result is None:
+            message = job["error"] if job["status"] == JOB_FAILED else f"El trabajo aún no termina (estado: {job['status']})."
+            return JSONResponse({"status": "error", "message": message}, status_code=409)
+        if format not in RESULTS_STREAM_FORMATS:
+            return JSONResponse({"status": "error", "message": f"Formato no válido: {format} (use ndjson o csv)."}, status_code=400)
+        if offset < 0 or (limit is not None and limit < 0):
+            return JSONResponse({"status": "error", "message": "offset y limit deben ser no negativos."}, status_code=400)
+
+        # Rango de filas [offset, offset + limit); sin limit, hasta el final
+        results_df = result["results"]
+        end = len(results_df) if limit is None else min(offset + limit, len(results_df))
+        page_df = results_df.iloc[offset:end]
+        headers = {"X-Total-Count": str(len(results_df))}
+        if format == "csv":
+            headers["Content-Disposition"] = f"attachment; filename=results-{job_id}.csv"
+        logger.log("INFO", "results_stream", "Resultados transmitidos.", extra={"job_id": job_id, "format": format, "offset": offset, "rows": len(page_df)})
+        return StreamingResponse(_stream_results(page_df, format), media_type=RESULTS_STREAM_FORMATS[format], headers=headers)
+
+    @app.post("/rescore")
+    async def rescore_evaluation(
+        corrections: str = Form(...),
+        dataset_id: str = Form(None),
+    ):
+        try:
+            try:
+                dataset = await run_in_threadpool(_resolve_dataset, app, dataset_id)
+            except KeyError as e:
+                logger.log("ERROR", "validation", e.args[0], extra={"rule_id": "RF-02", "dataset_id": dataset_id})
+                return {"status": "error", "message": e.args[0]}
+            last_run = dataset["last_run"]
+            if last_run is None:
+                logger.log("ERROR", "validation", "No hay una evaluación previa de una versión sin pesos para recalificar.", extra={"rule_id": "RF-02"})
+                return {"status": "error", "message": "No hay una evaluación previa de una versión sin pesos para recalificar."}
+
+            # corrections: JSON {question_id: nueva respuesta}; null o "" anulan la pregunta
+            corrections = json.loads(corrections)
+            key_df = dataset["key_df"]
+            version_rows = key_df['version'] == key_df['version'].iloc[0]
+            key_series = _corrected_key(key_df.loc[version_rows], corrections)
+            new_key_np = encode_key(key_series, keep_annulled=True)
+            # Copia corregida: los trabajos de /run en curso siguen leyendo la clave anterior completa
+            new_key_df = key_df.copy()
+            new_key_df.loc[version_rows, 'correct_answer'] = key_series.to_numpy()
+
+            results_df = await run_in_threadpool(rescore, last_run["results"], dataset["arrays"]["answers"], last_run["key"], new_key_np, last_run["rule"])
+            changed_questions = int((last_run["key"] != new_key_np).sum())
+            # /ranking usa los resultados recalificados
+            dataset_registry.update(dataset["dataset_id"], key_df=new_key_df, last_run={"results": results_df, "key": new_key_np, "rule": last_run["rule"]}, last_results=results_df)
+
+            metrics = _results_metrics(results_df)
+            logger.log("INFO", "execution", "Recalificación incremental completada.", extra={"dataset_id": dataset["dataset_id"], "changed_questions": changed_questions, "corrections": corrections, "metrics": metrics, "rule_ids": ["RF-05", "RF-08"]})
+            return {"status": "ok", "results": results_df.to_dict(orient='records'), "metrics": metrics, "changed_questions": changed_questions}
+        except Exception as e:
+            logger.log("ERROR", "execution", f"Error durante la recalificación: {str(e)}", extra={"error_details": str(e), "rule_id": "RF-08"})
+            return {"status": "error", "message": str(e)}
+
+    @app.get("/ranking")
+    async def ranking(method: str = "competition", tiebreak: str = "correct", dataset_id: str = None):
+        try:
             try:
-                modes_to_run = ['serial', mode] if mode != 'serial' else ['serial']
-                run_full_benchmark(students_df, key_df['correct_answer'], scoring_rules, modes_to_run=modes_to_run)
-                logger.log("INFO", "benchmark", "Benchmark ejecutado y resultados actualizados.")
-            except Exception as e_benchmark:
-                logger.log("ERROR", "benchmark", f"Error al ejecutar el benchmark: {str(e_benchmark)}", extra={"error_details": str(e_benchmark)})
+                dataset = await run_in_threadpool(_resolve_dataset, app, dataset_id)
+            except KeyError as e:
+                logger.log("ERROR", "validation", e.args[0], extra={"rule_id": "RF-02", "dataset_id": dataset_id})
+                return {"status": "error", "message": e.args[0]}
+            results_df = dataset["last_results"]
+            if results_df is None:
+                logger.log("ERROR", "validation", "No hay resultados de evaluación para el ranking.", extra={"rule_id": "RF-02"})
+                return {"status": "error", "message": "No hay resultados de evaluación para el ranking."}
+            if method not in RANK_METHODS:
+                return {"status": "error", "message": f"Método de ranking no válido: {method}"}
+            tiebreak_col = tiebreak if tiebreak in results_df.columns else None
 
-            return {"status": "ok", "results": results_json, "metrics": metrics}
+            # Vacantes por carrera (clave 'vacancies' de scoring.json); sin ellas solo se devuelve el ranking
+            vacancies = load_scoring_config().get('vacancies') or {}
+            ranked_df = await run_in_threadpool(rank_results, results_df, 'score', tiebreak_col, method)
+            response = {"status": "ok", "ranking": ranked_df.to_dict(orient='records')}
+            if vacancies:
+                admitted_df, cutoffs_df = await run_in_threadpool(admission_cutoffs, results_df, vacancies, tiebreak_col)
+                response["admitted"] = admitted_df.to_dict(orient='records')
+                response["cutoffs"] = cutoffs_df.to_dict(orient='records')
+            logger.log("INFO", "ranking", "Ranking calculado.", extra={"dataset_id": dataset["dataset_id"], "method": method, "tiebreak": tiebreak_col, "careers": list(vacancies)})
+            return response
         except Exception as e:
-            logger.log("ERROR", "execution", f"Error durante la evaluación: {str(e)}", extra={"error_details": str(e), "rule_id": "RF-08"})
+            logger.log("ERROR", "ranking", f"Error al calcular el ranking: {str(e)}", extra={"error_details": str(e)})
+            return {"status": "error", "message": str(e)}
+
+    @app.get("/item-analysis")
+    async def item_analysis(version: str = None, group_fraction: float = 0.27, dataset_id: str = None):
+        try:
+            try:
+                dataset = await run_in_threadpool(_resolve_dataset, app, dataset_id)
+            except KeyError as e:
+                logger.log("ERROR", "validation", e.args[0], extra={"rule_id": "RF-02", "dataset_id": dataset_id})
+                return {"status": "error", "message": e.args[0]}
+
+            students_df = dataset["students_df"]
+            key_df = dataset["key_df"]
+            # Cada versión tiene su propia clave: el análisis se hace por versión (por defecto, la primera)
+            version = version or key_df['version'].iloc[0]
+            if version not in set(key_df['version']):
+                return {"status": "error", "message": f"Versión de clave desconocida: {version}"}
+            key_series = key_df.loc[key_df['version'] == version, 'correct_answer']
+            if key_df['version'].nunique() > 1:
+                students_df = students_df[students_df['version'] == version]
+            scoring_rules = load_scoring_config().get('scoring', DEFAULT_SCORING_RULES)
+
+            def analyze():
+                # Puntajes con el modo que elige el selector (NumPy si no hay módulo nativo)
+                run_fn = EVALUATION_MODES[choose_mode(len(students_df), len(key_series))]
+                scores = run_fn(students_df, key_series, scoring_rules)['score'].to_numpy()
+                return run_item_analysis(students_df, key_series, scores, group_fraction)
+
+            items_df = await run_in_threadpool(analyze)
+            logger.log("INFO", "item_analysis", "Análisis de ítems completado.", extra={"version": version, "num_students": len(students_df), "num_questions": len(items_df)})
+            return {"status": "ok", "version": version, "items": items_df.to_dict(orient='records')}
+        except Exception as e:
+            logger.log("ERROR", "item_analysis", f"Error durante el análisis de ítems: {str(e)}", extra={"error_details": str(e)})
             return {"status": "error", "message": str(e)}
 
     @app.get("/logs/list")
@@ -166,6 +628,34 @@ def setup_api_routes(app: FastAPI):
             logger.log("INFO", "log_download", f"Log descargado: {log_filepath}", extra={"date": date, "filename": filename})
             return FileResponse(log_filepath, media_type="application/jsonl", filename=filename)
 
+    @app.post("/benchmark/run")
+    async def run_benchmark(
+        modes: str = Form(None),
+        sample_rows: int = Form(None),
+        dataset_id: str = Form(None),
+    ):
+        # modes: lista separada por comas (p. ej. "serial,openmp_simd"); vacío mide todos los modos disponibles
+        mode_list = [mode.strip() for mode in modes.split(',') if mode.strip()] if modes else None
+        return await run_in_threadpool(submit_benchmark, app, mode_list, sample_rows, dataset_id)
+
+    @app.get("/results-cache")
+    async def results_cache_stats():
+        return {"status": "ok", **results_cache.stats()}
+
+    @app.get("/datasets")
+    async def list_datasets():
+        current = getattr(app.state, 'current_dataset', None)
+        return {"status": "ok", "current": current, "resident_bytes": dataset_registry.resident_bytes(), "datasets": dataset_registry.list()}
+
+    @app.delete("/datasets/{dataset_id}")
+    async def delete_dataset(dataset_id: str):
+        if not dataset_registry.remove(dataset_id):
+            return {"status": "error", "message": f"Dataset no encontrado: {dataset_id}"}
+        if getattr(app.state, 'current_dataset', None) == dataset_id:
+            app.state.current_dataset = None
+        logger.log("INFO", "datasets", "Dataset eliminado del registro.", extra={"dataset_id": dataset_id})
+        return {"status": "ok"}
+
     @app.get("/benchmark/data")
     async def get_benchmark_data():
         try:
@@ -0,0 +1,232 @@
+import os
+import math
+import time
+import threading
+import numpy as np
+import pandas as pd
+from frontend.native import load_native
+from frontend.encoding import ANSWER_COLS
+from frontend.jobs import benchmark_queue, JOB_QUEUED, JOB_RUNNING
+from frontend.evaluation_logic import run_serial, run_openmp, run_cuda, run_pthreads, run_packed, run_simd, run_openmp_simd, run_pthreads_simd, run_numpy
+
+BENCHMARK_HISTORY_PATH = "data/benchmark_history.csv"
+HISTORY_MAX_ROWS = 2000
+HISTORY_COLUMNS = ['mode', 'num_students', 'num_questions', 'time']
+# Estudiantes de la calibración (con las preguntas de ANSWER_COLS): un tamaño pequeño fija el costo fijo
+# y uno mediano el costo por celda
+CALIBRATION_STUDENTS = [1000, 50000]
+CALIBRATION_REPEATS = 3
+
+# Modos entre los que elige 'auto'; CUDA solo si hay un dispositivo disponible y los nativos solo si pyevalcore lo está
+AUTO_MODES = {
+    "numpy": run_numpy,
+    "serial": run_serial,
+    "openmp": run_openmp,
+    "pthreads": run_pthreads,
+    "packed": run_packed,
+    "simd": run_simd,
+    "openmp_simd": run_openmp_simd,
+    "pthreads_simd": run_pthreads_simd,
+    "cuda": run_cuda,
+}
+
+_cost_model = None
+_cost_model_lock = threading.Lock()
+# Trabajo de calibración en benchmark_queue (None si no se lanzó ninguno)
+_calibration_job = None
+_calibration_lock = threading.Lock()
+
+def _cuda_available(native) -> bool:
+    try:
+        return native.get_device_count() > 0
+    except Exception:
+        return False
+
+def candidate_modes() -> list:
+    """Modos que 'auto' puede elegir en esta máquina."""
+    native = load_native()
+    if native is None:
+        return ["numpy"]
+    return [mode for mode in AUTO_MODES if mode != 'cuda' or _cuda_available(native)]
+
+def load_benchmark_history() -> pd.DataFrame:
+    """
+    Lee el historial de tiempos (data/benchmark_history.csv) que alimentan los benchmarks y la calibración.
+
+    Returns:
+        pd.DataFrame: Columnas 'mode', 'num_students', 'num_questions' y 'time' (vacío si no existe).
+    """
+    try:
+        return pd.read_csv(BENCHMARK_HISTORY_PATH)[HISTORY_COLUMNS]
+    except (FileNotFoundError, KeyError, pd.errors.EmptyDataError):
+        return pd.DataFrame(columns=HISTORY_COLUMNS)
+
+def _save_history(history: pd.DataFrame):
+    os.makedirs(os.path.dirname(BENCHMARK_HISTORY_PATH), exist_ok=True)
+    history.tail(HISTORY_MAX_ROWS).to_csv(BENCHMARK_HISTORY_PATH, index=False)
+
+def append_benchmark_history(observations: pd.DataFrame):
+    """
+    Agrega observaciones al historial (conservando las HISTORY_MAX_ROWS más recientes) e invalida el modelo de costo.
+
+    Args:
+        observations (pd.DataFrame): Filas con 'mode', 'num_students', 'num_questions' y 'time'.
+    """
+    _save_history(pd.concat([load_benchmark_history(), observations[HISTORY_COLUMNS]], ignore_index=True))
+    invalidate_cost_model()
+
+def calibrate(modes: list, student_counts: list = None) -> pd.DataFrame:
+    """
+    Mide cada modo con datos sintéticos (mejor de CALIBRATION_REPEATS ejecuciones, tras una ejecución de
+    calentamiento que absorbe la inicialización del modo, p. ej. el contexto CUDA).
+
+    Args:
+        modes (list): Modos de AUTO_MODES a medir.
+        student_counts (list, optional): Tamaños a medir. Por defecto CALIBRATION_STUDENTS.
+
+    Returns:
+        pd.DataFrame: Observaciones con 'mode', 'num_students', 'num_questions' y 'time'.
+    """
+    rng = np.random.default_rng(0)
+    rule = {"correct": 1.0, "wrong": 0.0, "blank": 0.0}
+    num_questions = len(ANSWER_COLS)
+    observations = []
+    for num_students in student_counts or CALIBRATION_STUDENTS:
+        students_df = pd.DataFrame(rng.integers(-1, 4, size=(num_students, num_questions), dtype=np.int8), columns=ANSWER_COLS)
+        key_series = pd.Series(rng.integers(0, 4, size=num_questions, dtype=np.int8), index=range(1, num_questions + 1))
+        for mode in modes:
+            run_fn = AUTO_MODES[mode]
+            run_fn(students_df, key_series, rule)
+            best = math.inf
+            for _ in range(CALIBRATION_REPEATS):
+                start_time = time.perf_counter()
+                run_fn(students_df, key_series, rule)
+                best = min(best, time.perf_counter() - start_time)
+            observations.append({"mode": mode, "num_students": num_students, "num_questions": num_questions, "time": best})
+    return pd.DataFrame(observations, columns=HISTORY_COLUMNS)
+
+def fit_cost_model(observations: pd.DataFrame) -> dict:
+    """
+    Ajusta por modo el modelo tiempo = costo_fijo + costo_por_celda * estudiantes * preguntas (mínimos cuadrados).
+
+    Args:
+        observations (pd.DataFrame): Observaciones con 'mode', 'num_students', 'num_questions' y 'time'.
+
+    Returns:
+        dict: modo -> (costo_fijo en segundos, costo_por_celda en segundos). Solo incluye modos con
+              observaciones de al menos dos tamaños distintos.
+    """
+    model = {}
+    for mode, group in observations.groupby('mode'):
+        cells = (group['num_students'] * group['num_questions']).to_numpy(dtype=np.float64)
+        times = group['time'].to_numpy(dtype=np.float64)
+        if len(np.unique(cells)) < 2:
+            continue
+        per_cell, overhead = np.polyfit(cells, times, 1)
+        # Un ajuste con ruido puede dar coeficientes negativos; ninguno de los dos costos puede serlo
+        per_cell = max(per_cell, 0.0)
+        overhead = max(float(np.median(times - per_cell * cells)), 0.0)
+        model[mode] = (overhead, float(per_cell))
+    return model
+
+def predict_time(coefficients: tuple, num_students: int, num_questions: int, chunk_size: int = 0) -> float:
+    """
+    Tiempo estimado de un modo; con chunk_size > 0 el costo fijo se paga una vez por bloque.
+
+    Args:
+        coefficients (tuple): (costo_fijo, costo_por_celda) de fit_cost_model.
+        num_students (int): Número de estudiantes.
+        num_questions (int): Número de preguntas.
+        chunk_size (int): Tamaño de bloque de /run (0 = sin bloques).
+
+    Returns:
+        float: Segundos estimados.
+    """
+    overhead, per_cell = coefficients
+    num_chunks = math.ceil(num_students / chunk_size) if chunk_size > 0 else 1
+    return max(num_chunks, 1) * overhead + per_cell * num_students * num_questions
+
+def invalidate_cost_model():
+    """Descarta el modelo en memoria; se reajusta en el próximo uso de 'auto'."""
+    global _cost_model
+    with _cost_model_lock:
+        _cost_model = None
+
+def _missing_modes(model: dict) -> list:
+    return [mode for mode in candidate_modes() if mode not in model]
+
+def calibrate_missing(progress=None) -> dict:
+    """
+    Calibra (y guarda en el historial) los modos candidatos que aún no tienen observaciones de dos tamaños
+    distintos. Se ejecuta en benchmark_queue, nunca dentro de una evaluación.
+
+    Args:
+        progress (callable, optional): callback(completed, total, stage) de la cola de trabajos.
+
+    Returns:
+        dict: {'calibrated': lista de modos medidos}.
+    """
+    missing = _missing_modes(fit_cost_model(load_benchmark_history()))
+    if missing:
+        if progress:
+            progress(0, len(missing), stage="calibration")
+        append_benchmark_history(calibrate(missing))
+        if progress:
+            progress(len(missing), len(missing), stage="calibration")
+    return {"calibrated": missing}
+
+def schedule_calibration():
+    """
+    Encola calibrate_missing en benchmark_queue si hay modos sin modelo y no hay otra calibración pendiente.
+
+    Returns:
+        str | None: Identificador del trabajo de calibración pendiente, o None si no hace falta.
+    """
+    global _calibration_job
+    with _calibration_lock:
+        if _calibration_job is not None:
+            job = benchmark_queue.get(_calibration_job)
+            if job is not None and job["status"] in (JOB_QUEUED, JOB_RUNNING):
+                return _calibration_job
+        if not _missing_modes(fit_cost_model(load_benchmark_history())):
+            return None
+        _calibration_job = benchmark_queue.submit("calibration", calibrate_missing)
+        return _calibration_job
+
+def get_cost_model() -> dict:
+    """
+    Devuelve el modelo de costo ajustado con el historial persistido. Si algún modo candidato aún no tiene
+    observaciones de dos tamaños distintos, encola su calibración en segundo plano (schedule_calibration)
+    y el modelo queda sin ese modo hasta que termine.
+
+    Returns:
+        dict: modo -> (costo_fijo, costo_por_celda).
+    """
+    global _cost_model
+    with _cost_model_lock:
+        if _cost_model is None:
+            model = fit_cost_model(load_benchmark_history())
+            _cost_model = {mode: model[mode] for mode in candidate_modes() if mode in model}
+        model = _cost_model
+    if _missing_modes(model):
+        schedule_calibration()
+    return model
+
+def choose_mode(num_students: int, num_questions: int, chunk_size: int = 0, candidates: list = None) -> str:
+    """
+    Elige el modo con menor tiempo estimado para el tamaño de la evaluación.
+
+    Args:
+        num_students (int): Número de estudiantes.
+        num_questions (int): Número de preguntas.
+        chunk_size (int): Tamaño de bloque de /run (0 = sin bloques).
+        candidates (list, optional): Restringe la elección a estos modos.
+
+    Returns:
+        str: Nombre del modo ('openmp', o 'numpy' sin módulo nativo, si ningún candidato tiene modelo todavía).
+    """
+    model = get_cost_model()
+    allowed = [mode for mode in (candidates or model) if mode in model]
+    if not allowed:
+        return "openmp" if load_native() is not None else "numpy"
+    return min(allowed, key=lambda mode: predict_time(model[mode], num_students, num_questions, chunk_size))
@@ -1,10 +1,54 @@
 import time
 import pandas as pd
-import pyevalcore
 import numpy as np
 import os
+import threading
 import plotly.express as px
-from frontend.evaluation_logic import run_serial, run_openmp, run_cuda, run_pthreads
+from frontend.backend_selection import append_benchmark_history, candidate_modes
+from frontend.evaluation_logic import run_serial, run_openmp, run_cuda, run_pthreads, run_packed, run_simd, run_openmp_simd, run_pthreads_simd, run_numpy
+
+# Estudiantes muestreados por benchmark (0 = todo el dataset): el speed-up se mide bien con una muestra
+BENCHMARK_SAMPLE_ROWS = 20000
+# Segundos mínimos entre dos benchmarks (/benchmark/run y el programador periódico)
+BENCHMARK_MIN_INTERVAL_S = 300
+
+_last_benchmark_time = None
+_benchmark_lock = threading.Lock()
+
+def sample_students(students_df: pd.DataFrame, sample_rows: int = BENCHMARK_SAMPLE_ROWS, seed: int = 0) -> pd.DataFrame:
+    """
+    Muestra aleatoria (reproducible y en el orden original) de sample_rows estudiantes para el benchmark.
+
+    Args:
+        students_df (pd.DataFrame): DataFrame con las respuestas de los estudiantes.
+        sample_rows (int): Tamaño de la muestra; 0 o más filas que el dataset devuelve todo.
+        seed (int): Semilla de la muestra.
+
+    Returns:
+        pd.DataFrame: Subconjunto de students_df.
+    """
+    if sample_rows <= 0 or sample_rows >= len(students_df):
+        return students_df
+    rows = np.sort(np.random.default_rng(seed).choice(len(students_df), size=sample_rows, replace=False))
+    return students_df.iloc[rows]
+
+def reserve_benchmark_slot(min_interval_s: float = BENCHMARK_MIN_INTERVAL_S) -> float:
+    """
+    Limita la frecuencia de los benchmarks: reserva el turno si pasaron min_interval_s desde el anterior.
+
+    Args:
+        min_interval_s (float): Segundos mínimos entre benchmarks.
+
+    Returns:
+        float: 0 si se reservó el turno; si no, los segundos que faltan para el siguiente.
+    """
+    global _last_benchmark_time
+    with _benchmark_lock:
+        now = time.monotonic()
+        if _last_benchmark_time is not None and now - _last_benchmark_time < min_interval_s:
+            return min_interval_s - (now - _last_benchmark_time)
+        _last_benchmark_time = now
+        return 0.0
 
 def generate_benchmark_plot():
     try:
@@ -24,7 +68,7 @@ def generate_benchmark_plot():
     fig.write_html("output/benchmark_plot.html")
     print(f"Gráfico de speed-up guardado en output/benchmark_plot.html")
 
-def run_full_benchmark(students_df: pd.DataFrame, key_series: pd.Series, scoring_rules: dict, modes_to_run: list = None):
+def run_full_benchmark(students_df: pd.DataFrame, key_series: pd.Series, scoring_rules: dict, modes_to_run: list = None, progress=None):
     """
     Ejecuta un benchmark de los modos de evaluación especificados con los datos proporcionados,
     calcula el speed-up y guarda los resultados en data/benchmark_summary.csv.
@@ -34,10 +78,11 @@ def run_full_benchmark(students_df: pd.DataFrame, key_series: pd.Series, scoring
         key_series (pd.Series): Serie con la clave de respuestas.
         scoring_rules (dict): Diccionario con las reglas de puntuación.
         modes_to_run (list, optional): Lista de modos a ejecutar. Si es None, se ejecutan todos.
+        progress (callable, optional): progress(modos medidos, total) tras cada modo.
     """
     all_results = []
     if modes_to_run is None:
-        modes = ["serial", "openmp", "cuda", "pthreads"]
+        modes = ["serial", "openmp", "cuda", "pthreads", "packed", "simd", "openmp_simd", "pthreads_simd", "numpy"]
     else:
         modes = modes_to_run
 
@@ -51,18 +96,33 @@ def run_full_benchmark(students_df: pd.DataFrame, key_series: pd.Series, scoring
             _ = run_cuda(students_df, key_series, scoring_rules)
         elif mode == "pthreads":
             _ = run_pthreads(students_df, key_series, scoring_rules)
+        elif mode == "packed":
+            _ = run_packed(students_df, key_series, scoring_rules)
+        elif mode == "simd":
+            _ = run_simd(students_df, key_series, scoring_rules)
+        elif mode == "openmp_simd":
+            _ = run_openmp_simd(students_df, key_series, scoring_rules)
+        elif mode == "pthreads_simd":
+            _ = run_pthreads_simd(students_df, key_series, scoring_rules)
+        elif mode == "numpy":
+            _ = run_numpy(students_df, key_series, scoring_rules)
         # No hay else, ya que los modos están fijos
         end_time = time.perf_counter()
         all_results.append({"mode": mode, "time": end_time - start_time})
+        if progress is not None:
+            progress(len(all_results), len(modes))
 
     df = pd.DataFrame(all_results)
+    # Cada medición alimenta el modelo de costo del modo 'auto'
+    append_benchmark_history(df.assign(num_students=len(students_df), num_questions=len(key_series)))
     
-    # Calcular speed-up
-    if 'serial' in df['mode'].values:
-        serial_time = df[df['mode'] == 'serial']['time'].iloc[0]
-        df['speed_up'] = serial_time / df['time']
+    # Calcular speed-up (respecto de serial, o de NumPy si serial no se ejecutó)
+    baseline_mode = 'serial' if 'serial' in df['mode'].values else 'numpy'
+    if baseline_mode in df['mode'].values:
+        baseline_time = df[df['mode'] == baseline_mode]['time'].iloc[0]
+        df['speed_up'] = baseline_time / df['time']
     else:
-        df['speed_up'] = 1.0 # Default a 1 si serial no está presente
+        df['speed_up'] = 1.0 # Default a 1 si no hay modo de referencia
 
     # Guardar resultados promediados y speed-up en un nuevo archivo
     os.makedirs('data', exist_ok=True)
@@ -71,3 +131,27 @@ def run_full_benchmark(students_df: pd.DataFrame, key_series: pd.Series, scoring
 
     # Generar el gráfico después de actualizar los datos
     generate_benchmark_plot()
+
+def run_sampled_benchmark(students_df: pd.DataFrame, key_series: pd.Series, scoring_rules: dict, modes_to_run: list = None, sample_rows: int = BENCHMARK_SAMPLE_ROWS, progress=None) -> dict:
+    """
+    Benchmark sobre una muestra de estudiantes, para ejecutarse fuera del camino de /run (ver /benchmark/run).
+
+    Args:
+        students_df (pd.DataFrame): DataFrame con las respuestas de los estudiantes.
+        key_series (pd.Series): Serie con la clave de respuestas.
+        scoring_rules (dict): Diccionario con las reglas de puntuación.
+        modes_to_run (list, optional): Modos a medir. Por defecto los disponibles en esta máquina (candidate_modes).
+        sample_rows (int): Tamaño de la muestra (0 = todo el dataset).
+        progress (callable, optional): progress(modos medidos, total) tras cada modo.
+
+    Returns:
+        dict: 'num_students' medidos, 'modes' y 'summary' (filas de data/benchmark_summary.csv).
+    """
+    sample_df = sample_students(students_df, sample_rows)
+    modes = modes_to_run or candidate_modes()
+    run_full_benchmark(sample_df, key_series, scoring_rules, modes_to_run=modes, progress=progress)
+    return {
+        "num_students": len(sample_df),
+        "modes": modes,
+        "summary": pd.read_csv("data/benchmark_summary.csv").to_dict(orient='records'),
+    }
@@ -4,10 +4,13 @@ from starlette.staticfiles import StaticFiles # Importar StaticFiles
 from dash import Dash
 import dash_bootstrap_components as dbc
 from frontend.utils.logger import Logger
-from frontend.api_routes import setup_api_routes
+from frontend.api_routes import setup_api_routes, benchmark_scheduler
 from frontend.dash_layout import dash_layout
 from frontend.dash_callbacks import setup_dash_callbacks
 from frontend.config_utils import load_scoring_config # Importar para inicializar scoring_config
+from frontend.backend_selection import schedule_calibration
+from frontend.evaluation_logic import configure_pthreads_pool
+import threading
 
 # Inicialización de FastAPI y Dash
 app = FastAPI()
@@ -33,4 +36,18 @@ setup_dash_callbacks(dash_app)
 # Cargar configuración inicial desde scoring.json (para asegurar que scoring_config esté disponible globalmente si es necesario)
 scoring_config = load_scoring_config()
 
+# Pool persistente del modo pthreads: se dimensiona una vez al iniciar (pyevalcore lo cierra con atexit)
+configure_pthreads_pool(scoring_config)
+
+# Calibrar el modelo de costo del modo 'auto' en benchmark_queue (solo los modos sin historial de benchmark).
+# Opcional ('auto_calibrate' en scoring.json): importar la aplicación no debe lanzar benchmarks; sin él,
+# la calibración se encola en el primer uso de 'auto', que mientras tanto usa el modo por defecto
+if scoring_config.get('auto_calibrate', False):
+    schedule_calibration()
+
+# Benchmark periódico sobre una muestra del dataset cargado (desactivado por defecto)
+benchmark_schedule_minutes = float(scoring_config.get('benchmark_schedule_minutes', 0))
+if benchmark_schedule_minutes > 0:
+    threading.Thread(target=benchmark_scheduler, args=(app, benchmark_schedule_minutes * 60), name="benchmark-scheduler", daemon=True).start()
+
 # Nota: la detección de CUDA ahora se realiza dentro de dash_layout.py
\ No newline at end of file
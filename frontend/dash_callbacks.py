@@ -51,14 +51,12 @@ def setup_dash_callbacks(dash_app):
         return html.Div("Cargue ambos archivos para continuar.")
 
     @dash_app.callback(
-        Output('results-table', 'data'),
-        Output('metrics-output', 'children'),
-        Output('score-histogram', 'figure'),
-        Output('output-run-status', 'children'),
+        Output('run-job-store', 'data'),
         Input('run-button', 'n_clicks'),
         State('mode-selector', 'value'),
     )
     def run_evaluation_callback(n_clicks, mode):
+        # /run encola la evaluación y responde con el identificador del trabajo; poll_run_job sigue su avance
         if n_clicks > 0:
             try:
                 data = {
@@ -66,59 +64,109 @@ def setup_dash_callbacks(dash_app):
                 }
                 response = requests.post("http://127.0.0.1:8000/run", data=data)
                 response_data = response.json()
-
                 if response_data.get("status") == "ok":
-                    results = response_data.get("results", [])
-                    metrics = response_data.get("metrics", {})
-
-                    metrics_display = html.Div([
-                        html.P(f"Total de Estudiantes: {metrics.get('total_students')}"),
-                        html.P(f"Puntuación Promedio: {metrics.get('average_score'):.2f}"),
-                        html.P(f"Respuestas Correctas Promedio: {metrics.get('average_correct'):.2f}"),
-                        html.P(f"Respuestas Incorrectas Promedio: {metrics.get('average_wrong'):.2f}"),
-                        html.P(f"Respuestas en Blanco Promedio: {metrics.get('average_blank'):.2f}"),
-                    ])
-
-                    # Convertir resultados a DataFrame para manipulación
-                    df_results = pd.DataFrame(results)
-
-                    # Añadir columna 'ID' como índice + 1
-                    df_results.insert(0, 'ID', range(1, 1 + len(df_results)))
-
-                    # Renombrar 'student_id' a 'DNI'
-                    df_results.rename(columns={'student_id': 'DNI'}, inplace=True)
-
-                    # Reordenar columnas para que DNI esté después de ID
-                    # Asegurarse de que todas las columnas esperadas estén presentes antes de reordenar
-                    # Lista de columnas esperadas en el orden deseado
-                    ordered_columns = ['ID', 'DNI', 'score', 'correct', 'wrong', 'blank']
-                    # Filtrar las columnas que realmente existen en el DataFrame
-                    existing_ordered_columns = [col for col in ordered_columns if col in df_results.columns]
-                    df_results = df_results[existing_ordered_columns]
-
-                    metrics_display = html.Div([
-                        html.P(f"Total de Estudiantes: {metrics.get('total_students')}"),
-                        html.P(f"Puntuación Promedio: {metrics.get('average_score'):.2f}"),
-                        html.P(f"Respuestas Correctas Promedio: {metrics.get('average_correct'):.2f}"),
-                        html.P(f"Respuestas Incorrectas Promedio: {metrics.get('average_wrong'):.2f}"),
-                        html.P(f"Respuestas en Blanco Promedio: {metrics.get('average_blank'):.2f}"),
-                    ])
-
-                    scores = df_results['score'].tolist() # Usar la columna 'score' del DataFrame
-                    if scores:
-                        fig = px.histogram(x=scores, nbins=20, title="Distribución de Puntuaciones")
-                    else:
-                        fig = {} # Empty figure if no data
-
-                    # Convertir el DataFrame de nuevo a formato de lista de diccionarios para Dash DataTable
-                    return df_results.to_dict(orient='records'), metrics_display, fig, html.Div("Evaluación completada exitosamente.")
-                else:
-                    return [], html.Div(), {}, html.Div(f"Error en la evaluación: {response_data.get('message', 'Error desconocido')}", style={'color': 'red'})
+                    return {'job_id': response_data.get('job_id'), 'mode': mode}
+                return {'error': f"Error en la evaluación: {response_data.get('message', 'Error desconocido')}"}
             except Exception as e:
-                return [], html.Div(), {}, html.Div(f"Error en el procesamiento de evaluación: {str(e)}", style={'color': 'red'})
-        return [], html.Div(), {}, html.Div("Presione 'Iniciar Evaluación' para ver los resultados.")
+                return {'error': f"Error en el procesamiento de evaluación: {str(e)}"}
+        return None
+
+    @dash_app.callback(
+        Output('results-table', 'data'),
+        Output('metrics-output', 'children'),
+        Output('score-histogram', 'figure'),
+        Output('output-run-status', 'children'),
+        Output('run-job-interval', 'disabled'),
+        Input('run-job-store', 'data'),
+        Input('run-job-interval', 'n_intervals'),
+    )
+    def poll_run_job(job, n_intervals):
+        if not job:
+            return [], html.Div(), {}, html.Div("Presione 'Iniciar Evaluación' para ver los resultados."), True
+        if job.get('error'):
+            return [], html.Div(), {}, html.Div(job['error'], style={'color': 'red'}), True
+        try:
+            response_data = requests.get(f"http://127.0.0.1:8000/jobs/{job['job_id']}").json()
+            if response_data.get("status") != "ok":
+                return [], html.Div(), {}, html.Div(f"Error en la evaluación: {response_data.get('message', 'Error desconocido')}", style={'color': 'red'}), True
+            job_status = response_data["job"]
+            if job_status["status"] == "failed":
+                return [], html.Div(), {}, html.Div(f"Error en la evaluación: {job_status.get('error') or 'Error desconocido'}", style={'color': 'red'}), True
+            if job_status["status"] != "done":
+                # En cola o en ejecución: solo se actualiza el estado y se sigue consultando
+                progress = job_status.get("progress") or {}
+                if job_status["status"] == "queued":
+                    message = "Evaluación en cola..."
+                elif progress.get("total"):
+                    message = f"Evaluación en ejecución: {progress['completed']} de {progress['total']} estudiantes..."
+                else:
+                    message = "Evaluación en ejecución..."
+                return dash.no_update, dash.no_update, dash.no_update, html.Div(message), False
+
+            response_data = requests.get(f"http://127.0.0.1:8000{job_status['result_url']}", params={'include_results': 'false'}).json()
+            if response_data.get("status") == "ok":
+                metrics = response_data.get("metrics", {})
+
+                # Resultados transmitidos como CSV por lotes (evita el cuerpo JSON completo)
+                results_csv = requests.get(f"http://127.0.0.1:8000{response_data['results_url']}", params={'format': 'csv'}).text
+                df_results = pd.read_csv(io.StringIO(results_csv), dtype={'student_id': str})
+
+                # Añadir columna 'ID' como índice + 1
+                df_results.insert(0, 'ID', range(1, 1 + len(df_results)))
+
+                # Renombrar 'student_id' a 'DNI'
+                df_results.rename(columns={'student_id': 'DNI'}, inplace=True)
+
+                # Reordenar columnas para que DNI esté después de ID
+                # Asegurarse de que todas las columnas esperadas estén presentes antes de reordenar
+                # Lista de columnas esperadas en el orden deseado
+                ordered_columns = ['ID', 'DNI', 'score', 'correct', 'wrong', 'blank']
+                # Filtrar las columnas que realmente existen en el DataFrame
+                existing_ordered_columns = [col for col in ordered_columns if col in df_results.columns]
+                df_results = df_results[existing_ordered_columns]
+
+                metrics_display = html.Div([
+                    html.P(f"Total de Estudiantes: {metrics.get('total_students')}"),
+                    html.P(f"Puntuación Promedio: {metrics.get('average_score'):.2f}"),
+                    html.P(f"Respuestas Correctas Promedio: {metrics.get('average_correct'):.2f}"),
+                    html.P(f"Respuestas Incorrectas Promedio: {metrics.get('average_wrong'):.2f}"),
+                    html.P(f"Respuestas en Blanco Promedio: {metrics.get('average_blank'):.2f}"),
+                ])
+
+                scores = df_results['score'].tolist() # Usar la columna 'score' del DataFrame
+                if scores:
+                    fig = px.histogram(x=scores, nbins=20, title="Distribución de Puntuaciones")
+                else:
+                    fig = {} # Empty figure if no data
+
+                # Convertir el DataFrame de nuevo a formato de lista de diccionarios para Dash DataTable
+                return df_results.to_dict(orient='records'), metrics_display, fig, html.Div(f"Evaluación completada exitosamente (modo: {response_data.get('mode', job.get('mode'))})."), True
+            else:
+                return [], html.Div(), {}, html.Div(f"Error en la evaluación: {response_data.get('message', 'Error desconocido')}", style={'color': 'red'}), True
+        except Exception as e:
+            return [], html.Div(), {}, html.Div(f"Error en el procesamiento de evaluación: {str(e)}", style={'color': 'red'}), True
 
 
+    @dash_app.callback(
+        Output('item-analysis-table', 'data'),
+        Output('item-analysis-status', 'children'),
+        Input('item-analysis-button', 'n_clicks'),
+    )
+    def item_analysis_callback(n_clicks):
+        if n_clicks > 0:
+            try:
+                response = requests.get("http://127.0.0.1:8000/item-analysis")
+                response_data = response.json()
+                if response_data.get("status") == "ok":
+                    df_items = pd.DataFrame(response_data.get("items", []))
+                    if not df_items.empty:
+                        df_items[['difficulty', 'discrimination']] = df_items[['difficulty', 'discrimination']].round(3)
+                    return df_items.to_dict(orient='records'), html.Div(f"Análisis de ítems de la versión {response_data.get('version')}.")
+                return [], html.Div(f"Error en el análisis de ítems: {response_data.get('message', 'Error desconocido')}", style={'color': 'red'})
+            except Exception as e:
+                return [], html.Div(f"Error en el procesamiento del análisis de ítems: {str(e)}", style={'color': 'red'})
+        return [], html.Div()
+
     @dash_app.callback(
         Output("download-dataframe-csv", "data"),
         Input("download-results-button", "n_clicks"),
@@ -267,7 +315,9 @@ def setup_dash_callbacks(dash_app):
     )
     def save_config(n_clicks, chunk_size, correct, wrong, blank):
         if n_clicks > 0:
+            # Conservar las demás claves del archivo (secciones, carreras, caché, ...)
             updated_config = {
+                **load_scoring_config(),
                 "chunk_size": chunk_size,
                 "scoring": {
                     "correct": correct,
@@ -367,6 +417,25 @@ def setup_dash_callbacks(dash_app):
                 return []
         return dash.no_update
 
+    @dash_app.callback(
+        Output('benchmark-run-status', 'children'),
+        Input('run-benchmark-button', 'n_clicks'),
+    )
+    def run_benchmark_callback(n_clicks):
+        # El benchmark corre en segundo plano sobre una muestra; la tabla y el gráfico se actualizan al volver a la pestaña
+        if n_clicks:
+            try:
+                response_data = requests.post("http://127.0.0.1:8000/benchmark/run").json()
+                if response_data.get("status") == "ok":
+                    return html.Div("Benchmark en ejecución en segundo plano; vuelva a abrir la pestaña para ver los resultados.")
+                message = response_data.get('message', 'Error desconocido')
+                if response_data.get("retry_after") is not None:
+                    message = f"{message} Intente de nuevo en {response_data['retry_after']:.0f} s."
+                return html.Div(message, style={'color': 'red'})
+            except Exception as e:
+                return html.Div(f"Error al iniciar el benchmark: {str(e)}", style={'color': 'red'})
+        return dash.no_update
+
     @dash_app.callback(
         Output('benchmark-plot-iframe', 'src'),
         Input('nav-benchmarking', 'n_clicks')
@@ -1,6 +1,6 @@
 from dash import html, dcc, Output, Input, State, dash_table
 import dash_bootstrap_components as dbc
-import pyevalcore
+from frontend.native import load_native
 
 # Cargar configuración inicial
 try:
@@ -16,8 +16,10 @@ except ImportError:
       }
     }
 
+# Sin la extensión nativa solo quedan disponibles los modos NumPy y automático
+native_available = load_native() is not None
 try:
-    cuda_available = (pyevalcore.get_device_count() > 0)
+    cuda_available = native_available and (load_native().get_device_count() > 0)
 except Exception:
     cuda_available = False
 
@@ -148,7 +150,7 @@ def content_evaluacion():
                                     html.Div("📤", className="fs-1 text-primary mb-3"),
                                     html.H5("Arrastra tu archivo aquí", className="text-primary fw-bold mb-2"),
                                     html.P("o haz clic para seleccionar", className="text-muted mb-3"),
-                                    html.Small("Formatos soportados: .xlsx", className="text-muted")
+                                    html.Small("Formatos soportados: .xlsx, .csv, .parquet, .arrow, .txt (lectora óptica)", className="text-muted")
                                 ], className="text-center py-5"),
                                 style={
                                     'borderRadius': '15px',
@@ -182,7 +184,7 @@ def content_evaluacion():
                                     html.Div("📤", className="fs-1 text-success mb-3"),
                                     html.H5("Arrastra tu archivo aquí", className="text-success fw-bold mb-2"),
                                     html.P("o haz clic para seleccionar", className="text-muted mb-3"),
-                                    html.Small("Formatos soportados: .xlsx", className="text-muted")
+                                    html.Small("Formatos soportados: .xlsx, .csv, .parquet, .arrow", className="text-muted")
                                 ], className="text-center py-5"),
                                 style={
                                     'borderRadius': '15px',
@@ -216,12 +218,18 @@ def content_evaluacion():
                                 dcc.RadioItems(
                                     id='mode-selector',
                                     options=[
-                                        {'label': html.Div(['⚡ Serial'], className="mode-option"), 'value': 'serial'},
-                                        {'label': html.Div(['🔥 OpenMP'], className="mode-option"), 'value': 'openmp'},
-                                        {'label': html.Div(['🧵 Pthreads'], className="mode-option"), 'value': 'pthreads'},
+                                        {'label': html.Div(['🤖 Automático (el más rápido estimado)'], className="mode-option"), 'value': 'auto'},
+                                        {'label': html.Div(['⚡ Serial'], className="mode-option"), 'value': 'serial', 'disabled': not native_available},
+                                        {'label': html.Div(['🔥 OpenMP'], className="mode-option"), 'value': 'openmp', 'disabled': not native_available},
+                                        {'label': html.Div(['🧵 Pthreads'], className="mode-option"), 'value': 'pthreads', 'disabled': not native_available},
+                                        {'label': html.Div(['🧮 Empaquetado (bits)'], className="mode-option"), 'value': 'packed', 'disabled': not native_available},
+                                        {'label': html.Div(['📐 SIMD'], className="mode-option"), 'value': 'simd', 'disabled': not native_available},
+                                        {'label': html.Div(['🔥 OpenMP + SIMD'], className="mode-option"), 'value': 'openmp_simd', 'disabled': not native_available},
+                                        {'label': html.Div(['🧵 Pthreads + SIMD'], className="mode-option"), 'value': 'pthreads_simd', 'disabled': not native_available},
+                                        {'label': html.Div(['🐍 NumPy (portable)'], className="mode-option"), 'value': 'numpy'},
                                         {'label': html.Div(['🚀 CUDA'], className="mode-option text-muted" if not cuda_available else "mode-option"), 'value': 'cuda', 'disabled': not cuda_available}
                                     ],
-                                    value='serial',
+                                    value='auto',
                                     className="mode-selector-modern",
                                     labelStyle={'display': 'block', 'margin': '10px 0'}
                                 )
@@ -278,6 +286,9 @@ def content_evaluacion():
                         ], className="d-flex"),
                         
                         html.Div(id='output-run-status', className="mt-4"),
+                        # Trabajo de /run en curso: el intervalo consulta /jobs/{job_id} hasta que termine
+                        dcc.Store(id='run-job-store'),
+                        dcc.Interval(id='run-job-interval', interval=1000, disabled=True),
                         dcc.Store(id='scoring-config-store', data=scoring_config),
                     ])
                 ], className="modern-card p-4")
@@ -351,6 +362,54 @@ def content_evaluacion():
                     # Gráfico
                     html.Div([
                         dcc.Graph(id='score-histogram', className="rounded-3")
+                    ], className="bg-white p-3 rounded-3 shadow-sm mb-4"),
+
+                    # Análisis de ítems (frecuencias por opción, dificultad y discriminación)
+                    html.Div([
+                        html.Div([
+                            html.H5("Análisis de Ítems", className="mb-0 fw-bold me-3"),
+                            dbc.Button([
+                                html.Span("🔎", className="me-2"),
+                                "Calcular"
+                            ], id="item-analysis-button", n_clicks=0, className="btn-modern-primary"),
+                        ], className="d-flex align-items-center mb-3"),
+                        html.Div(id='item-analysis-status', className="mb-3"),
+                        dash_table.DataTable(
+                            id='item-analysis-table',
+                            columns=[
+                                {"name": "Pregunta", "id": "question_id"},
+                                {"name": "A", "id": "count_A"},
+                                {"name": "B", "id": "count_B"},
+                                {"name": "C", "id": "count_C"},
+                                {"name": "D", "id": "count_D"},
+                                {"name": "Blanco", "id": "count_blank"},
+                                {"name": "Dificultad", "id": "difficulty"},
+                                {"name": "Discriminación", "id": "discrimination"},
+                            ],
+                            data=[],
+                            page_size=10,
+                            sort_action='native',
+                            style_table={'overflowX': 'auto'},
+                            style_cell={
+                                'textAlign': 'left',
+                                'padding': '12px',
+                                'fontFamily': 'Inter, sans-serif',
+                                'border': '1px solid #e9ecef'
+                            },
+                            style_header={
+                                'backgroundColor': '#f8f9fa',
+                                'fontWeight': 'bold',
+                                'color': '#495057',
+                                'border': '1px solid #dee2e6'
+                            },
+                            style_data_conditional=[
+                                {
+                                    # Ítems que no discriminan (o discriminan al revés) se resaltan
+                                    'if': {'filter_query': '{discrimination} < 0.2', 'column_id': 'discrimination'},
+                                    'backgroundColor': '#fff3cd'
+                                }
+                            ]
+                        )
                     ], className="bg-white p-3 rounded-3 shadow-sm")
                     
                 ], className="modern-card p-4")
@@ -530,6 +589,14 @@ def content_benchmarking():
             ], className="display-6 fw-bold text-dark mb-0"),
             html.P("Análisis de rendimiento y comparación de modos", className="text-muted fs-5 mb-0")
         ], className="mb-5"),
+
+        html.Div([
+            dbc.Button([
+                html.Span("⏱️", className="me-2"),
+                "Ejecutar Benchmark"
+            ], id='run-benchmark-button', n_clicks=0, className="btn-modern-primary"),
+            html.Div(id='benchmark-run-status', className="mt-3"),
+        ], className="mb-4"),
         
         html.Div([
             html.Div([
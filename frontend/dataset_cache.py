@@ -0,0 +1,209 @@
+import os
+import shutil
+import hashlib
+import tempfile
+import numpy as np
+from frontend.config_utils import load_scoring_config
+from frontend.utils.logger import Logger
+
+DEFAULT_CACHE_DIR = "cache/datasets"
+DEFAULT_CACHE_MAX_MB = 2048
+HASH_BLOCK_SIZE = 1024 * 1024
+# Versión del formato de las entradas: incrementarla al cambiar un lector o la codificación invalida la caché
+CACHE_FORMAT_VERSION = 1
+
+logger = Logger()
+
+def hash_source(source) -> str:
+    """
+    Calcula el SHA-256 del contenido de un archivo leyendo por bloques.
+
+    Args:
+        source: Ruta o archivo binario con posibilidad de seek (se rebobina al terminar).
+
+    Returns:
+        str: Digest hexadecimal del contenido.
+    """
+    digest = hashlib.sha256()
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+    else:
+        source.seek(0)
+        for block in iter(lambda: source.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+        source.seek(0)
+    return digest.hexdigest()
+
+def cache_key(source, kind: str, filename: str = None) -> str:
+    """
+    Clave de la caché para source: tipo de dataset, extensión del archivo (que elige el lector),
+    CACHE_FORMAT_VERSION y SHA-256 del contenido.
+
+    Args:
+        source: Ruta o archivo binario con posibilidad de seek.
+        kind (str): Tipo de dataset ('responses', 'answer_key', ...).
+        filename (str, optional): Nombre original del archivo; por defecto, la ruta de source.
+
+    Returns:
+        str: Clave de la entrada (también es el nombre de su directorio).
+    """
+    if filename is None:
+        filename = os.fspath(source) if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', '')
+    extension = os.path.splitext(str(filename))[1].lstrip('.').lower() or 'none'
+    return f'{kind}-{extension}-v{CACHE_FORMAT_VERSION}-{hash_source(source)}'
+
+class DatasetCache:
+    """
+    Caché en disco de datasets ya parseados, indexada por el hash del archivo original.
+
+    Cada entrada es un directorio con un archivo .npy por arreglo, que se carga con memory-map.
+    El tamaño total se limita a max_bytes desalojando las entradas usadas hace más tiempo (LRU).
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = None):
+        self.cache_dir = cache_dir
+        if max_bytes is None:
+            max_bytes = int(load_scoring_config().get('cache_max_mb', DEFAULT_CACHE_MAX_MB)) * 1024 * 1024
+        self.max_bytes = max_bytes
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def get(self, key: str):
+        """
+        Devuelve los arreglos de una entrada (memory-mapped, solo lectura) o None si no existe.
+
+        Args:
+            key (str): Clave de la entrada (normalmente el SHA-256 del archivo).
+
+        Returns:
+            dict | None: Diccionario nombre -> np.ndarray.
+        """
+        entry_dir = self._entry_dir(key)
+        try:
+            # Los archivos '.staging-*' son arreglos que add todavía está escribiendo
+            names = [name for name in os.listdir(entry_dir) if name.endswith('.npy') and not name.startswith('.')]
+            arrays = {name[:-4]: np.load(os.path.join(entry_dir, name), mmap_mode='r') for name in names}
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        # Marcar la entrada como usada recientemente para la política LRU
+        os.utime(entry_dir)
+        return arrays
+
+    def put(self, key: str, arrays: dict):
+        """
+        Guarda los arreglos de una entrada de forma atómica y aplica el presupuesto de tamaño.
+
+        Args:
+            key (str): Clave de la entrada.
+            arrays (dict): Diccionario nombre -> np.ndarray (sin dtype object).
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        staging_dir = tempfile.mkdtemp(prefix='.staging-', dir=self.cache_dir)
+        try:
+            for name, array in arrays.items():
+                np.save(os.path.join(staging_dir, f'{name}.npy'), np.asarray(array), allow_pickle=False)
+            entry_dir = self._entry_dir(key)
+            if os.path.isdir(entry_dir):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(staging_dir, entry_dir)
+        except OSError:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+        self.evict(keep=key)
+
+    def add(self, key: str, name: str, array: np.ndarray):
+        """
+        Agrega (o reemplaza) un arreglo derivado en una entrada existente, p. ej. los planos de bits del modo
+        empaquetado, de forma atómica, y aplica el presupuesto de tamaño.
+
+        Args:
+            key (str): Clave de la entrada.
+            name (str): Nombre del arreglo.
+            array (np.ndarray): Arreglo a guardar (sin dtype object).
+
+        Raises:
+            FileNotFoundError: Si la entrada no existe (fue desalojada).
+        """
+        entry_dir = self._entry_dir(key)
+        fd, staging_path = tempfile.mkstemp(prefix='.staging-', suffix='.npy', dir=entry_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, np.asarray(array), allow_pickle=False)
+            os.replace(staging_path, os.path.join(entry_dir, f'{name}.npy'))
+        except OSError:
+            if os.path.exists(staging_path):
+                os.remove(staging_path)
+            raise
+        self.evict(keep=key)
+
+    def evict(self, keep: str = None):
+        """
+        Elimina las entradas menos usadas hasta respetar max_bytes.
+
+        Args:
+            keep (str, optional): Clave que no debe desalojarse (la recién escrita).
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            entry_dir = self._entry_dir(name)
+            if name.startswith('.') or not os.path.isdir(entry_dir):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(entry_dir) if entry.is_file())
+            entries.append((os.stat(entry_dir).st_mtime, name, size))
+
+        total = sum(size for _, _, size in entries)
+        for _, name, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            shutil.rmtree(self._entry_dir(name), ignore_errors=True)
+            total -= size
+
+    def get_or_parse(self, source, kind: str, parse_fn, names: tuple, filename: str = None):
+        """
+        Devuelve los arreglos parseados de source, usando la caché cuando el contenido ya se vio.
+
+        Args:
+            source: Ruta o archivo binario.
+            kind (str): Tipo de dataset ('responses', 'answer_key', ...); forma parte de la clave.
+            parse_fn (callable): Función que recibe source y devuelve una tupla de arreglos.
+            names (tuple): Nombres con los que se guardan los arreglos devueltos por parse_fn.
+            filename (str, optional): Nombre original del archivo; su extensión elige el lector y forma parte
+                de la clave. Por defecto, la ruta de source.
+
+        Returns:
+            tuple: Arreglos en el mismo orden que names (memory-mapped salvo que la caché no pueda escribirse).
+        """
+        return self.parse_cached(source, kind, parse_fn, names, filename)[1]
+
+    def parse_cached(self, source, kind: str, parse_fn, names: tuple, filename: str = None):
+        """
+        Igual que get_or_parse, pero devuelve también la clave de la entrada (para volver a cargarla con get).
+
+        Returns:
+            tuple: (clave, tupla de arreglos en el mismo orden que names).
+        """
+        key = cache_key(source, kind, filename)
+        cached = self.get(key)
+        if cached is not None and all(name in cached for name in names):
+            return key, tuple(cached[name] for name in names)
+        arrays = parse_fn(source)
+        try:
+            self.put(key, dict(zip(names, arrays)))
+        except OSError as e:
+            # Un fallo de la caché no debe impedir la carga del dataset
+            logger.log("ERROR", "dataset_cache", f"No se pudo guardar en la caché de datasets: {e}", extra={"key": key, "error_details": str(e)})
+            return key, arrays
+        # Devolver la copia memory-mapped: el resultado del parseo se libera y la evaluación fuera de
+        # memoria puede leer directamente el archivo de la caché
+        cached = self.get(key)
+        if cached is not None and all(name in cached for name in names):
+            return key, tuple(cached[name] for name in names)
+        return key, arrays
+
+# Instancia compartida por /upload y los cargadores de validación
+dataset_cache = DatasetCache()
@@ -0,0 +1,197 @@
+import uuid
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from datetime import datetime
+from frontend.config_utils import load_scoring_config
+from frontend.dataset_cache import dataset_cache
+from frontend.ingestion import responses_frame
+from frontend.evaluation_logic import pack_answers
+from frontend.utils.logger import Logger
+
+DEFAULT_REGISTRY_MAX_MB = 1024
+# Arreglos de respuestas de un dataset, con los mismos nombres que las entradas de la caché en disco
+RESPONSE_ARRAYS = ('student_ids', 'answers', 'versions')
+
+logger = Logger()
+
+class DatasetRegistry:
+    """
+    Registro de datasets cargados (respuestas codificadas + clave), indexado por dataset_id.
+
+    Los datasets residentes mantienen sus matrices int8 en memoria; cuando la suma supera max_bytes se
+    descargan los usados hace más tiempo (LRU), que quedan respaldados por su entrada en la caché de
+    datasets en disco y se vuelven a cargar en el próximo uso. La clave de respuestas y el estado de la
+    última evaluación de cada dataset (para /rescore y /ranking) siempre se conservan. Los planos de bits
+    del modo empaquetado se guardan junto a las matrices la primera vez que se piden (ver packed_answers).
+    """
+
+    def __init__(self, cache=dataset_cache, max_bytes: int = None):
+        self.cache = cache
+        if max_bytes is None:
+            max_bytes = int(load_scoring_config().get('registry_max_mb', DEFAULT_REGISTRY_MAX_MB)) * 1024 * 1024
+        self.max_bytes = max_bytes
+        self._datasets = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _arrays_bytes(arrays: dict) -> int:
+        return sum(np.asarray(array).nbytes for array in arrays.values())
+
+    def register(self, cache_key: str, arrays: tuple, key_df: pd.DataFrame, filenames: dict = None, dataset_id: str = None) -> str:
+        """
+        Registra (o reemplaza) un dataset y lo deja residente.
+
+        Args:
+            cache_key (str): Clave de las respuestas en la caché de datasets (ver DatasetCache.parse_cached).
+            arrays (tuple): (student_ids, answers, versions), en el orden de RESPONSE_ARRAYS.
+            key_df (pd.DataFrame): Claves de respuestas ('version', 'question_id', 'correct_answer', pesos).
+            filenames (dict, optional): Nombres de los archivos subidos, informativo.
+            dataset_id (str, optional): Identificador elegido (p. ej. el área del examen); por defecto uno aleatorio.
+
+        Returns:
+            str: dataset_id.
+        """
+        dataset_id = dataset_id or uuid.uuid4().hex
+        # Copia en memoria: la caché devuelve memory-maps y los datasets residentes se evalúan sin tocar el disco
+        resident = {name: np.array(array) for name, array in zip(RESPONSE_ARRAYS, arrays)}
+        entry = {
+            "dataset_id": dataset_id,
+            "cache_key": cache_key,
+            "key_df": key_df,
+            "filenames": filenames or {},
+            "num_students": len(resident['answers']),
+            "num_questions": int(resident['answers'].shape[1]),
+            "created_at": datetime.now().isoformat(timespec='seconds'),
+            "arrays": resident,
+            "students_df": responses_frame(resident['student_ids'], resident['answers'], resident['versions']),
+            "last_run": None,
+            "last_results": None,
+        }
+        with self._lock:
+            self._datasets[dataset_id] = entry
+            self._datasets.move_to_end(dataset_id)
+            self._evict(keep=dataset_id)
+        return dataset_id
+
+    def get(self, dataset_id: str) -> dict:
+        """
+        Devuelve la entrada de un dataset, recargándola desde la caché en disco si había sido descargada.
+        La entrada pasa a ser la más recientemente usada.
+
+        Args:
+            dataset_id (str): Identificador devuelto por register.
+
+        Returns:
+            dict: 'dataset_id', 'cache_key', 'key_df', 'students_df', 'arrays', 'last_run', 'last_results', ...
+
+        Raises:
+            KeyError: Si el dataset no existe o su copia en disco ya no está disponible.
+        """
+        with self._lock:
+            entry = self._datasets.get(dataset_id)
+            if entry is None:
+                raise KeyError(f"Dataset no encontrado: {dataset_id}")
+            if entry["arrays"] is None:
+                cached = self.cache.get(entry["cache_key"])
+                if cached is None or not all(name in cached for name in RESPONSE_ARRAYS):
+                    raise KeyError(f"El dataset {dataset_id} ya no está en la caché en disco; vuelva a cargarlo.")
+                arrays = {name: np.array(cached[name]) for name in RESPONSE_ARRAYS}
+                entry["arrays"] = arrays
+                entry["students_df"] = responses_frame(arrays['student_ids'], arrays['answers'], arrays['versions'])
+            self._datasets.move_to_end(dataset_id)
+            self._evict(keep=dataset_id)
+            return entry
+
+    def packed_answers(self, dataset_id: str) -> np.ndarray:
+        """
+        Devuelve los planos de bits del modo empaquetado de un dataset. Se empaquetan una sola vez: se guardan
+        en la entrada residente (cuentan para max_bytes) y en su entrada de la caché en disco, de donde se
+        vuelven a cargar si el dataset fue descargado.
+
+        Args:
+            dataset_id (str): Identificador devuelto por register.
+
+        Returns:
+            np.ndarray: Planos de bits (ver evaluation_logic.pack_answers).
+
+        Raises:
+            KeyError: Si el dataset no existe o su copia en disco ya no está disponible.
+        """
+        entry = self.get(dataset_id)
+        arrays = entry["arrays"]
+        if 'packed' in arrays:
+            return arrays['packed']
+        cached = self.cache.get(entry["cache_key"])
+        if cached is not None and 'packed' in cached:
+            packed = np.array(cached['packed'])
+        else:
+            # Fuera del lock: empaquetar recorre toda la matriz
+            packed = pack_answers(arrays['answers'])
+            # Sin entrada en disco, los planos se respaldan con el resto de los arreglos al descargar el dataset
+            if cached is not None:
+                try:
+                    self.cache.add(entry["cache_key"], 'packed', packed)
+                except OSError as e:
+                    logger.log("ERROR", "datasets", f"No se pudieron guardar los planos de bits del dataset {dataset_id} en la caché: {e}", extra={"dataset_id": dataset_id, "error_details": str(e)})
+        with self._lock:
+            if entry["arrays"] is arrays:
+                arrays['packed'] = packed
+                self._evict(keep=dataset_id)
+        return packed
+
+    def update(self, dataset_id: str, **fields):
+        """Actualiza campos de un dataset (p. ej. 'last_run', 'last_results', 'key_df'); ignora datasets eliminados."""
+        with self._lock:
+            if dataset_id in self._datasets:
+                self._datasets[dataset_id].update(fields)
+
+    def remove(self, dataset_id: str) -> bool:
+        """Elimina un dataset del registro (su entrada en la caché en disco se conserva). Devuelve si existía."""
+        with self._lock:
+            return self._datasets.pop(dataset_id, None) is not None
+
+    def list(self) -> list:
+        """Resumen de los datasets registrados, del usado hace más tiempo al más reciente."""
+        with self._lock:
+            return [{
+                "dataset_id": entry["dataset_id"],
+                "num_students": entry["num_students"],
+                "num_questions": entry["num_questions"],
+                "versions": sorted(entry["key_df"]['version'].unique().tolist()),
+                "filenames": entry["filenames"],
+                "created_at": entry["created_at"],
+                "resident": entry["arrays"] is not None,
+                "resident_bytes": self._arrays_bytes(entry["arrays"]) if entry["arrays"] is not None else 0,
+                "evaluated": entry["last_results"] is not None,
+            } for entry in self._datasets.values()]
+
+    def resident_bytes(self) -> int:
+        """Bytes de las matrices de los datasets residentes."""
+        with self._lock:
+            return sum(self._arrays_bytes(entry["arrays"]) for entry in self._datasets.values() if entry["arrays"] is not None)
+
+    def _evict(self, keep: str = None):
+        """Descarga los datasets residentes usados hace más tiempo hasta respetar max_bytes (con el lock tomado)."""
+        resident = [(dataset_id, self._arrays_bytes(entry["arrays"])) for dataset_id, entry in self._datasets.items() if entry["arrays"] is not None]
+        total = sum(size for _, size in resident)
+        for dataset_id, size in resident:
+            if total <= self.max_bytes:
+                break
+            if dataset_id == keep:
+                continue
+            entry = self._datasets[dataset_id]
+            # Respaldar en disco si la caché ya no tiene la entrada (desalojada o nunca escrita)
+            if self.cache.get(entry["cache_key"]) is None:
+                try:
+                    self.cache.put(entry["cache_key"], entry["arrays"])
+                except OSError as e:
+                    logger.log("ERROR", "datasets", f"No se pudo descargar el dataset {dataset_id} a la caché: {e}", extra={"dataset_id": dataset_id, "error_details": str(e)})
+                    continue
+            entry["arrays"] = None
+            entry["students_df"] = None
+            total -= size
+
+# Instancia compartida por /upload, /run y los demás endpoints
+dataset_registry = DatasetRegistry()
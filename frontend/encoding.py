@@ -0,0 +1,117 @@
+import pandas as pd
+import numpy as np
+from frontend.native import load_native
+
+# Columnas de respuestas esperadas y mapeo de letras a códigos numéricos
+ANSWER_COLS = [f'answer_{i}' for i in range(1, 101)]
+ANSWER_MAPPING = {'A': 0, 'B': 1, 'C': 2, 'D': 3}
+BLANK_CODE = -1
+# Código opcional para celdas fuera de dominio (p. ej. 'X'), usado por la ingesta y la validación
+INVALID_CODE = -2
+# Código de clave de una pregunta anulada tras los reclamos (solo lo interpreta la recalificación incremental;
+# coincide con pyevalcore.ANNULLED_KEY)
+ANNULLED_CODE = -3
+
+def _encode_cell(value, invalid_code: int = BLANK_CODE) -> int:
+    """
+    Traduce una celda individual a su código numérico.
+
+    Acepta letras (con espacios o minúsculas) y valores ya codificados (0-3).
+    NaN, None, -1 y cadenas vacías se codifican como blanco (-1); cualquier otro valor como invalid_code.
+    """
+    if isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool):
+        if value != value or value == BLANK_CODE:  # NaN o blanco ya codificado
+            return BLANK_CODE
+        code = int(value)
+        return code if code == value and 0 <= code <= 3 else invalid_code
+    text = str(value).strip().upper()
+    if text == '':
+        return BLANK_CODE
+    return ANSWER_MAPPING.get(text, invalid_code)
+
+def encode_values(values: np.ndarray, invalid_code: int = BLANK_CODE) -> np.ndarray:
+    """
+    Codifica un arreglo de celdas arbitrarias a int8 mediante una tabla de búsqueda.
+
+    Las celdas se factorizan en una sola pasada vectorizada; solo los valores distintos
+    (unas pocas letras) se traducen en Python y el resultado se obtiene indexando la tabla.
+
+    Args:
+        values (np.ndarray): Arreglo (de cualquier forma) con letras A-D, códigos 0-3 o vacíos.
+        invalid_code (int): Código para celdas fuera de dominio. Por defecto -1 (se evalúan como blanco).
+
+    Returns:
+        np.ndarray: Arreglo int8 de la misma forma con valores 0-3, -1 (blanco) o invalid_code.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in 'iu':
+        in_domain = ((values >= 0) & (values <= 3)) | (values == BLANK_CODE)
+        return np.where(in_domain, values, invalid_code).astype(np.int8)
+    if values.dtype.kind == 'S' and values.dtype.itemsize == 1:
+        return encode_answer_bytes(values, invalid_code)
+
+    codes, uniques = pd.factorize(values.ravel())
+    # El último elemento de la tabla atiende al centinela -1 que factorize asigna a NaN/None
+    lookup = np.array([_encode_cell(u, invalid_code) for u in uniques] + [BLANK_CODE], dtype=np.int8)
+    return lookup[codes].reshape(values.shape)
+
+def encode_answer_bytes(cells: np.ndarray, invalid_code: int = BLANK_CODE) -> np.ndarray:
+    """
+    Codifica celdas de un byte ('A'-'D') con la tabla de búsqueda nativa de pyevalcore
+    (o con una tabla equivalente de 256 entradas en NumPy si el módulo nativo no está disponible).
+
+    Args:
+        cells (np.ndarray): Arreglo de dtype 'S1' o uint8.
+        invalid_code (int): Código para bytes fuera de dominio (espacio y NUL siempre son blanco).
+
+    Returns:
+        np.ndarray: Arreglo int8 de la misma forma con valores 0-3, -1 o invalid_code.
+    """
+    cells = np.ascontiguousarray(cells)
+    native = load_native()
+    if native is not None:
+        return native.encode_answers(cells.view(np.uint8), invalid_code)
+    lookup = np.full(256, invalid_code, dtype=np.int8)
+    for code, letter in enumerate('ABCD'):
+        lookup[ord(letter)] = lookup[ord(letter.lower())] = code
+    lookup[[ord(' '), ord('\t'), 0]] = BLANK_CODE
+    return lookup[cells.view(np.uint8)]
+
+def encode_answers(df_answers: pd.DataFrame, answer_cols: list = None) -> np.ndarray:
+    """
+    Convierte las columnas de respuestas de un DataFrame en la matriz int8 que consume el motor C++.
+
+    Args:
+        df_answers (pd.DataFrame): DataFrame con las columnas 'answer_1' a 'answer_100', ya sea
+                                   con letras (A-D), códigos numéricos (0-3) o valores vacíos.
+        answer_cols (list, optional): Columnas a codificar. Por defecto 'answer_1' a 'answer_100'.
+
+    Returns:
+        np.ndarray: Matriz C-contigua (estudiantes x preguntas) de int8.
+    """
+    block = df_answers[answer_cols or ANSWER_COLS]
+    if all(pd.api.types.is_integer_dtype(dtype) for dtype in block.dtypes):
+        values = block.to_numpy()
+    else:
+        values = block.to_numpy(dtype=object)
+    return np.ascontiguousarray(encode_values(values))
+
+def encode_key(series_key: pd.Series, keep_annulled: bool = False) -> np.ndarray:
+    """
+    Convierte la clave de respuestas (ordenada por question_id) en un arreglo int8.
+
+    Args:
+        series_key (pd.Series): Clave indexada por question_id con letras (A-D) o códigos (0-3).
+        keep_annulled (bool): Conservar ANNULLED_CODE en las preguntas anuladas. Por defecto se
+                              codifican como clave inválida (-1), que es lo que entienden los modos run_*.
+
+    Returns:
+        np.ndarray: Arreglo int8 con valores 0-3 o -1 para claves inválidas.
+    """
+    values = series_key.sort_index().to_numpy()
+    if values.dtype.kind not in 'iu':
+        values = values.astype(object)
+    key_np = encode_values(values)
+    if keep_annulled:
+        key_np = np.where(values == ANNULLED_CODE, ANNULLED_CODE, key_np).astype(np.int8)
+    return np.ascontiguousarray(key_np)
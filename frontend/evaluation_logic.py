@@ -1,6 +1,76 @@
+import os
+import uuid
 import pandas as pd
 import numpy as np
-import pyevalcore
+from types import SimpleNamespace
+from frontend.native import pyevalcore, native_available
+from frontend.numpy_backend import RESULT_DTYPE, evaluate_numpy, evaluate_versions_numpy, evaluate_weighted_numpy, evaluate_sections_numpy, combine_sections_numpy, rescore_questions_numpy, item_analysis_numpy
+from frontend.out_of_core import OUT_OF_CORE_DIR, DEFAULT_MEMORY_MB, answers_file, evaluate_out_of_core
+from frontend.encoding import encode_answers, encode_key, encode_values
+from frontend.ingestion import DEFAULT_KEY_VERSION
+
+RESULT_FIELDS = ['score', 'correct', 'wrong', 'blank']
+
+def configure_pthreads_pool(scoring_config: dict):
+    """
+    Fija el tamaño del pool persistente de hilos del modo pthreads ('pthreads_pool_size', 0 = todos los
+    núcleos); el pool se crea en el primer uso y el módulo nativo lo cierra al salir (atexit).
+    Se llama al iniciar la aplicación: cambiar el tamaño cierra el pool existente.
+
+    Args:
+        scoring_config (dict): Configuración de scoring.json.
+    """
+    if native_available():
+        pyevalcore.set_pthreads_pool_size(int(scoring_config.get('pthreads_pool_size', 0)))
+
+def results_to_frame(results_arr: np.ndarray) -> pd.DataFrame:
+    """
+    Construye un DataFrame a partir del arreglo estructurado de resultados sin copiar filas.
+
+    Args:
+        results_arr (np.ndarray): Arreglo con campos 'score', 'correct', 'wrong' y 'blank'.
+
+    Returns:
+        pd.DataFrame: DataFrame con una columna por campo.
+    """
+    return pd.DataFrame({field: results_arr[field] for field in RESULT_FIELDS}, copy=False)
+
+def _scoring_rule(rule: dict):
+    """Crea la instancia de pyevalcore.ScoringRule (o un equivalente si no hay módulo nativo) a partir del diccionario de reglas."""
+    scoring_rule = pyevalcore.ScoringRule() if native_available() else SimpleNamespace()
+    scoring_rule.correct = rule.get('correct', 0.0)
+    scoring_rule.wrong = rule.get('wrong', 0.0)
+    scoring_rule.blank = rule.get('blank', 0.0)
+    return scoring_rule
+
+def _with_student_ids(df_results: pd.DataFrame, df_answers: pd.DataFrame) -> pd.DataFrame:
+    """Añade la columna student_id desde el DataFrame original (o el índice si no existe)."""
+    if 'student_id' in df_answers.columns:
+        df_results.insert(0, 'student_id', df_answers['student_id'].values)
+    else:
+        df_results.insert(0, 'student_id', df_results.index)
+    return df_results
+
+def _evaluate(native_fn, df_answers: pd.DataFrame, series_key: pd.Series, rule: dict) -> pd.DataFrame:
+    """
+    Codifica respuestas y clave una sola vez y delega la evaluación a la función nativa indicada.
+
+    Args:
+        native_fn (callable): Función columnar de pyevalcore (run_serial_array, run_openmp_array, ...) o evaluate_numpy.
+        df_answers (pd.DataFrame): DataFrame con las respuestas de los estudiantes.
+        series_key (pd.Series): Serie con la clave de respuestas, indexada por question_id.
+        rule (dict): Diccionario con las reglas de puntuación.
+
+    Returns:
+        pd.DataFrame: DataFrame con 'student_id', 'score', 'correct', 'wrong' y 'blank'.
+    """
+    # Codificar respuestas y clave con la tabla de búsqueda compartida (-1 blanco/inválido)
+    answers_np = encode_answers(df_answers)
+    key_np = encode_key(series_key)
+
+    # Llamar a la función C++; devuelve un arreglo estructurado respaldado por el buffer de C++
+    results_arr = native_fn(answers_np, key_np, _scoring_rule(rule))
+    return _with_student_ids(results_to_frame(results_arr), df_answers)
 
 def run_serial(df_answers: pd.DataFrame, series_key: pd.Series, rule: dict) -> pd.DataFrame:
     """
@@ -19,34 +89,7 @@ def run_serial(df_answers: pd.DataFrame, series_key: pd.Series, rule: dict) -> p
         pd.DataFrame: DataFrame con los resultados de la evaluación para cada estudiante,
                       incluyendo 'score', 'correct', 'wrong', 'blank'.
     """
-    # Asegurar orden de columnas de respuestas
-    answer_cols = [f'answer_{i}' for i in range(1, 101)]
-    # Mapeo de respuestas A-D a valores -1 a 3
-    mapping = {'A': 0, 'B': 1, 'C': 2, 'D': 3}
-    # Limpiar y convertir respuestas de estudiantes a valores numéricos (-1 inválido)
-    df_clean = df_answers[answer_cols].fillna('').astype(str).apply(lambda col: col.str.strip().str.upper())
-    df_mapped = df_clean.apply(lambda col: col.map(mapping).fillna(-1).astype(np.int8))
-    answers_np = df_mapped.to_numpy()
-
-    # Convertir clave de respuestas a valores numéricos (-1 inválido)
-    key_series = series_key.sort_index().fillna('').astype(str).str.strip().str.upper()
-    key_np = key_series.map(lambda v: mapping.get(v, -1)).astype(np.int8).to_numpy()
-
-    # Crear instancia de ScoringRule
-    scoring_rule = pyevalcore.ScoringRule()
-    scoring_rule.correct = rule.get('correct', 0.0)
-    scoring_rule.wrong = rule.get('wrong', 0.0)
-    scoring_rule.blank = rule.get('blank', 0.0)
-
-    # Llamar a la función C++
-    results_list = pyevalcore.run_serial(answers_np, key_np, scoring_rule)
-    df_results = pd.DataFrame(results_list)
-    # Añadir columna student_id desde el DataFrame original
-    if 'student_id' in df_answers.columns:
-        df_results.insert(0, 'student_id', df_answers['student_id'].values)
-    else:
-        df_results.insert(0, 'student_id', df_results.index)
-    return df_results
+    return _evaluate(pyevalcore.run_serial_array, df_answers, series_key, rule)
 
 def run_openmp(df_answers: pd.DataFrame, series_key: pd.Series, rule: dict) -> pd.DataFrame:
     """
@@ -65,35 +108,7 @@ def run_openmp(df_answers: pd.DataFrame, series_key: pd.Series, rule: dict) -> p
         pd.DataFrame: DataFrame con los resultados de la evaluación para cada estudiante,
                        incluyendo 'score', 'correct', 'wrong', 'blank'.
     """
-    # Convertir df_answers a un array de NumPy de int8_t
-    answer_cols = [f'answer_{i}' for i in range(1, 101)]
-    # Normalizar respuestas de estudiantes y mapear a valores numéricos (-1 inválido)
-    df_clean = df_answers[answer_cols].fillna('').astype(str).apply(lambda col: col.str.strip().str.upper())
-    mapping = {'A': 0, 'B': 1, 'C': 2, 'D': 3}
-    df_mapped = df_clean.apply(lambda col: col.map(mapping).fillna(-1).astype(np.int8))
-    answers_np = df_mapped.to_numpy()
-
-    # Convertir series_key a valores numéricos (A-D map a 0-3, inválido -1)
-    key_clean = series_key.sort_index().astype(str).str.strip().str.upper().map(mapping).fillna(-1).astype(np.int8)
-    key_np = key_clean.values
-
-    # Crear una instancia de ScoringRule
-    scoring_rule = pyevalcore.ScoringRule()
-    scoring_rule.correct = rule.get('correct', 0.0)
-    scoring_rule.wrong = rule.get('wrong', 0.0)
-    scoring_rule.blank = rule.get('blank', 0.0)
-
-    # Llamar a la función C++
-    results_list = pyevalcore.run_openmp(answers_np, key_np, scoring_rule)
-
-    # Convertir la lista de diccionarios de resultados a un DataFrame de Pandas
-    df_results = pd.DataFrame(results_list)
-    # Añadir columna student_id desde el DataFrame original
-    if 'student_id' in df_answers.columns:
-        df_results.insert(0, 'student_id', df_answers['student_id'].values)
-    else:
-        df_results.insert(0, 'student_id', df_results.index)
-    return df_results
+    return _evaluate(pyevalcore.run_openmp_array, df_answers, series_key, rule)
 
 def run_cuda(df_answers: pd.DataFrame, series_key: pd.Series, rule: dict) -> pd.DataFrame:
    """
@@ -112,35 +127,7 @@ def run_cuda(df_answers: pd.DataFrame, series_key: pd.Series, rule: dict) -> pd.
        pd.DataFrame: DataFrame con los resultados de la evaluación para cada estudiante,
                       incluyendo 'score', 'correct', 'wrong', 'blank'.
    """
-   # Convertir df_answers a un array de NumPy de int8_t
-   answer_cols = [f'answer_{i}' for i in range(1, 101)]
-   # Normalizar respuestas de estudiantes y mapear a valores numéricos (-1 inválido)
-   df_clean = df_answers[answer_cols].fillna('').astype(str).apply(lambda col: col.str.strip().str.upper())
-   mapping = {'A': 0, 'B': 1, 'C': 2, 'D': 3}
-   df_mapped = df_clean.apply(lambda col: col.map(mapping).fillna(-1).astype(np.int8))
-   answers_np = df_mapped.to_numpy()
-
-   # Convertir series_key a valores numéricos (A-D map a 0-3, inválido -1)
-   key_clean = series_key.sort_index().astype(str).str.strip().str.upper().map(mapping).fillna(-1).astype(np.int8)
-   key_np = key_clean.values
-
-   # Crear una instancia de ScoringRule
-   scoring_rule = pyevalcore.ScoringRule()
-   scoring_rule.correct = rule.get('correct', 0.0)
-   scoring_rule.wrong = rule.get('wrong', 0.0)
-   scoring_rule.blank = rule.get('blank', 0.0)
-
-   # Llamar a la función C++
-   results_list = pyevalcore.run_cuda(answers_np, key_np, scoring_rule)
-
-   # Convertir la lista de diccionarios de resultados a un DataFrame de Pandas
-   df_results = pd.DataFrame(results_list)
-   # Añadir columna student_id desde el DataFrame original
-   if 'student_id' in df_answers.columns:
-       df_results.insert(0, 'student_id', df_answers['student_id'].values)
-   else:
-       df_results.insert(0, 'student_id', df_results.index)
-   return df_results
+   return _evaluate(pyevalcore.run_cuda_array, df_answers, series_key, rule)
 
 def run_pthreads(df_answers: pd.DataFrame, series_key: pd.Series, rule: dict) -> pd.DataFrame:
    """
@@ -154,25 +141,358 @@ def run_pthreads(df_answers: pd.DataFrame, series_key: pd.Series, rule: dict) ->
    Returns:
        pd.DataFrame: DataFrame con los resultados de la evaluación.
    """
-   answer_cols = [f'answer_{i}' for i in range(1, 101)]
-   df_clean = df_answers[answer_cols].fillna('').astype(str).apply(lambda col: col.str.strip().str.upper())
-   mapping = {'A': 0, 'B': 1, 'C': 2, 'D': 3}
-   df_mapped = df_clean.apply(lambda col: col.map(mapping).fillna(-1).astype(np.int8))
-   answers_np = df_mapped.to_numpy()
+   return _evaluate(pyevalcore.run_pthreads_array, df_answers, series_key, rule)
+
+def run_simd(df_answers: pd.DataFrame, series_key: pd.Series, rule: dict) -> pd.DataFrame:
+   """
+   Ejecuta la evaluación en un hilo con el kernel SIMD sin saltos (comparación + máscara + popcount).
+   El conjunto de instrucciones (AVX2, SSE2 o escalar) se elige en tiempo de ejecución según la CPU.
+
+   Args:
+       df_answers (pd.DataFrame): DataFrame con las respuestas de los estudiantes.
+       series_key (pd.Series): Serie con la clave de respuestas.
+       rule (dict): Diccionario con las reglas de puntuación.
+
+   Returns:
+       pd.DataFrame: DataFrame con los resultados de la evaluación.
+   """
+   return _evaluate(pyevalcore.run_simd_array, df_answers, series_key, rule)
+
+def run_openmp_simd(df_answers: pd.DataFrame, series_key: pd.Series, rule: dict) -> pd.DataFrame:
+   """
+   Ejecuta la evaluación en modo OpenMP con el kernel SIMD en el bucle interno.
+
+   Args:
+       df_answers (pd.DataFrame): DataFrame con las respuestas de los estudiantes.
+       series_key (pd.Series): Serie con la clave de respuestas.
+       rule (dict): Diccionario con las reglas de puntuación.
+
+   Returns:
+       pd.DataFrame: DataFrame con los resultados de la evaluación.
+   """
+   return _evaluate(pyevalcore.run_openmp_simd_array, df_answers, series_key, rule)
+
+def run_pthreads_simd(df_answers: pd.DataFrame, series_key: pd.Series, rule: dict) -> pd.DataFrame:
+   """
+   Ejecuta la evaluación en el pool de Pthreads con el kernel SIMD en el bucle interno.
+
+   Args:
+       df_answers (pd.DataFrame): DataFrame con las respuestas de los estudiantes.
+       series_key (pd.Series): Serie con la clave de respuestas.
+       rule (dict): Diccionario con las reglas de puntuación.
+
+   Returns:
+       pd.DataFrame: DataFrame con los resultados de la evaluación.
+   """
+   return _evaluate(pyevalcore.run_pthreads_simd_array, df_answers, series_key, rule)
+
+def run_numpy(df_answers: pd.DataFrame, series_key: pd.Series, rule: dict) -> pd.DataFrame:
+   """
+   Ejecuta la evaluación con el backend NumPy (comparación con difusión y reducciones por fila).
+   No requiere la extensión nativa y sirve de referencia para contrastar los demás modos.
+
+   Args:
+       df_answers (pd.DataFrame): DataFrame con las respuestas de los estudiantes.
+       series_key (pd.Series): Serie con la clave de respuestas.
+       rule (dict): Diccionario con las reglas de puntuación.
+
+   Returns:
+       pd.DataFrame: DataFrame con los resultados de la evaluación.
+   """
+   return _evaluate(evaluate_numpy, df_answers, series_key, rule)
+
+def run_out_of_core(answers_np: np.ndarray, student_ids: np.ndarray, series_key: pd.Series, rule: dict, mode: str = 'openmp_simd', memory_mb: float = DEFAULT_MEMORY_MB, progress=None) -> pd.DataFrame:
+   """
+   Evalúa la matriz de respuestas desde disco por ventanas acotadas a memory_mb (ver frontend.out_of_core).
+   Si la matriz no es ya un .npy memory-mapped (la caché de datasets), se copia primero a OUT_OF_CORE_DIR.
+   Los resultados se escriben en un archivo propio de esta ejecución y se cargan en memoria (24 bytes por
+   estudiante); la copia de las respuestas y el archivo de resultados se eliminan al terminar.
+
+   Args:
+       answers_np (np.ndarray): Matriz int8 (estudiantes x preguntas), en memoria o memory-mapped.
+       student_ids (np.ndarray): DNI de cada estudiante.
+       series_key (pd.Series): Serie con la clave de respuestas.
+       rule (dict): Diccionario con las reglas de puntuación.
+       mode (str): Modo de CPU (uno de OUT_OF_CORE_MODES).
+       memory_mb (float): Techo de memoria de una ventana en MB.
+       progress (callable, optional): progress(estudiantes evaluados, total) tras cada ventana.
+
+   Returns:
+       pd.DataFrame: DataFrame con los resultados.
+   """
+   answers_path = answers_file(answers_np, memory_mb)
+   # Nombre único por ejecución: dos trabajos pueden evaluar el mismo dataset (el mismo answers.npy) a la vez
+   results_path = os.path.join(OUT_OF_CORE_DIR, f'results-{uuid.uuid4().hex}.npy')
+   try:
+       results_arr = evaluate_out_of_core(answers_path, encode_key(series_key), _scoring_rule(rule), results_path, mode, memory_mb, progress)
+       # Al reasignar se libera el memory-map, de modo que el archivo puede borrarse también en Windows
+       results_arr = np.array(results_arr)
+   finally:
+       if answers_path != getattr(answers_np, 'filename', None) and os.path.exists(answers_path):
+           os.remove(answers_path)
+       if os.path.exists(results_path):
+           os.remove(results_path)
+   df_results = results_to_frame(results_arr)
+   df_results.insert(0, 'student_id', student_ids)
+   return df_results
+
+def pack_answers(answers_np: np.ndarray) -> np.ndarray:
+    """
+    Empaqueta la matriz de respuestas en planos de bits (ver run_packed_planes). Los códigos fuera de
+    dominio se normalizan antes a blanco, igual que en encode_answers, porque el kernel nativo los rechaza.
+
+    Args:
+        answers_np (np.ndarray): Matriz int8 (estudiantes x preguntas), p. ej. la del registro de datasets.
+
+    Returns:
+        np.ndarray: Matriz uint64 (estudiantes x 3 * palabras de 64 bits).
+    """
+    return pyevalcore.pack_answers(np.ascontiguousarray(encode_values(answers_np)))
+
+def _run_packed_array(answers_np: np.ndarray, key_np: np.ndarray, scoring_rule) -> np.ndarray:
+    """Empaqueta la matriz int8 en planos de bits y la evalúa con el kernel de popcount."""
+    return pyevalcore.run_packed_array(pyevalcore.pack_answers(answers_np), key_np, scoring_rule)
+
+def run_packed_planes(packed: np.ndarray, student_ids: np.ndarray, series_key: pd.Series, rule: dict) -> pd.DataFrame:
+    """
+    Evalúa planos de bits ya empaquetados (ver pack_answers), sin volver a empaquetar la matriz int8.
+
+    Args:
+        packed (np.ndarray): Planos de bits de las respuestas.
+        student_ids (np.ndarray): DNI de cada estudiante.
+        series_key (pd.Series): Serie con la clave de respuestas.
+        rule (dict): Diccionario con las reglas de puntuación.
+
+    Returns:
+        pd.DataFrame: DataFrame con los resultados de la evaluación.
+    """
+    df_results = results_to_frame(pyevalcore.run_packed_array(packed, encode_key(series_key), _scoring_rule(rule)))
+    df_results.insert(0, 'student_id', student_ids)
+    return df_results
+
+def run_packed(df_answers: pd.DataFrame, series_key: pd.Series, rule: dict) -> pd.DataFrame:
+   """
+   Ejecuta la evaluación en modo empaquetado: las respuestas se guardan como planos de bits
+   (bit bajo, bit alto y "respondida") y los conteos se obtienen con AND + popcount sobre palabras de 64 bits.
+
+   Args:
+       df_answers (pd.DataFrame): DataFrame con las respuestas de los estudiantes.
+       series_key (pd.Series): Serie con la clave de respuestas.
+       rule (dict): Diccionario con las reglas de puntuación.
+
+   Returns:
+       pd.DataFrame: DataFrame con los resultados de la evaluación.
+   """
+   return _evaluate(_run_packed_array, df_answers, series_key, rule)
 
-   key_clean = series_key.sort_index().astype(str).str.strip().str.upper().map(mapping).fillna(-1).astype(np.int8)
-   key_np = key_clean.values
+def build_key_matrix(key_df: pd.DataFrame):
+    """
+    Construye la matriz de claves (versiones x preguntas) a partir del DataFrame de claves cargado.
 
-   scoring_rule = pyevalcore.ScoringRule()
-   scoring_rule.correct = rule.get('correct', 0.0)
-   scoring_rule.wrong = rule.get('wrong', 0.0)
-   scoring_rule.blank = rule.get('blank', 0.0)
+    Args:
+        key_df (pd.DataFrame): DataFrame con 'version', 'question_id' y 'correct_answer'.
 
-   results_list = pyevalcore.run_pthreads(answers_np, key_np, scoring_rule)
+    Returns:
+        tuple: (versions, keys) donde versions es el arreglo ordenado de versiones y keys es una
+               matriz int8 C-contigua con una fila por versión (mismo orden).
+
+    Raises:
+        ValueError: Si las versiones no tienen el mismo número de preguntas.
+    """
+    versions = np.sort(key_df['version'].unique()).astype(str)
+    rows = []
+    for version in versions:
+        group = key_df[key_df['version'] == version]
+        rows.append(encode_key(pd.Series(group['correct_answer'].to_numpy(), index=group['question_id'].to_numpy())))
+    if len({len(row) for row in rows}) > 1:
+        raise ValueError("Todas las versiones de la clave deben tener el mismo número de preguntas.")
+    return versions, np.ascontiguousarray(np.vstack(rows))
+
+def run_versions(df_answers: pd.DataFrame, key_df: pd.DataFrame, rule: dict) -> pd.DataFrame:
+    """
+    Evalúa en una sola pasada paralela a estudiantes de varias versiones (temas) del examen:
+    cada estudiante se califica con la fila de la matriz de claves de su columna 'version'
+    (con NumPy si el módulo nativo no está disponible).
+
+    Args:
+        df_answers (pd.DataFrame): DataFrame con las respuestas y, opcionalmente, la columna 'version'
+                                   (sin ella todos los estudiantes son de DEFAULT_KEY_VERSION).
+        key_df (pd.DataFrame): DataFrame con 'version', 'question_id' y 'correct_answer'.
+        rule (dict): Diccionario con las reglas de puntuación.
+
+    Returns:
+        pd.DataFrame: DataFrame con 'student_id', 'score', 'correct', 'wrong' y 'blank'.
+
+    Raises:
+        ValueError: Si algún estudiante tiene una versión sin clave de respuestas.
+    """
+    versions, keys = build_key_matrix(key_df)
+    if 'version' in df_answers.columns:
+        student_versions = df_answers['version'].to_numpy(dtype=str)
+    else:
+        student_versions = np.full(len(df_answers), DEFAULT_KEY_VERSION)
+
+    version_index = np.searchsorted(versions, student_versions)
+    unknown = (version_index >= len(versions)) | (versions[np.minimum(version_index, len(versions) - 1)] != student_versions)
+    if unknown.any():
+        raise ValueError(f"Versiones sin clave de respuestas: {sorted(set(student_versions[unknown]))[:5]}")
+
+    run_versions_array = pyevalcore.run_versions_array if native_available() else evaluate_versions_numpy
+    results_arr = run_versions_array(encode_answers(df_answers), keys, version_index.astype(np.int32), _scoring_rule(rule))
+    return _with_student_ids(results_to_frame(results_arr), df_answers)
+
+# Backends con puntuación ponderada por pregunta; otros modos usan OpenMP
+# Nombre de la función de pyevalcore por modo (se resuelve al evaluar: el módulo nativo se importa en el primer uso)
+WEIGHTED_NATIVE_FUNCTIONS = {
+    'serial': 'run_weighted_serial_array',
+    'openmp': 'run_weighted_openmp_array',
+    'pthreads': 'run_weighted_pthreads_array',
+}
+
+def run_weighted(df_answers: pd.DataFrame, series_key: pd.Series, weights: pd.DataFrame, rule: dict, mode: str = 'openmp') -> pd.DataFrame:
+    """
+    Evalúa con pesos propios por pregunta (correcta, incorrecta y en blanco) dentro del kernel C++
+    (con NumPy si el módulo nativo no está disponible).
+    A diferencia de la regla escalar, el peso de blanco sí se suma al puntaje.
+
+    Args:
+        df_answers (pd.DataFrame): DataFrame con las respuestas de los estudiantes.
+        series_key (pd.Series): Serie con la clave de respuestas, indexada por question_id.
+        weights (pd.DataFrame): Pesos con columnas 'correct', 'wrong' y 'blank', con el mismo índice
+                                que series_key; los NaN se completan con los valores escalares de rule.
+        rule (dict): Diccionario con las reglas de puntuación escalares.
+        mode (str): 'serial', 'openmp' o 'pthreads'; cualquier otro modo usa OpenMP.
+
+    Returns:
+        pd.DataFrame: DataFrame con 'student_id', 'score', 'correct', 'wrong' y 'blank'.
+    """
+    if native_available():
+        native_fn = getattr(pyevalcore, WEIGHTED_NATIVE_FUNCTIONS.get(mode, 'run_weighted_openmp_array'))
+    else:
+        native_fn = evaluate_weighted_numpy
+    # Mismo orden que encode_key (por question_id) para alinear pesos y clave
+    weights = weights.sort_index()
+    weight_arrays = [
+        np.ascontiguousarray(weights[field].fillna(rule.get(field, 0.0)).to_numpy(dtype=np.float64))
+        for field in ('correct', 'wrong', 'blank')
+    ]
+    results_arr = native_fn(encode_answers(df_answers), encode_key(series_key), *weight_arrays)
+    return _with_student_ids(results_to_frame(results_arr), df_answers)
+
+def section_labels(question_ids, sections_config: dict) -> np.ndarray:
+    """
+    Asigna a cada pregunta el nombre de su sección según la configuración de scoring.json.
+
+    Args:
+        question_ids (array-like): question_id de cada pregunta.
+        sections_config (dict): Sección -> [primer question_id, último question_id] (inclusive).
+
+    Returns:
+        np.ndarray: Arreglo object con el nombre de la sección o None si la pregunta no tiene sección.
+    """
+    question_ids = np.asarray(question_ids, dtype=np.float64)
+    labels = np.full(len(question_ids), None, dtype=object)
+    for name, (first, last) in sections_config.items():
+        labels[(question_ids >= first) & (question_ids <= last)] = name
+    return labels
+
+def career_coefficients(careers_config: dict) -> pd.DataFrame:
+    """
+    Convierte la configuración de carreras (carrera -> {sección: coeficiente}) en una matriz carreras x secciones.
+    Las secciones que una carrera no menciona tienen coeficiente 0.
+    """
+    return pd.DataFrame.from_dict(careers_config, orient='index').fillna(0.0)
+
+def run_sections(df_answers: pd.DataFrame, series_key: pd.Series, sections: pd.Series, rule: dict, careers: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Evalúa y calcula en la misma pasada nativa los subpuntajes por sección y, opcionalmente,
+    los puntajes compuestos por carrera (combinación lineal de los subpuntajes).
+    Sin el módulo nativo se usan las versiones NumPy.
+
+    Args:
+        df_answers (pd.DataFrame): DataFrame con las respuestas de los estudiantes.
+        series_key (pd.Series): Serie con la clave de respuestas, indexada por question_id.
+        sections (pd.Series): Sección de cada pregunta (None/NaN si no tiene), con el mismo índice que series_key.
+        rule (dict): Diccionario con las reglas de puntuación.
+        careers (pd.DataFrame, optional): Coeficientes carreras x secciones (ver career_coefficients).
+
+    Returns:
+        pd.DataFrame: Resultados con 'student_id', 'score', 'correct', 'wrong', 'blank', una columna
+                      'section_<sección>' por sección y una columna 'career_<carrera>' por carrera.
+    """
+    # Mismo orden que encode_key (por question_id) para alinear secciones y clave
+    sections = sections.sort_index()
+    section_names = list(dict.fromkeys(name for name in sections if pd.notna(name)))
+    section_index = pd.Categorical(sections, categories=section_names).codes.astype(np.int32)
+
+    run_sections_array = pyevalcore.run_sections_array if native_available() else evaluate_sections_numpy
+    results_arr, subscores = run_sections_array(
+        encode_answers(df_answers), encode_key(series_key), section_index, len(section_names), _scoring_rule(rule))
+    df_results = _with_student_ids(results_to_frame(results_arr), df_answers)
+
+    extra = {f'section_{name}': subscores[:, i] for i, name in enumerate(section_names)}
+    if careers is not None and len(careers):
+        coefficients = careers.reindex(columns=section_names, fill_value=0.0).to_numpy(dtype=np.float64)
+        combine_sections = pyevalcore.combine_sections if native_available() else combine_sections_numpy
+        composites = combine_sections(subscores, coefficients)
+        extra.update({f'career_{career}': composites[:, i] for i, career in enumerate(careers.index)})
+    return pd.concat([df_results, pd.DataFrame(extra, index=df_results.index)], axis=1)
+
+ITEM_OPTIONS = ['A', 'B', 'C', 'D', 'blank']
+
+def run_item_analysis(df_answers: pd.DataFrame, series_key: pd.Series, scores, group_fraction: float = 0.27) -> pd.DataFrame:
+    """
+    Calcula el análisis de ítems en una pasada nativa paralela sobre la matriz de respuestas
+    (con NumPy si el módulo nativo no está disponible).
+
+    Args:
+        df_answers (pd.DataFrame): DataFrame con las respuestas de los estudiantes.
+        series_key (pd.Series): Serie con la clave de respuestas, indexada por question_id.
+        scores: Puntaje total de cada estudiante (mismo orden que df_answers), usado para formar los grupos.
+        group_fraction (float): Fracción de estudiantes de los grupos superior e inferior (0.27 clásico).
+
+    Returns:
+        pd.DataFrame: Una fila por pregunta con 'question_id', 'count_A' a 'count_D', 'count_blank',
+                      'difficulty' (proporción de aciertos) y 'discrimination' (p superior - p inferior).
+    """
+    item_analysis = pyevalcore.item_analysis if native_available() else item_analysis_numpy
+    analysis = item_analysis(encode_answers(df_answers), encode_key(series_key),
+                             np.asarray(scores, dtype=np.float64), group_fraction)
+    df_items = pd.DataFrame(analysis['option_counts'], columns=[f'count_{option}' for option in ITEM_OPTIONS])
+    df_items.insert(0, 'question_id', series_key.sort_index().index.to_numpy())
+    df_items['difficulty'] = analysis['difficulty']
+    df_items['discrimination'] = analysis['discrimination']
+    return df_items
+
+def rescore(df_results: pd.DataFrame, answers_np: np.ndarray, old_key_np: np.ndarray, new_key_np: np.ndarray, rule: dict) -> pd.DataFrame:
+    """
+    Recalifica resultados previos tras corregir o anular preguntas de la clave, aplicando solo la
+    diferencia de las preguntas que cambiaron (costo proporcional a estudiantes x preguntas cambiadas).
+
+    El estado por pregunta de la evaluación anterior queda determinado por las respuestas y la clave
+    anterior, por lo que basta conservar old_key_np en lugar de una matriz de aciertos.
+    Sin el módulo nativo se usa rescore_questions_numpy.
+
+    Args:
+        df_results (pd.DataFrame): Resultados de la evaluación con old_key_np ('score', 'correct', 'wrong', 'blank').
+        answers_np (np.ndarray): Matriz int8 (estudiantes x preguntas) con la que se evaluó.
+        old_key_np (np.ndarray): Clave codificada de la evaluación anterior (ver encode_key con keep_annulled).
+        new_key_np (np.ndarray): Clave corregida; ANNULLED_CODE anula la pregunta.
+        rule (dict): Diccionario con las reglas de puntuación (las mismas de la evaluación anterior).
+
+    Returns:
+        pd.DataFrame: Resultados recalificados, con las mismas columnas que df_results.
+    """
+    changed = np.flatnonzero(old_key_np != new_key_np).astype(np.int32)
+    if len(changed) == 0:
+        return df_results.copy()
+    results_arr = np.empty(len(df_results), dtype=RESULT_DTYPE)
+    for field in RESULT_FIELDS:
+        results_arr[field] = df_results[field].to_numpy()
+    rescore_questions = pyevalcore.rescore_questions if native_available() else rescore_questions_numpy
+    results_arr = rescore_questions(answers_np, results_arr, changed, old_key_np[changed], new_key_np[changed], _scoring_rule(rule))
 
-   df_results = pd.DataFrame(results_list)
-   if 'student_id' in df_answers.columns:
-       df_results.insert(0, 'student_id', df_answers['student_id'].values)
-   else:
-       df_results.insert(0, 'student_id', df_results.index)
-   return df_results
\ No newline at end of file
+    df_rescored = df_results.copy()
+    for field in RESULT_FIELDS:
+        df_rescored[field] = results_arr[field]
+    return df_rescored
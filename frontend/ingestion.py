@@ -0,0 +1,433 @@
+import io
+import os
+import pandas as pd
+import numpy as np
+from openpyxl import load_workbook
+from frontend.encoding import ANSWER_COLS, INVALID_CODE, encode_values, encode_answer_bytes
+
+# Número de filas que se leen y codifican por lote
+INGEST_BATCH_ROWS = 4096
+# Versión (tema) asignada a las filas de una clave o de un archivo de respuestas sin columna 'version'
+DEFAULT_KEY_VERSION = 'A'
+# Columnas opcionales de la clave con pesos por pregunta (correcta, incorrecta, en blanco)
+WEIGHT_COLS = ['weight_correct', 'weight_wrong', 'weight_blank']
+# Ancho del campo DNI en el texto de ancho fijo de las lectoras ópticas
+SCANNER_ID_WIDTH = 8
+
+def _cell_to_id(value) -> str:
+    """Convierte la celda del DNI en cadena, igual que pandas (enteros sin '.0')."""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def _versions_from_column(values) -> np.ndarray:
+    """Normaliza la columna 'version' de las respuestas; las celdas vacías reciben DEFAULT_KEY_VERSION."""
+    labels = [_cell_to_id(None if pd.isna(value) else value).strip() for value in values]
+    return np.array([label or DEFAULT_KEY_VERSION for label in labels], dtype=str)
+
+def read_responses_xlsx(source, batch_rows: int = INGEST_BATCH_ROWS):
+    """
+    Lee un archivo Excel de respuestas fila por fila (modo solo lectura) y codifica las respuestas
+    directamente en una matriz int8 preasignada, sin construir un DataFrame de cadenas.
+
+    Args:
+        source: Ruta o archivo binario (p. ej. el SpooledTemporaryFile de un UploadFile).
+        batch_rows (int): Número de filas procesadas por lote.
+
+    Returns:
+        tuple: (student_ids, answers, versions) donde student_ids es un arreglo de cadenas con el DNI,
+               answers es una matriz int8 (estudiantes x preguntas) con valores 0-3, -1 (blanco)
+               o INVALID_CODE (-2) para celdas fuera de dominio y versions es la versión (tema) de
+               cada estudiante, tomada de la columna opcional 'version' (DEFAULT_KEY_VERSION si falta).
+
+    Raises:
+        ValueError: Si faltan la columna 'DNI' o alguna columna de respuestas.
+    """
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+        header = [str(col).strip() if col is not None else '' for col in next(rows, ())]
+
+        if 'DNI' not in header:
+            raise ValueError("Columna 'DNI' no encontrada en el archivo de respuestas.")
+        missing_cols = [col for col in ANSWER_COLS if col not in header]
+        if missing_cols:
+            raise ValueError(f"Columnas de respuestas no encontradas: {missing_cols[:5]}")
+
+        id_idx = header.index('DNI')
+        version_idx = header.index('version') if 'version' in header else None
+        answer_idx = [header.index(col) for col in ANSWER_COLS]
+        width = len(header)
+
+        # Preasignar con el tamaño declarado en la hoja (puede faltar o ser inexacto)
+        capacity = max((sheet.max_row or 0) - 1, batch_rows)
+        answers = np.empty((capacity, len(ANSWER_COLS)), dtype=np.int8)
+        student_ids = []
+        versions = []
+        num_rows = 0
+
+        def flush(batch):
+            nonlocal answers, num_rows
+            cells = np.array([row + (None,) * (width - len(row)) for row in batch], dtype=object)
+            end = num_rows + len(batch)
+            if end > answers.shape[0]:
+                grown = np.empty((max(end, 2 * answers.shape[0]), answers.shape[1]), dtype=np.int8)
+                grown[:num_rows] = answers[:num_rows]
+                answers = grown
+            answers[num_rows:end] = encode_values(cells[:, answer_idx], invalid_code=INVALID_CODE)
+            student_ids.extend(_cell_to_id(value) for value in cells[:, id_idx])
+            if version_idx is not None:
+                versions.extend(_versions_from_column(cells[:, version_idx]))
+            num_rows = end
+
+        batch = []
+        for row in rows:
+            # Ignorar filas completamente vacías al final de la hoja
+            if all(value is None for value in row):
+                continue
+            batch.append(tuple(row[:width]))
+            if len(batch) == batch_rows:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+    finally:
+        workbook.close()
+
+    student_ids = np.array(student_ids, dtype=str)
+    # Igual que pd.read_excel: si todos los DNI son numéricos la columna se interpreta como entera
+    # (se pierden los ceros a la izquierda y esos DNI resultan inválidos en la validación)
+    if len(student_ids) and np.char.isdigit(student_ids).all():
+        student_ids = student_ids.astype(np.int64).astype(str)
+    versions = np.array(versions, dtype=str) if version_idx is not None else np.full(num_rows, DEFAULT_KEY_VERSION)
+    return student_ids, answers[:num_rows], versions
+
+def _answer_key_arrays(df: pd.DataFrame):
+    """
+    Codifica el DataFrame de una clave de respuestas en arreglos numéricos.
+    Una columna opcional 'version' permite incluir las claves de varios temas en el mismo archivo
+    y las columnas opcionales WEIGHT_COLS asignan pesos propios a cada pregunta.
+
+    Returns:
+        tuple: (versions, question_ids, answers, weights, labels) donde versions es un arreglo de cadenas,
+               question_ids es float64 (NaN si no es numérico), answers es int8 con valores
+               0-3, -1 (vacío) o INVALID_CODE, weights es una matriz float64 (filas x 3, en el
+               orden de WEIGHT_COLS) con NaN donde no se indicó peso y labels es el texto original
+               de 'correct_answer' (para los mensajes de validación).
+
+    Raises:
+        ValueError: Si faltan las columnas 'question_id' o 'correct_answer'.
+    """
+    if 'question_id' not in df.columns or 'correct_answer' not in df.columns:
+        raise ValueError("Faltan columnas 'question_id' o 'correct_answer' en la clave de respuestas.")
+    if 'version' in df.columns:
+        versions = df['version'].fillna(DEFAULT_KEY_VERSION).astype(str).str.strip().to_numpy(dtype=str)
+    else:
+        versions = np.full(len(df), DEFAULT_KEY_VERSION)
+    question_ids = pd.to_numeric(df['question_id'], errors='coerce').to_numpy(dtype=np.float64)
+    answers = encode_values(df['correct_answer'].to_numpy(dtype=object), invalid_code=INVALID_CODE)
+    weights = np.full((len(df), len(WEIGHT_COLS)), np.nan)
+    for i, col in enumerate(WEIGHT_COLS):
+        if col in df.columns:
+            weights[:, i] = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64)
+    labels = df['correct_answer'].fillna('').astype(str).str.strip().to_numpy(dtype=str)
+    return versions, question_ids, answers, weights, labels
+
+def read_answer_key_xlsx(source):
+    """
+    Lee la clave de respuestas de un archivo Excel y la codifica en arreglos numéricos.
+
+    Args:
+        source: Ruta o archivo binario.
+
+    Returns:
+        tuple: (versions, question_ids, answers, weights, labels), ver _answer_key_arrays.
+    """
+    return _answer_key_arrays(pd.read_excel(source))
+
+def _ids_from_column(values) -> np.ndarray:
+    """Convierte una columna de DNI (enteros, cadenas o nulos) en un arreglo de cadenas."""
+    values = np.asarray(values)
+    if values.dtype.kind in 'iu':
+        return values.astype(str)
+    return np.array([_cell_to_id(None if pd.isna(value) else value) for value in values], dtype=str)
+
+def _concat_batches(id_batches: list, answer_batches: list, version_batches: list):
+    """Une los lotes de DNI, respuestas codificadas y versiones leídos por un lector incremental."""
+    if not answer_batches:
+        return np.array([], dtype=str), np.empty((0, len(ANSWER_COLS)), dtype=np.int8), np.array([], dtype=str)
+    return np.concatenate(id_batches), np.concatenate(answer_batches), np.concatenate(version_batches)
+
+def _chunk_versions(chunk: pd.DataFrame) -> np.ndarray:
+    """Versiones de un lote; DEFAULT_KEY_VERSION si el archivo no tiene columna 'version'."""
+    if 'version' in chunk.columns:
+        return _versions_from_column(chunk['version'].to_numpy(dtype=object))
+    return np.full(len(chunk), DEFAULT_KEY_VERSION)
+
+def read_responses_csv(source, batch_rows: int = INGEST_BATCH_ROWS):
+    """
+    Lee un archivo CSV de respuestas por lotes y codifica cada lote directamente a int8.
+    Los DNI se conservan tal como aparecen en el texto (incluidos los ceros a la izquierda).
+
+    Args:
+        source: Ruta o archivo binario.
+        batch_rows (int): Número de filas por lote.
+
+    Returns:
+        tuple: (student_ids, answers, versions), igual que read_responses_xlsx.
+
+    Raises:
+        ValueError: Si faltan la columna 'DNI' o alguna columna de respuestas.
+    """
+    header = pd.read_csv(source, nrows=0).columns
+    if not isinstance(source, (str, os.PathLike)):
+        source.seek(0)
+    columns = ['DNI'] + ANSWER_COLS + (['version'] if 'version' in header else [])
+
+    id_batches, answer_batches, version_batches = [], [], []
+    reader = pd.read_csv(source, usecols=columns, dtype=str, keep_default_na=False, chunksize=batch_rows)
+    for chunk in reader:
+        id_batches.append(chunk['DNI'].str.strip().to_numpy(dtype=str))
+        answer_batches.append(encode_values(chunk[ANSWER_COLS].to_numpy(dtype=object), invalid_code=INVALID_CODE))
+        version_batches.append(_chunk_versions(chunk))
+    return _concat_batches(id_batches, answer_batches, version_batches)
+
+def _arrow_batches(source, columns: list, batch_rows: int, optional_columns: tuple = ()):
+    """Itera lotes (como DataFrame) de un archivo Parquet o Arrow IPC/Feather; optional_columns se leen si existen."""
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ValueError("Se requiere el paquete 'pyarrow' para leer archivos Parquet/Arrow.") from e
+
+    if isinstance(source, (str, os.PathLike)):
+        source = pa.memory_map(str(source))
+    magic = source.read(4)
+    source.seek(0)
+
+    if magic == b'PAR1':
+        parquet_file = pq.ParquetFile(source)
+        names = parquet_file.schema_arrow.names
+        missing_cols = [col for col in columns if col not in names]
+        if missing_cols:
+            raise ValueError(f"Columnas no encontradas: {missing_cols[:5]}")
+        columns = columns + [col for col in optional_columns if col in names]
+        for batch in parquet_file.iter_batches(batch_size=batch_rows, columns=columns):
+            yield batch.to_pandas()
+    else:
+        reader = pa.ipc.open_file(source)
+        names = reader.schema.names
+        missing_cols = [col for col in columns if col not in names]
+        if missing_cols:
+            raise ValueError(f"Columnas no encontradas: {missing_cols[:5]}")
+        columns = columns + [col for col in optional_columns if col in names]
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i).select(columns).to_pandas()
+
+def read_responses_arrow(source, batch_rows: int = INGEST_BATCH_ROWS):
+    """
+    Lee un archivo Parquet o Arrow IPC/Feather de respuestas por lotes de registros.
+
+    Args:
+        source: Ruta o archivo binario.
+        batch_rows (int): Número de filas por lote (solo Parquet; Arrow IPC usa sus propios lotes).
+
+    Returns:
+        tuple: (student_ids, answers, versions), igual que read_responses_xlsx.
+    """
+    id_batches, answer_batches, version_batches = [], [], []
+    for chunk in _arrow_batches(source, ['DNI'] + ANSWER_COLS, batch_rows, optional_columns=('version',)):
+        id_batches.append(_ids_from_column(chunk['DNI'].to_numpy()))
+        answer_batches.append(encode_values(chunk[ANSWER_COLS].to_numpy(dtype=object), invalid_code=INVALID_CODE))
+        version_batches.append(_chunk_versions(chunk))
+    return _concat_batches(id_batches, answer_batches, version_batches)
+
+def read_responses_fixed_width(source, id_width: int = SCANNER_ID_WIDTH, num_questions: int = len(ANSWER_COLS)):
+    """
+    Lee el texto de ancho fijo de una lectora óptica: por línea, el DNI (id_width caracteres)
+    seguido de un carácter por pregunta (A-D, espacio para blanco, otro carácter para marca inválida).
+
+    El archivo se mapea en memoria y se reinterpreta como una matriz de bytes (registros x ancho de
+    línea), de modo que las respuestas se codifican con la tabla de búsqueda nativa sin parsear líneas.
+
+    Args:
+        source: Ruta o archivo binario.
+        id_width (int): Ancho del campo DNI.
+        num_questions (int): Número de caracteres de respuesta por línea.
+
+    Returns:
+        tuple: (student_ids, answers, versions), igual que read_responses_xlsx.
+
+    Raises:
+        ValueError: Si el archivo está vacío o las líneas no tienen un ancho constante.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        data = np.memmap(source, dtype=np.uint8, mode='r')
+    else:
+        source.seek(0)
+        try:
+            data = np.memmap(source, dtype=np.uint8, mode='r')
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            # Archivos en memoria (BytesIO) no tienen descriptor que mapear
+            data = np.frombuffer(source.read(), dtype=np.uint8)
+    if len(data) == 0:
+        raise ValueError("El archivo de ancho fijo está vacío.")
+
+    record_width = id_width + num_questions
+    first_newline = np.flatnonzero(data[:record_width + 2] == ord('\n'))
+    if len(first_newline) == 0:
+        # Archivo de una sola línea sin salto final
+        line_width, eol_width = len(data), 0
+    else:
+        line_width = int(first_newline[0]) + 1
+        eol_width = 2 if line_width >= 2 and data[line_width - 2] == ord('\r') else 1
+    if line_width - eol_width != record_width:
+        raise ValueError(f"Ancho de línea inválido: se esperaban {record_width} caracteres por registro y se encontraron {line_width - eol_width}.")
+
+    num_full = len(data) // line_width
+    remainder = len(data) - num_full * line_width
+    records = data[:num_full * line_width].reshape(num_full, line_width)[:, :record_width]
+    if remainder:
+        # Última línea sin salto de línea final
+        if remainder != record_width:
+            raise ValueError("La última línea del archivo tiene un ancho inválido.")
+        records = np.concatenate([records, data[num_full * line_width:].reshape(1, record_width)])
+
+    ids = np.ascontiguousarray(records[:, :id_width]).view(f'S{id_width}').ravel()
+    student_ids = np.char.strip(ids.astype(str))
+    answers = encode_answer_bytes(np.ascontiguousarray(records[:, id_width:]), invalid_code=INVALID_CODE)
+    # El formato de la lectora no incluye el tema: todos los estudiantes reciben la versión por defecto
+    return student_ids, answers, np.full(len(student_ids), DEFAULT_KEY_VERSION)
+
+# Lectores de respuestas y de claves según la extensión del archivo
+RESPONSE_READERS = {
+    '.xlsx': read_responses_xlsx,
+    '.csv': read_responses_csv,
+    '.parquet': read_responses_arrow,
+    '.arrow': read_responses_arrow,
+    '.feather': read_responses_arrow,
+    '.txt': read_responses_fixed_width,
+    '.dat': read_responses_fixed_width,
+}
+
+ANSWER_KEY_READERS = {
+    '.xlsx': read_answer_key_xlsx,
+    '.csv': lambda source: _answer_key_arrays(pd.read_csv(source)),
+    '.parquet': lambda source: _answer_key_arrays(pd.read_parquet(source)),
+    '.arrow': lambda source: _answer_key_arrays(pd.read_feather(source)),
+    '.feather': lambda source: _answer_key_arrays(pd.read_feather(source)),
+}
+
+def _reader_for(readers: dict, filename: str):
+    extension = os.path.splitext(str(filename or ''))[1].lower()
+    if extension not in readers:
+        raise ValueError(f"Formato de archivo no soportado: '{extension}'. Formatos válidos: {', '.join(sorted(readers))}")
+    return readers[extension]
+
+def read_responses(source, filename: str):
+    """
+    Lee un archivo de respuestas eligiendo el lector según la extensión de filename.
+
+    Args:
+        source: Ruta o archivo binario.
+        filename (str): Nombre del archivo original (determina el formato).
+
+    Returns:
+        tuple: (student_ids, answers, versions), igual que read_responses_xlsx.
+    """
+    return _reader_for(RESPONSE_READERS, filename)(source)
+
+def read_response_cells(source, filename: str, cells: list) -> dict:
+    """
+    Relee el contenido original de algunas celdas de respuesta (p. ej. las inválidas, para los
+    mensajes de validación), ya que la matriz int8 solo conserva INVALID_CODE.
+
+    Args:
+        source: Ruta del archivo de respuestas.
+        filename (str): Nombre del archivo original (determina el formato).
+        cells (list): Pares (fila, índice de columna en ANSWER_COLS), con filas numeradas como en read_responses.
+
+    Returns:
+        dict: (fila, columna) -> valor original de la celda.
+    """
+    wanted = {}
+    for row, col in cells:
+        wanted.setdefault(int(row), []).append(int(col))
+    if not wanted:
+        return {}
+    extension = os.path.splitext(str(filename or ''))[1].lower()
+    values = {}
+
+    if extension in ('.txt', '.dat'):
+        with open(source, 'rb') as f:
+            for row, line in enumerate(f):
+                if row in wanted:
+                    for col in wanted[row]:
+                        values[(row, col)] = chr(line[SCANNER_ID_WIDTH + col])
+        return values
+
+    if extension == '.xlsx':
+        workbook = load_workbook(source, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = [str(col).strip() if col is not None else '' for col in next(rows, ())]
+            row_number = 0
+            # Mismo criterio que read_responses_xlsx: las filas completamente vacías no se numeran
+            for row in rows:
+                if all(value is None for value in row):
+                    continue
+                for col in wanted.get(row_number, []):
+                    index = header.index(ANSWER_COLS[col])
+                    values[(row_number, col)] = row[index] if index < len(row) else None
+                row_number += 1
+        finally:
+            workbook.close()
+        return values
+
+    columns = sorted({ANSWER_COLS[col] for cols in wanted.values() for col in cols})
+    if extension == '.csv':
+        chunks = pd.read_csv(source, usecols=columns, dtype=str, keep_default_na=False, chunksize=INGEST_BATCH_ROWS)
+    else:
+        chunks = _arrow_batches(source, columns, INGEST_BATCH_ROWS)
+    offset = 0
+    for chunk in chunks:
+        for row in range(offset, offset + len(chunk)):
+            for col in wanted.get(row, []):
+                values[(row, col)] = chunk[ANSWER_COLS[col]].iloc[row - offset]
+        offset += len(chunk)
+    return values
+
+def read_answer_key(source, filename: str):
+    """
+    Lee un archivo de clave de respuestas eligiendo el lector según la extensión de filename.
+
+    Args:
+        source: Ruta o archivo binario.
+        filename (str): Nombre del archivo original (determina el formato).
+
+    Returns:
+        tuple: (versions, question_ids, answers, weights, labels), ver _answer_key_arrays.
+    """
+    return _reader_for(ANSWER_KEY_READERS, filename)(source)
+
+def responses_frame(student_ids: np.ndarray, answers: np.ndarray, versions: np.ndarray = None) -> pd.DataFrame:
+    """
+    Envuelve la matriz codificada en un DataFrame compacto (un único bloque int8) con 'student_id'.
+
+    Args:
+        student_ids (np.ndarray): Arreglo con el DNI de cada estudiante.
+        answers (np.ndarray): Matriz int8 (estudiantes x preguntas).
+        versions (np.ndarray, optional): Versión (tema) de cada estudiante.
+
+    Returns:
+        pd.DataFrame: DataFrame con 'student_id', 'version' (si se indica) y las columnas 'answer_1' a 'answer_100'.
+    """
+    df = pd.DataFrame(answers, columns=ANSWER_COLS, copy=False)
+    df.insert(0, 'student_id', student_ids)
+    if versions is not None:
+        df.insert(1, 'version', versions)
+    return df
@@ -0,0 +1,120 @@
+import uuid
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from frontend.config_utils import load_scoring_config
+
+# Evaluaciones simultáneas por defecto: una, para que los trabajos no compitan por los núcleos; con varios
+# datasets (áreas) en el registro, 'job_workers' > 1 permite calificarlos a la vez
+DEFAULT_JOB_WORKERS = 1
+# Trabajos terminados que se conservan (con su resultado) antes de descartar los más antiguos
+JOB_HISTORY_MAX = 20
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec='seconds')
+
+class JobQueue:
+    """
+    Cola de trabajos en segundo plano sobre un pool acotado de hilos.
+
+    submit devuelve un identificador de inmediato; el estado, el progreso y el resultado se consultan
+    después con get y result. Solo se conservan los JOB_HISTORY_MAX trabajos terminados más recientes.
+    """
+
+    def __init__(self, max_workers: int = None, max_history: int = JOB_HISTORY_MAX):
+        if max_workers is None:
+            max_workers = int(load_scoring_config().get('job_workers', DEFAULT_JOB_WORKERS))
+        self.executor = ThreadPoolExecutor(max_workers=max(max_workers, 1), thread_name_prefix='job')
+        self.max_history = max_history
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, fn, *args, **kwargs) -> str:
+        """
+        Encola fn(*args, progress=callback, **kwargs). callback(completed, total, stage=None) actualiza el
+        progreso del trabajo; el valor devuelto por fn queda como resultado y una excepción lo marca fallido.
+
+        Args:
+            kind (str): Tipo de trabajo ('run', ...), informativo.
+            fn (callable): Función a ejecutar en el pool.
+
+        Returns:
+            str: Identificador del trabajo.
+        """
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._jobs[job_id] = {
+                "job_id": job_id,
+                "kind": kind,
+                "status": JOB_QUEUED,
+                "stage": None,
+                "progress": {"completed": 0, "total": 0},
+                "error": None,
+                "created_at": _now(),
+                "started_at": None,
+                "finished_at": None,
+                "result": None,
+            }
+        self.executor.submit(self._run, job_id, fn, args, kwargs)
+        return job_id
+
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def _run(self, job_id: str, fn, args, kwargs):
+        self._update(job_id, status=JOB_RUNNING, started_at=_now())
+
+        def progress(completed: int, total: int, stage: str = None):
+            fields = {"progress": {"completed": int(completed), "total": int(total)}}
+            if stage is not None:
+                fields["stage"] = stage
+            self._update(job_id, **fields)
+
+        try:
+            result = fn(*args, progress=progress, **kwargs)
+            self._finish(job_id, status=JOB_DONE, result=result)
+        except Exception as e:
+            self._finish(job_id, status=JOB_FAILED, error=str(e))
+
+    def _finish(self, job_id: str, **fields):
+        """Registra el final de un trabajo y descarta los terminados más antiguos por encima de max_history."""
+        with self._lock:
+            self._jobs[job_id].update(fields, finished_at=_now())
+            finished = [other for other, job in self._jobs.items() if job["status"] in (JOB_DONE, JOB_FAILED)]
+            for other in finished[:max(len(finished) - self.max_history, 0)]:
+                del self._jobs[other]
+
+    def get(self, job_id: str):
+        """
+        Devuelve una copia del estado de un trabajo (sin el resultado) o None si no existe.
+
+        Args:
+            job_id (str): Identificador devuelto por submit.
+
+        Returns:
+            dict | None: 'job_id', 'kind', 'status', 'stage', 'progress', 'error' y las marcas de tiempo.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = {field: value for field, value in job.items() if field != 'result'}
+            snapshot["progress"] = dict(job["progress"])
+            return snapshot
+
+    def result(self, job_id: str):
+        """Resultado de un trabajo terminado, o None si no existe o aún no termina."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job["result"] if job is not None and job["status"] == JOB_DONE else None
+
+# Instancia compartida por /run y /jobs
+job_queue = JobQueue()
+# Los benchmarks usan su propio hilo: nunca quedan en la cola delante de una evaluación
+benchmark_queue = JobQueue(max_workers=1)
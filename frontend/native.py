@@ -0,0 +1,45 @@
+import importlib
+
+# Módulo nativo (extensión pybind11). Se importa en el primer uso: sin él la aplicación sigue funcionando
+# con el backend NumPy y solo fallan los modos que lo requieren.
+NATIVE_MODULE_NAME = "pyevalcore"
+
+_native_module = None
+_native_import_error = None
+
+def load_native():
+    """
+    Importa pyevalcore una sola vez.
+
+    Returns:
+        module | None: El módulo nativo, o None si no está compilado/instalado para esta plataforma.
+    """
+    global _native_module, _native_import_error
+    if _native_module is None and _native_import_error is None:
+        try:
+            _native_module = importlib.import_module(NATIVE_MODULE_NAME)
+        except ImportError as e:
+            _native_import_error = e
+    return _native_module
+
+def native_available() -> bool:
+    """Indica si la extensión pyevalcore puede usarse en esta máquina."""
+    return load_native() is not None
+
+def require_native():
+    """
+    Devuelve pyevalcore o lanza RuntimeError con un mensaje claro si no está disponible.
+    """
+    module = load_native()
+    if module is None:
+        raise RuntimeError(f"Este modo requiere la extensión nativa {NATIVE_MODULE_NAME}, que no está disponible "
+                           f"({_native_import_error}). Use el modo 'numpy' o compile backend/bindings/py.")
+    return module
+
+class _LazyNative:
+    """Accede a los atributos de pyevalcore importándolo recién en el primer uso."""
+
+    def __getattr__(self, name):
+        return getattr(require_native(), name)
+
+pyevalcore = _LazyNative()
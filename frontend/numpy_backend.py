@@ -0,0 +1,299 @@
+import numpy as np
+from frontend.encoding import ANNULLED_CODE
+
+# Mismo diseño que el arreglo estructurado que devuelve pyevalcore (exam::Result)
+RESULT_DTYPE = np.dtype({'names': ['score', 'correct', 'wrong', 'blank'],
+                         'formats': ['<f8', '<u4', '<u4', '<u4'],
+                         'offsets': [0, 8, 12, 16],
+                         'itemsize': 24})
+# Filas por bloque: acota las matrices booleanas temporales (filas x preguntas) a unos pocos MB
+NUMPY_BLOCK_ROWS = 65536
+
+def evaluate_numpy(answers_np: np.ndarray, key_np: np.ndarray, rule) -> np.ndarray:
+    """
+    Evalúa la matriz int8 con comparaciones vectorizadas (difusión de la clave) y reducciones por fila.
+    Sigue el mismo contrato que los kernels nativos: -1 es blanco, coincidir con la clave es correcta,
+    cualquier otro valor 0-3 es incorrecta y los códigos fuera de dominio no cuentan.
+
+    Args:
+        answers_np (np.ndarray): Matriz int8 (estudiantes x preguntas).
+        key_np (np.ndarray): Clave int8 (una entrada por pregunta).
+        rule: Regla de puntuación con atributos 'correct' y 'wrong' (el blanco no suma, como en los kernels nativos).
+
+    Returns:
+        np.ndarray: Arreglo estructurado con campos 'score', 'correct', 'wrong' y 'blank'.
+    """
+    answers_np = np.asarray(answers_np, dtype=np.int8)
+    key_np = np.asarray(key_np, dtype=np.int8)
+    if answers_np.ndim != 2 or key_np.ndim != 1 or answers_np.shape[1] != key_np.shape[0]:
+        raise ValueError("Number of questions in answers_arr must match length of key_arr")
+
+    results = np.empty(answers_np.shape[0], dtype=RESULT_DTYPE)
+    for start in range(0, answers_np.shape[0], NUMPY_BLOCK_ROWS):
+        block = answers_np[start:start + NUMPY_BLOCK_ROWS]
+        _store_counts(results[start:start + NUMPY_BLOCK_ROWS], *_outcomes(block, key_np), rule)
+    return results
+
+def _outcomes(block: np.ndarray, key: np.ndarray):
+    """
+    Clasifica cada respuesta del bloque con las mismas comprobaciones que evaluate_serial.
+
+    Args:
+        block (np.ndarray): Bloque int8 (estudiantes x preguntas).
+        key (np.ndarray): Clave int8 por pregunta, o una fila de clave por estudiante (misma forma que block).
+
+    Returns:
+        tuple: Matrices booleanas (correcta, incorrecta, blanco); los códigos fuera de dominio no marcan ninguna.
+    """
+    is_blank = block == -1
+    is_match = (block == key) & ~is_blank
+    # Rango 0-3 sin signo: los códigos negativos quedan por encima de 3
+    in_range = block.view(np.uint8) <= 3
+    return is_match, in_range & ~is_match, is_blank
+
+def _store_counts(out: np.ndarray, is_match: np.ndarray, is_wrong: np.ndarray, is_blank: np.ndarray, rule):
+    """Escribe los conteos por fila y el puntaje con la misma fórmula que rule_score en los kernels nativos."""
+    correct = np.count_nonzero(is_match, axis=1)
+    wrong = np.count_nonzero(is_wrong, axis=1)
+    out['correct'] = correct
+    out['wrong'] = wrong
+    out['blank'] = np.count_nonzero(is_blank, axis=1)
+    out['score'] = correct * rule.correct + wrong * rule.wrong
+
+def evaluate_versions_numpy(answers_np: np.ndarray, keys: np.ndarray, version_index: np.ndarray, rule) -> np.ndarray:
+    """
+    Evalúa estudiantes de varias versiones del examen, con el mismo contrato que pyevalcore.run_versions_array.
+
+    Args:
+        answers_np (np.ndarray): Matriz int8 (estudiantes x preguntas).
+        keys (np.ndarray): Matriz de claves int8 (versiones x preguntas).
+        version_index (np.ndarray): Fila de keys que corresponde a cada estudiante.
+        rule: Regla de puntuación con atributos 'correct' y 'wrong'.
+
+    Returns:
+        np.ndarray: Arreglo estructurado con campos 'score', 'correct', 'wrong' y 'blank'.
+    """
+    answers_np = np.asarray(answers_np, dtype=np.int8)
+    keys = np.asarray(keys, dtype=np.int8)
+    version_index = np.asarray(version_index)
+    if answers_np.ndim != 2 or keys.ndim != 2 or answers_np.shape[1] != keys.shape[1]:
+        raise ValueError("Number of questions in answers_arr must match the columns of keys_arr")
+    if len(version_index) != answers_np.shape[0]:
+        raise ValueError("version_index must have one entry per student")
+
+    results = np.empty(answers_np.shape[0], dtype=RESULT_DTYPE)
+    for start in range(0, answers_np.shape[0], NUMPY_BLOCK_ROWS):
+        block = answers_np[start:start + NUMPY_BLOCK_ROWS]
+        # Una fila de clave por estudiante del bloque (la de su versión)
+        block_keys = keys[version_index[start:start + NUMPY_BLOCK_ROWS]]
+        _store_counts(results[start:start + NUMPY_BLOCK_ROWS], *_outcomes(block, block_keys), rule)
+    return results
+
+def evaluate_weighted_numpy(answers_np: np.ndarray, key_np: np.ndarray, correct_weights: np.ndarray, wrong_weights: np.ndarray, blank_weights: np.ndarray) -> np.ndarray:
+    """
+    Evalúa con pesos por pregunta, con el mismo contrato que pyevalcore.run_weighted_*_array
+    (el peso de blanco sí se suma al puntaje).
+
+    Args:
+        answers_np (np.ndarray): Matriz int8 (estudiantes x preguntas).
+        key_np (np.ndarray): Clave int8 (una entrada por pregunta).
+        correct_weights (np.ndarray): Puntos por respuesta correcta de cada pregunta.
+        wrong_weights (np.ndarray): Puntos por respuesta incorrecta de cada pregunta.
+        blank_weights (np.ndarray): Puntos por pregunta en blanco.
+
+    Returns:
+        np.ndarray: Arreglo estructurado con campos 'score', 'correct', 'wrong' y 'blank'.
+    """
+    answers_np = np.asarray(answers_np, dtype=np.int8)
+    key_np = np.asarray(key_np, dtype=np.int8)
+    if answers_np.ndim != 2 or key_np.ndim != 1 or answers_np.shape[1] != key_np.shape[0]:
+        raise ValueError("Number of questions in answers_arr must match length of key_arr")
+
+    results = np.empty(answers_np.shape[0], dtype=RESULT_DTYPE)
+    for start in range(0, answers_np.shape[0], NUMPY_BLOCK_ROWS):
+        is_match, is_wrong, is_blank = _outcomes(answers_np[start:start + NUMPY_BLOCK_ROWS], key_np)
+        out = results[start:start + NUMPY_BLOCK_ROWS]
+        out['correct'] = np.count_nonzero(is_match, axis=1)
+        out['wrong'] = np.count_nonzero(is_wrong, axis=1)
+        out['blank'] = np.count_nonzero(is_blank, axis=1)
+        out['score'] = is_match @ correct_weights + is_wrong @ wrong_weights + is_blank @ blank_weights
+    return results
+
+def evaluate_sections_numpy(answers_np: np.ndarray, key_np: np.ndarray, section_index: np.ndarray, num_sections: int, rule):
+    """
+    Evalúa y calcula los subpuntajes por sección, con el mismo contrato que pyevalcore.run_sections_array.
+
+    Args:
+        answers_np (np.ndarray): Matriz int8 (estudiantes x preguntas).
+        key_np (np.ndarray): Clave int8 (una entrada por pregunta).
+        section_index (np.ndarray): Sección de cada pregunta (negativa si no tiene).
+        num_sections (int): Número de secciones.
+        rule: Regla de puntuación con atributos 'correct' y 'wrong'.
+
+    Returns:
+        tuple: (resultados, subpuntajes) con el arreglo estructurado y la matriz float64 estudiantes x secciones.
+    """
+    answers_np = np.asarray(answers_np, dtype=np.int8)
+    key_np = np.asarray(key_np, dtype=np.int8)
+    section_index = np.asarray(section_index)
+    if answers_np.ndim != 2 or key_np.ndim != 1 or answers_np.shape[1] != key_np.shape[0]:
+        raise ValueError("Number of questions in answers_arr must match length of key_arr")
+    if len(section_index) != key_np.shape[0]:
+        raise ValueError("sections must have one entry per question")
+
+    # Pertenencia pregunta x sección: el subpuntaje es el producto de los puntos por pregunta con esta matriz
+    membership = (section_index[:, None] == np.arange(num_sections)).astype(np.float64)
+    results = np.empty(answers_np.shape[0], dtype=RESULT_DTYPE)
+    subscores = np.empty((answers_np.shape[0], num_sections), dtype=np.float64)
+    for start in range(0, answers_np.shape[0], NUMPY_BLOCK_ROWS):
+        is_match, is_wrong, is_blank = _outcomes(answers_np[start:start + NUMPY_BLOCK_ROWS], key_np)
+        _store_counts(results[start:start + NUMPY_BLOCK_ROWS], is_match, is_wrong, is_blank, rule)
+        points = is_match * rule.correct + is_wrong * rule.wrong
+        subscores[start:start + NUMPY_BLOCK_ROWS] = points @ membership
+    return results, subscores
+
+def combine_sections_numpy(subscores: np.ndarray, coefficients: np.ndarray) -> np.ndarray:
+    """Combina subpuntajes (estudiantes x secciones) con coeficientes (carreras x secciones), como pyevalcore.combine_sections."""
+    subscores = np.asarray(subscores, dtype=np.float64)
+    coefficients = np.asarray(coefficients, dtype=np.float64)
+    if subscores.ndim != 2 or coefficients.ndim != 2 or subscores.shape[1] != coefficients.shape[1]:
+        raise ValueError("coefficients must have one column per section")
+    return subscores @ coefficients.T
+
+def rescore_questions_numpy(answers_np: np.ndarray, results: np.ndarray, questions: np.ndarray, old_key: np.ndarray, new_key: np.ndarray, rule) -> np.ndarray:
+    """
+    Recalifica resultados aplicando solo la diferencia de las preguntas cambiadas, con el mismo contrato
+    que pyevalcore.rescore_questions (ANNULLED_CODE anula la pregunta).
+
+    Args:
+        answers_np (np.ndarray): Matriz int8 (estudiantes x preguntas) con la que se evaluó.
+        results (np.ndarray): Resultados previos (RESULT_DTYPE).
+        questions (np.ndarray): Índices de las preguntas cambiadas.
+        old_key (np.ndarray): Clave anterior de esas preguntas.
+        new_key (np.ndarray): Clave nueva de esas preguntas.
+        rule: Regla de puntuación con atributos 'correct' y 'wrong'.
+
+    Returns:
+        np.ndarray: Nuevo arreglo estructurado con los resultados recalificados.
+    """
+    columns = np.ascontiguousarray(np.asarray(answers_np, dtype=np.int8)[:, questions])
+    counts = {field: results[field].astype(np.int64) for field in ('correct', 'wrong', 'blank')}
+    for key, sign in ((np.asarray(old_key, dtype=np.int8), -1), (np.asarray(new_key, dtype=np.int8), 1)):
+        # Una pregunta anulada no cuenta en ninguna categoría
+        counted = key != ANNULLED_CODE
+        for field, outcome in zip(('correct', 'wrong', 'blank'), _outcomes(columns, key)):
+            counts[field] += sign * np.count_nonzero(outcome & counted, axis=1)
+
+    rescored = np.empty(len(results), dtype=RESULT_DTYPE)
+    for field, values in counts.items():
+        rescored[field] = values
+    # Puntaje recalculado desde los conteos, como en una evaluación completa con la clave nueva
+    rescored['score'] = rescored['correct'] * rule.correct + rescored['wrong'] * rule.wrong
+    return rescored
+
+def _merit_order(scores: np.ndarray, tiebreak: np.ndarray) -> np.ndarray:
+    """Orden de mérito de rank_scores: mayor puntaje, luego mayor desempate y, a igualdad, menor índice (lexsort es estable)."""
+    return np.lexsort((-tiebreak, -scores)).astype(np.int32)
+
+def rank_scores_numpy(scores: np.ndarray, tiebreak: np.ndarray = None, method: str = 'competition'):
+    """
+    Orden de mérito y rangos, con el mismo contrato que pyevalcore.rank_scores.
+
+    Args:
+        scores (np.ndarray): Puntaje de cada estudiante.
+        tiebreak (np.ndarray, optional): Desempate (mayor primero); None para no desempatar.
+        method (str): 'competition' (1, 2, 2, 4) o 'dense' (1, 2, 2, 3).
+
+    Returns:
+        tuple: (order, ranks) con los índices en orden de mérito y el rango de cada estudiante.
+    """
+    if method not in ('competition', 'dense'):
+        raise ValueError("method must be 'competition' or 'dense'")
+    scores = np.asarray(scores, dtype=np.float64)
+    tiebreak = np.zeros_like(scores) if tiebreak is None else np.asarray(tiebreak, dtype=np.float64)
+    order = _merit_order(scores, tiebreak)
+
+    sorted_scores, sorted_tiebreak = scores[order], tiebreak[order]
+    new_group = np.ones(len(order), dtype=bool)
+    new_group[1:] = (sorted_scores[1:] != sorted_scores[:-1]) | (sorted_tiebreak[1:] != sorted_tiebreak[:-1])
+    if method == 'dense':
+        position_ranks = np.cumsum(new_group)
+    else:
+        # Competición: cada grupo de empatados toma la posición (1-based) de su primer integrante
+        position_ranks = np.maximum.accumulate(np.where(new_group, np.arange(1, len(order) + 1), 0))
+    ranks = np.empty(len(order), dtype=np.uint32)
+    ranks[order] = position_ranks
+    return order, ranks
+
+def select_top_k_numpy(scores: np.ndarray, vacancies: np.ndarray, tiebreak: np.ndarray = None, applicant_column: np.ndarray = None, include_ties: bool = True) -> list:
+    """
+    Mejores vacancies[c] estudiantes por columna de puntaje, con el mismo contrato que pyevalcore.select_top_k.
+    Ordena a todos los postulantes de cada columna en lugar de hacer una selección parcial.
+
+    Args:
+        scores (np.ndarray): Puntajes (estudiantes) o (estudiantes x carreras).
+        vacancies (np.ndarray): Vacantes por columna.
+        tiebreak (np.ndarray, optional): Desempate (mayor primero); None para no desempatar.
+        applicant_column (np.ndarray, optional): Columna a la que postula cada estudiante (negativa si a ninguna).
+        include_ties (bool): Admitir a los empatados con el último admitido.
+
+    Returns:
+        list: Un arreglo int32 por columna con los índices admitidos en orden de mérito.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    if scores.ndim == 1:
+        scores = scores[:, None]
+    if len(vacancies) != scores.shape[1]:
+        raise ValueError("vacancies must have one entry per score column")
+    tiebreak = np.zeros(scores.shape[0]) if tiebreak is None else np.asarray(tiebreak, dtype=np.float64)
+
+    selected = []
+    for c, vacancies_c in enumerate(vacancies):
+        pool = np.arange(scores.shape[0], dtype=np.int32)
+        if applicant_column is not None:
+            pool = pool[np.asarray(applicant_column) == c]
+        ranked = pool[_merit_order(scores[pool, c], tiebreak[pool])]
+        k = min(int(vacancies_c), len(ranked))
+        if k and include_ties:
+            # Empate en la última vacante: ingresan todos los que igualan al último admitido
+            cutoff = ranked[k - 1]
+            tied = (scores[ranked[k:], c] == scores[cutoff, c]) & (tiebreak[ranked[k:]] == tiebreak[cutoff])
+            k += int(np.argmin(tied)) if not tied.all() else len(tied)
+        selected.append(ranked[:k])
+    return selected
+
+def item_analysis_numpy(answers_np: np.ndarray, key_np: np.ndarray, scores: np.ndarray, group_fraction: float = 0.27) -> dict:
+    """
+    Análisis de ítems con operaciones vectorizadas, con el mismo contrato que pyevalcore.item_analysis.
+
+    Args:
+        answers_np (np.ndarray): Matriz int8 (estudiantes x preguntas).
+        key_np (np.ndarray): Clave int8 (una entrada por pregunta).
+        scores (np.ndarray): Puntaje total de cada estudiante, usado para formar los grupos.
+        group_fraction (float): Fracción de estudiantes de los grupos superior e inferior.
+
+    Returns:
+        dict: 'option_counts' (preguntas x 5: A, B, C, D, blanco), 'difficulty' y 'discrimination'.
+    """
+    answers_np = np.asarray(answers_np, dtype=np.int8)
+    key_np = np.asarray(key_np, dtype=np.int8)
+    scores = np.asarray(scores, dtype=np.float64)
+    num_students, num_questions = answers_np.shape
+    group_size = int(group_fraction * num_students)
+
+    option_counts = np.zeros((num_questions, 5), dtype=np.uint64)
+    for code in range(4):
+        option_counts[:, code] = np.count_nonzero(answers_np == code, axis=0)
+    option_counts[:, 4] = np.count_nonzero(answers_np == -1, axis=0)
+    is_correct = answers_np == key_np
+    correct = np.count_nonzero(is_correct, axis=0)
+
+    valid_key = (key_np >= 0) & (key_np <= 3)
+    difficulty = np.where(valid_key, correct / num_students, 0.0) if num_students else np.zeros(num_questions)
+    discrimination = np.zeros(num_questions)
+    if group_size > 0:
+        order = np.argsort(scores, kind='stable')
+        upper = np.count_nonzero(is_correct[order[-group_size:]], axis=0)
+        lower = np.count_nonzero(is_correct[order[:group_size]], axis=0)
+        discrimination = np.where(valid_key, (upper - lower) / group_size, 0.0)
+    return {"option_counts": option_counts, "difficulty": difficulty, "discrimination": discrimination}
@@ -0,0 +1,141 @@
+import os
+import uuid
+import numpy as np
+from frontend.native import load_native
+from frontend.encoding import encode_values
+from frontend.numpy_backend import RESULT_DTYPE, evaluate_numpy
+
+# Directorio de las matrices de respuestas y de los resultados evaluados fuera de memoria
+OUT_OF_CORE_DIR = "cache/out_of_core"
+# Techo de memoria por defecto (respuestas + resultados de una ventana)
+DEFAULT_MEMORY_MB = 256
+# Modos que pueden evaluar por ventanas (CUDA y el empaquetado necesitan copias propias de cada ventana)
+OUT_OF_CORE_MODES = ('serial', 'openmp', 'pthreads', 'simd', 'openmp_simd', 'pthreads_simd', 'numpy')
+
+def npy_layout(path: str):
+    """
+    Lee la cabecera de un archivo .npy sin cargar los datos.
+
+    Args:
+        path (str): Ruta del archivo .npy.
+
+    Returns:
+        tuple: (desplazamiento de los datos en bytes, forma, dtype).
+    """
+    with open(path, 'rb') as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        if fortran_order:
+            raise ValueError(f"El archivo {path} no está en orden C (filas contiguas).")
+        return f.tell(), shape, dtype
+
+def window_rows(num_questions: int, memory_mb: float = DEFAULT_MEMORY_MB) -> int:
+    """
+    Filas por ventana para que respuestas (int8, mapeadas y normalizadas) y resultados de una ventana
+    quepan en memory_mb.
+
+    Args:
+        num_questions (int): Número de preguntas (bytes por fila de respuestas).
+        memory_mb (float): Techo de memoria en MB.
+
+    Returns:
+        int: Número de filas por ventana (al menos 1).
+    """
+    row_bytes = 2 * num_questions + RESULT_DTYPE.itemsize
+    return max(int(memory_mb * 1024 * 1024) // row_bytes, 1)
+
+def answers_file(answers: np.ndarray, memory_mb: float = DEFAULT_MEMORY_MB, directory: str = OUT_OF_CORE_DIR) -> str:
+    """
+    Devuelve un archivo .npy con la matriz de respuestas. Si answers ya es el memory-map completo de un
+    .npy (p. ej. la caché de datasets) se reutiliza; si no, se escribe por ventanas en directory.
+
+    Args:
+        answers (np.ndarray): Matriz int8 (estudiantes x preguntas), en memoria o memory-mapped.
+        memory_mb (float): Techo de memoria de la copia.
+        directory (str): Directorio donde escribir la copia.
+
+    Returns:
+        str: Ruta del archivo .npy.
+    """
+    filename = getattr(answers, 'filename', None)
+    if filename and os.path.isfile(filename):
+        offset, shape, dtype = npy_layout(filename)
+        if answers.offset == offset and tuple(shape) == answers.shape and dtype == np.int8:
+            return filename
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'answers-{uuid.uuid4().hex}.npy')
+    target = np.lib.format.open_memmap(path, mode='w+', dtype=np.int8, shape=answers.shape)
+    step = window_rows(answers.shape[1], memory_mb)
+    for start in range(0, answers.shape[0], step):
+        target[start:start + step] = answers[start:start + step]
+    target.flush()
+    del target
+    return path
+
+def evaluate_out_of_core(answers_path: str, key_np: np.ndarray, rule, results_path: str, mode: str = 'openmp_simd', memory_mb: float = DEFAULT_MEMORY_MB, progress=None) -> np.ndarray:
+    """
+    Evalúa una matriz de respuestas en disco por ventanas de tamaño acotado y escribe los resultados en
+    un .npy memory-mapped. Cada ventana se mapea, se evalúa con el motor nativo directamente sobre el mapa
+    de salida y se desmapea antes de la siguiente, de modo que la memoria residente no depende del
+    número de estudiantes.
+
+    Args:
+        answers_path (str): Archivo .npy con la matriz int8 (estudiantes x preguntas).
+        key_np (np.ndarray): Clave int8 (una entrada por pregunta).
+        rule: Regla de puntuación (pyevalcore.ScoringRule o equivalente).
+        results_path (str): Archivo .npy de resultados (se reemplaza al terminar).
+        mode (str): Uno de OUT_OF_CORE_MODES.
+        memory_mb (float): Techo de memoria de una ventana en MB.
+        progress (callable, optional): progress(estudiantes evaluados, total) tras cada ventana.
+
+    Returns:
+        np.ndarray: Resultados memory-mapped (solo lectura) con campos 'score', 'correct', 'wrong' y 'blank'.
+    """
+    if mode not in OUT_OF_CORE_MODES:
+        raise ValueError(f"Modo no soportado fuera de memoria: {mode}")
+    native = load_native()
+    if native is None and mode != 'numpy':
+        raise RuntimeError("La extensión nativa pyevalcore no está disponible; use el modo 'numpy'.")
+
+    answers_offset, (num_students, num_questions), dtype = npy_layout(answers_path)
+    if dtype != np.int8:
+        raise ValueError(f"La matriz de respuestas debe ser int8, no {dtype}.")
+    key_np = np.ascontiguousarray(key_np, dtype=np.int8)
+    if key_np.shape != (num_questions,):
+        raise ValueError("El número de preguntas de la matriz no coincide con la clave.")
+
+    # Se escribe en un archivo temporal y se renombra al final: un fallo no deja resultados a medias
+    os.makedirs(os.path.dirname(results_path) or '.', exist_ok=True)
+    staging_path = f'{results_path}.{uuid.uuid4().hex}.tmp'
+    results = np.lib.format.open_memmap(staging_path, mode='w+', dtype=RESULT_DTYPE, shape=(num_students,))
+    results_offset = results.offset
+    del results
+
+    try:
+        step = window_rows(num_questions, memory_mb)
+        for start in range(0, num_students, step):
+            rows = min(step, num_students - start)
+            answers = np.memmap(answers_path, dtype=np.int8, mode='r', offset=answers_offset + start * num_questions, shape=(rows, num_questions))
+            # Igual que la evaluación en memoria (encode_answers): los códigos fuera de dominio (INVALID_CODE)
+            # cuentan como blanco. La copia normalizada es del tamaño de la ventana.
+            answers = encode_values(answers)
+            out = np.memmap(staging_path, dtype=RESULT_DTYPE, mode='r+', offset=results_offset + start * RESULT_DTYPE.itemsize, shape=(rows,))
+            if mode == 'numpy':
+                out[:] = evaluate_numpy(answers, key_np, rule)
+            else:
+                native.evaluate_into(answers, key_np, rule, out, mode)
+            out.flush()
+            # Desmapear la ventana antes de la siguiente mantiene acotada la memoria residente
+            del answers, out
+            if progress is not None:
+                progress(start + rows, num_students)
+        os.replace(staging_path, results_path)
+    except BaseException:
+        if os.path.exists(staging_path):
+            os.remove(staging_path)
+        raise
+    return np.load(results_path, mmap_mode='r')
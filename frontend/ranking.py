@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+from frontend.native import pyevalcore, native_available
+from frontend.numpy_backend import rank_scores_numpy, select_top_k_numpy
+
+RANK_METHODS = ('competition', 'dense')
+
+def _tiebreak(df_results: pd.DataFrame, tiebreak_col: str):
+    """Columna de desempate como float64 contiguo, o None si no se usa desempate."""
+    if not tiebreak_col:
+        return None
+    return np.ascontiguousarray(df_results[tiebreak_col].to_numpy(dtype=np.float64))
+
+def rank_results(df_results: pd.DataFrame, score_col: str = 'score', tiebreak_col: str = 'correct', method: str = 'competition') -> pd.DataFrame:
+    """
+    Calcula el puesto de cada estudiante con el motor nativo (mayor puntaje primero, desempate por tiebreak_col),
+    o con NumPy si el módulo nativo no está disponible.
+
+    Args:
+        df_results (pd.DataFrame): Resultados de la evaluación.
+        score_col (str): Columna de puntaje.
+        tiebreak_col (str): Columna de desempate (p. ej. 'correct'); None para no desempatar.
+        method (str): 'competition' (1, 2, 2, 4) o 'dense' (1, 2, 2, 3).
+
+    Returns:
+        pd.DataFrame: Resultados con la columna 'rank', en orden de mérito.
+    """
+    scores = np.ascontiguousarray(df_results[score_col].to_numpy(dtype=np.float64))
+    rank_scores = pyevalcore.rank_scores if native_available() else rank_scores_numpy
+    order, ranks = rank_scores(scores, _tiebreak(df_results, tiebreak_col), method)
+    df_ranked = df_results.assign(rank=ranks)
+    return df_ranked.iloc[order].reset_index(drop=True)
+
+def admission_cutoffs(df_results: pd.DataFrame, vacancies: dict, tiebreak_col: str = 'correct', applicant_career: pd.Series = None, include_ties: bool = True):
+    """
+    Selecciona los ingresantes de cada carrera con selección parcial (sin ordenar todos los resultados);
+    sin el módulo nativo, NumPy ordena a los postulantes de cada carrera.
+
+    Cada carrera se ordena por su columna 'career_<carrera>' (compuestos de run_sections) o, si no existe,
+    por 'score'. Con include_ties, los empatados con el último admitido también ingresan.
+
+    Args:
+        df_results (pd.DataFrame): Resultados de la evaluación.
+        vacancies (dict): Carrera -> número de vacantes.
+        tiebreak_col (str): Columna de desempate; None para no desempatar.
+        applicant_career (pd.Series, optional): Carrera a la que postula cada estudiante (mismo orden que
+                                                 df_results); sin ella todos compiten en todas las carreras.
+        include_ties (bool): Admitir a los empatados en la última vacante.
+
+    Returns:
+        tuple: (admitidos, cortes). admitidos tiene 'career', 'student_id', 'score' y 'position' (orden de mérito
+               en la carrera); cortes tiene 'career', 'vacancies', 'admitted' y 'cutoff_score'.
+    """
+    careers = list(vacancies)
+    score_cols = [f'career_{career}' if f'career_{career}' in df_results.columns else 'score' for career in careers]
+    scores = np.ascontiguousarray(df_results[score_cols].to_numpy(dtype=np.float64))
+    applicant_column = None
+    if applicant_career is not None:
+        applicant_column = pd.Categorical(applicant_career, categories=careers).codes.astype(np.int32)
+
+    select_top_k = pyevalcore.select_top_k if native_available() else select_top_k_numpy
+    selected = select_top_k(scores, np.array([vacancies[career] for career in careers], dtype=np.uint32),
+                            _tiebreak(df_results, tiebreak_col), applicant_column, include_ties)
+
+    admitted_frames = []
+    cutoffs = []
+    student_ids = df_results['student_id'].to_numpy() if 'student_id' in df_results.columns else df_results.index.to_numpy()
+    for c, (career, indices) in enumerate(zip(careers, selected)):
+        career_scores = scores[indices, c]
+        admitted_frames.append(pd.DataFrame({
+            'career': career,
+            'student_id': student_ids[indices],
+            'score': career_scores,
+            'position': np.arange(1, len(indices) + 1),
+        }))
+        cutoffs.append({
+            'career': career,
+            'vacancies': int(vacancies[career]),
+            'admitted': len(indices),
+            'cutoff_score': float(career_scores[-1]) if len(indices) else None,
+        })
+    admitted = pd.concat(admitted_frames, ignore_index=True) if admitted_frames else pd.DataFrame(columns=['career', 'student_id', 'score', 'position'])
+    return admitted, pd.DataFrame(cutoffs)
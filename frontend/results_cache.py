@@ -0,0 +1,91 @@
+import json
+import hashlib
+import threading
+import pandas as pd
+from collections import OrderedDict
+from frontend.config_utils import load_scoring_config
+
+# Evaluaciones memorizadas por defecto (los resultados de una cohorte grande ocupan decenas de MB)
+DEFAULT_RESULTS_CACHE_ENTRIES = 8
+
+def results_key(dataset_key: str, key_df: pd.DataFrame, scoring_config: dict, out_of_core: bool = False) -> str:
+    """
+    Clave de una evaluación: cambia si cambia cualquiera de sus entradas.
+
+    No incluye el modo ni chunk_size: todos los kernels calculan el puntaje desde los conteos con la misma
+    fórmula (rule_score en evaluator.hpp, evaluate_numpy), de modo que los modos en memoria y sus particiones
+    producen exactamente los mismos puntajes.
+    La evaluación por ventanas desde disco sí forma parte de la clave, para que un cambio en ese camino
+    nunca sirva resultados memorizados por el otro.
+
+    Args:
+        dataset_key (str): Clave del dataset en la caché de datasets (incluye el SHA-256 del archivo).
+        key_df (pd.DataFrame): Claves de respuestas con sus versiones, pesos y preguntas anuladas.
+        scoring_config (dict): Configuración de scoring.json; se usan 'scoring', 'sections' y 'careers'.
+        out_of_core (bool): Si la evaluación se hace por ventanas desde disco (run_out_of_core).
+
+    Returns:
+        str: Digest hexadecimal.
+    """
+    digest = hashlib.sha256(dataset_key.encode())
+    digest.update(','.join(map(str, key_df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(key_df, index=False).to_numpy().tobytes())
+    rules = {name: scoring_config.get(name) for name in ('scoring', 'sections', 'careers')}
+    rules["out_of_core"] = bool(out_of_core)
+    digest.update(json.dumps(rules, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+class ResultsCache:
+    """
+    Caché en memoria de resultados de evaluación, indexada por results_key, con desalojo LRU por
+    número de entradas y contadores de aciertos y fallos.
+    """
+
+    def __init__(self, max_entries: int = None):
+        if max_entries is None:
+            max_entries = int(load_scoring_config().get('results_cache_entries', DEFAULT_RESULTS_CACHE_ENTRIES))
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        """Resultados memorizados para key (None si no están) y actualiza los contadores."""
+        with self._lock:
+            results_df = self._entries.get(key)
+            if results_df is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return results_df
+
+    def put(self, key: str, results_df: pd.DataFrame):
+        """Memoriza resultados (que no deben modificarse después) y desaloja los usados hace más tiempo."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = results_df
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Aciertos, fallos, tasa de aciertos y entradas memorizadas."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+# Instancia compartida por /run y /results-cache
+results_cache = ResultsCache()
@@ -2,6 +2,12 @@ import pandas as pd
 import numpy as np
 import json
 import os
+from frontend.encoding import ANSWER_COLS, INVALID_CODE
+from frontend.ingestion import read_responses, read_response_cells, read_answer_key
+from frontend.dataset_cache import dataset_cache
+from frontend.utils.logger import Logger
+
+logger = Logger()
 
 def log_entry(log_file: str, level: str, message: str):
     """
@@ -22,12 +28,78 @@ def log_entry(log_file: str, level: str, message: str):
     except Exception as e:
         print(f"Error al escribir en el archivo de log {log_file}: {e}")
 
+def log_entries(log_file: str, level: str, messages: list):
+    """
+    Registra varios mensajes del mismo nivel con una única escritura al archivo JSONL.
+    En el log general (Logger) solo se registra un resumen para no saturarlo con miles de líneas.
+
+    Args:
+        log_file (str): Ruta al archivo JSONL.
+        level (str): Nivel del log (e.g., 'INFO', 'ERROR').
+        messages (list): Mensajes a registrar.
+    """
+    if not messages:
+        return
+    logger.log(level, "validation", f"{len(messages)} mensajes registrados en {log_file}.", extra={"first": messages[0]})
+    lines = ''.join(json.dumps({'level': level, 'message': message}) + '\n' for message in messages)
+    try:
+        with open(log_file, 'a') as f:
+            f.write(lines)
+    except Exception as e:
+        print(f"Error al escribir en el archivo de log {log_file}: {e}")
+
 def log_error(log_file: str, message: str):
     log_entry(log_file, 'ERROR', message)
 
 def log_info(log_file: str, message: str):
     log_entry(log_file, 'INFO', message)
 
+def validate_response_arrays(student_ids: np.ndarray, answers: np.ndarray, read_cells=None):
+    """
+    Valida formato de DNI, DNI duplicados y dominio de respuestas con operaciones vectorizadas.
+
+    Una fila se invalida por el primer motivo encontrado (formato, duplicado, respuesta), y solo
+    ese motivo se reporta, igual que en la validación fila por fila.
+
+    Args:
+        student_ids (np.ndarray): DNI de cada fila como cadenas.
+        answers (np.ndarray): Matriz int8 (filas x preguntas) con INVALID_CODE en celdas fuera de dominio.
+        read_cells (callable, optional): read_cells(celdas) -> {(fila, columna): valor original}, llamada solo
+            con las celdas inválidas que se reportan (ver read_response_cells); sin ella se muestra el código.
+
+    Returns:
+        tuple: (valid_mask, errors) con la máscara booleana de filas válidas y la lista de mensajes de error.
+    """
+    student_ids = np.asarray(student_ids, dtype=str)
+    answers = np.asarray(answers)
+
+    # Formato: 8 dígitos
+    dni_format_ok = np.char.isdigit(student_ids) & (np.char.str_len(student_ids) == 8)
+
+    # Duplicados entre los DNI con formato válido (se invalidan todas sus ocurrencias)
+    duplicated = np.zeros(len(student_ids), dtype=bool)
+    _, inverse, counts = np.unique(student_ids[dni_format_ok], return_inverse=True, return_counts=True)
+    duplicated[dni_format_ok] = counts[inverse] > 1
+
+    # Dominio de respuestas: una sola pasada sobre toda la matriz
+    invalid_cells = answers == INVALID_CODE
+    has_invalid_answer = invalid_cells.any(axis=1)
+    first_invalid_col = invalid_cells.argmax(axis=1)
+
+    dni_error_rows = np.flatnonzero(~dni_format_ok)
+    duplicate_rows = np.flatnonzero(duplicated)
+    answer_error_rows = np.flatnonzero(dni_format_ok & ~duplicated & has_invalid_answer)
+
+    errors = [f"Fila {i}: DNI inválido (formato o longitud): {student_ids[i]}" for i in dni_error_rows]
+    errors += [f"Fila {i}: DNI duplicado: {student_ids[i]}" for i in duplicate_rows]
+    # La matriz codificada no conserva el valor original de las celdas inválidas
+    reported_cells = [(int(i), int(first_invalid_col[i])) for i in answer_error_rows]
+    raw_cells = read_cells(reported_cells) if read_cells is not None and reported_cells else {}
+    errors += [f"Fila {i}, Columna {ANSWER_COLS[first_invalid_col[i]]}: Respuesta inválida: {raw_cells.get((i, first_invalid_col[i]), INVALID_CODE)}" for i in answer_error_rows]
+
+    valid_mask = dni_format_ok & ~duplicated & ~has_invalid_answer
+    return valid_mask, errors
+
 def validate_and_load_responses(path: str) -> pd.DataFrame:
     """
     Valida DNI y respuestas de un archivo Excel, convierte respuestas a valores numéricos,
@@ -43,141 +115,151 @@ def validate_and_load_responses(path: str) -> pd.DataFrame:
     os.makedirs(os.path.dirname(log_file), exist_ok=True)
     
     try:
-        df = pd.read_excel(path)
+        # El parseo (DNI + matriz int8) se reutiliza desde la caché si el archivo ya se cargó antes
+        student_ids, answers, versions = dataset_cache.get_or_parse(path, 'responses', lambda source: read_responses(source, path), ('student_ids', 'answers', 'versions'))
     except FileNotFoundError:
         log_error(log_file, f"Error: Archivo no encontrado: {path}")
         return pd.DataFrame()
+    except ValueError as e:
+        log_error(log_file, f"Error de estructura: {e}")
+        return pd.DataFrame()
     except Exception as e:
         log_error(log_file, f"Error inesperado al leer Excel: {e}")
         return pd.DataFrame()
 
-    log_info(log_file, f"DataFrame cargado. Filas iniciales: {len(df)}")
+    log_info(log_file, f"DataFrame cargado. Filas iniciales: {len(student_ids)}")
 
-    # Convertir DNI a string para asegurar consistencia
-    if 'DNI' not in df.columns:
-        log_error(log_file, "Error de estructura: Columna 'DNI' no encontrada en el archivo de respuestas.")
-        return pd.DataFrame()
-    df['DNI'] = df['DNI'].astype(str)
-
-    # Inicializar una columna para marcar filas válidas/inválidas
-    df['is_valid'] = True
-
-    # Validar DNI: longitud y dígitos
-    invalid_dni_format_mask = ~df['DNI'].apply(lambda x: x.isdigit() and len(x) == 8)
-    for index in df[invalid_dni_format_mask].index:
-        log_error(log_file, f"Fila {index}: DNI inválido (formato o longitud): {df.loc[index, 'DNI']}")
-        df.loc[index, 'is_valid'] = False
-
-    # Identificar DNI duplicados y marcar todas sus ocurrencias como inválidas
-    # Solo considerar DNI que no fueron ya invalidados por formato
-    temp_df = df[df['is_valid']].copy()
-    dni_counts = temp_df['DNI'].value_counts()
-    duplicated_dnis = dni_counts[dni_counts > 1].index
-    
-    for dni in duplicated_dnis:
-        indices = df[df['DNI'] == dni].index
-        for index in indices:
-            if df.loc[index, 'is_valid']: # Solo loguear si no fue ya invalidado por formato
-                log_error(log_file, f"Fila {index}: DNI duplicado: {dni}")
-            df.loc[index, 'is_valid'] = False
-
-    # Validar respuestas
-    for i in range(1, 101):
-        columna = f'answer_{i}'
-        if columna not in df.columns:
-            log_error(log_file, f"Error de estructura: Columna '{columna}' no encontrada en el archivo de respuestas. Todas las filas serán marcadas como inválidas.")
-            df['is_valid'] = False # Marcar todas las filas como inválidas si la estructura es incorrecta
-            break # Salir del bucle de validación de respuestas
-
-        # Convertir NaN a cadena vacía antes de la validación
-        answers_series = df[columna].replace({np.nan: ''}).astype(str).str.upper()
-        invalid_answer_mask = ~answers_series.isin(['A', 'B', 'C', 'D', ''])
-        
-        if invalid_answer_mask.any(): # Solo iterar si hay respuestas inválidas
-            for index in df[invalid_answer_mask].index:
-                if df.loc[index, 'is_valid']: # Solo loguear si no fue ya invalidado
-                    log_error(log_file, f"Fila {index}, Columna {columna}: Respuesta inválida: {df.loc[index, columna]}")
-                df.loc[index, 'is_valid'] = False
-    
-    # Filtrar filas válidas
-    df_valid = df[df['is_valid']].copy()
-
-    # Convertir respuestas a valores numéricos para las filas válidas
-    conversion_map = {'A': 0, 'B': 1, 'C': 2, 'D': 3, '': -1}
-    for i in range(1, 101):
-        columna = f'answer_{i}'
-        if columna in df_valid.columns: # Asegurarse de que la columna existe en el DataFrame válido
-            df_valid[columna] = df_valid[columna].astype(str).str.upper().map(conversion_map)
-    
-    # Eliminar la columna 'is_valid' antes de retornar
-    df_valid = df_valid.drop(columns=['is_valid'])
+    def read_invalid_cells(cells):
+        # Solo se releen del archivo las celdas reportadas; un fallo no impide la validación
+        try:
+            return read_response_cells(path, path, cells)
+        except Exception as e:
+            log_error(log_file, f"No se pudieron releer las celdas inválidas: {e}")
+            return {}
+
+    valid_mask, errors = validate_response_arrays(student_ids, answers, read_invalid_cells)
+    log_entries(log_file, 'ERROR', errors)
 
-    print(f"Filas válidas antes de retornar: {len(df_valid)}") # Debugging
+    # Construir el DataFrame solo con las filas válidas (respuestas ya codificadas: 0-3 para A-D, -1 para blanco)
+    valid_rows = np.flatnonzero(valid_mask)
+    df_valid = pd.DataFrame(np.asarray(answers)[valid_rows], columns=ANSWER_COLS, index=valid_rows)
+    df_valid.insert(0, 'DNI', np.asarray(student_ids, dtype=object)[valid_rows])
+    df_valid.insert(1, 'version', np.asarray(versions)[valid_rows])
+
+    logger.log("INFO", "validation", "Respuestas validadas.", extra={"path": path, "valid_rows": len(df_valid), "errors": len(errors)})
     return df_valid
 
-def validate_and_load_answer_key(path: str) -> pd.Series:
+def validate_key_arrays(versions: np.ndarray, question_ids: np.ndarray, key_codes: np.ndarray, num_questions: int = 100, labels: np.ndarray = None):
     """
-    Valida question_id y correct_answer de un archivo Excel, convierte respuestas a valores numéricos,
-    registra errores en un archivo JSONL y retorna una Series indexada por question_id.
+    Valida las claves de respuestas de una o varias versiones del examen con operaciones vectorizadas.
+
+    Por versión: question_id debe ser entero, estar en 1..num_questions y ser estrictamente creciente
+    respecto a la última fila aceptada; correct_answer debe estar codificada en 0-3.
 
     Args:
-        path (str): Ruta al archivo Excel con la clave de respuestas.
+        versions (np.ndarray): Versión (tema) de cada fila.
+        question_ids (np.ndarray): question_id de cada fila como float64 (NaN si no es numérico).
+        key_codes (np.ndarray): Respuesta correcta codificada de cada fila (int8).
+        num_questions (int): Número de preguntas del examen.
+        labels (np.ndarray, optional): Texto original de correct_answer de cada fila, para los mensajes;
+            sin él se muestra el código.
 
     Returns:
-        pandas.Series: Series indexada por question_id con las respuestas correctas en formato numérico.
+        tuple: (keys, errors) donde keys es un dict versión -> arreglo int8 de longitud num_questions
+               (-1 en preguntas sin clave válida) y errors es la lista de mensajes en orden de fila.
     """
-    log_file = "logs/validate_answer_key.jsonl"
-    os.makedirs(os.path.dirname(log_file), exist_ok=True)
-    
+    versions = np.asarray(versions, dtype=str)
+    question_ids = np.asarray(question_ids, dtype=np.float64)
+    key_codes = np.asarray(key_codes)
+    unique_versions = pd.unique(versions)
+    multi_version = len(unique_versions) > 1
+
+    keys = {}
+    errors = []
+    for version in unique_versions:
+        rows = np.flatnonzero(versions == version)
+        qid = question_ids[rows]
+        codes = key_codes[rows]
+
+        is_integer = np.isfinite(qid) & (qid == np.floor(qid))
+        qid_int = np.where(is_integer, qid, 0).astype(np.int64)
+        in_range = is_integer & (qid_int >= 1) & (qid_int <= num_questions)
+        answer_ok = (codes >= 0) & (codes <= 3)
+
+        # Las filas en rango con respuesta válida pero fuera de secuencia tienen un id <= al máximo previo,
+        # así que el máximo acumulado sobre ellas coincide con el de las filas aceptadas.
+        running_max = np.maximum.accumulate(np.where(in_range & answer_ok, qid_int, 0))
+        previous_max = np.concatenate(([0], running_max[:-1]))
+        in_sequence = in_range & (qid_int > previous_max)
+        accepted = in_sequence & answer_ok
+
+        key = np.full(num_questions, -1, dtype=np.int8)
+        key[qid_int[accepted] - 1] = codes[accepted]
+        keys[version] = key
+
+        suffix = f" (versión {version})" if multi_version else ""
+        errors += [(rows[j], f"Fila {rows[j]}: question_id no es un número entero: {qid[j]}{suffix}") for j in np.flatnonzero(~is_integer)]
+        errors += [(rows[j], f"Fila {rows[j]}: question_id inválido o fuera de secuencia: {qid_int[j]}{suffix}") for j in np.flatnonzero(is_integer & ~in_sequence)]
+        errors += [(rows[j], f"Fila {rows[j]}: correct_answer inválida: {labels[rows[j]] if labels is not None else codes[j]} (question_id {qid_int[j]}){suffix}") for j in np.flatnonzero(in_sequence & ~answer_ok)]
+
+    errors.sort(key=lambda error: error[0])
+    return keys, [message for _, message in errors]
+
+def _load_answer_key_arrays(path: str, log_file: str):
+    """Lee (o recupera de la caché) las columnas de la clave; registra el error y retorna None si falla."""
     try:
-        df = pd.read_excel(path)
+        # El parseo (versión + question_id + códigos) se reutiliza desde la caché si el archivo ya se cargó antes
+        return dataset_cache.get_or_parse(path, 'answer_key', lambda source: read_answer_key(source, path), ('versions', 'question_ids', 'answers', 'weights', 'labels'))
     except FileNotFoundError:
         log_error(log_file, f"Error: Archivo no encontrado: {path}")
-        return pd.Series()
+    except ValueError as e:
+        log_error(log_file, f"Error de estructura: {e}")
     except Exception as e:
         log_error(log_file, f"Error inesperado al leer Excel: {e}")
-        return pd.Series()
+    return None
 
-    answer_key = {}
-    
-    question_id_anterior = 0
-    
-    for index, row in df.iterrows():
-        # Asegurarse de que 'question_id' y 'correct_answer' existen
-        if 'question_id' not in row or 'correct_answer' not in row:
-            log_error(log_file, f"Fila {index}: Error de estructura, faltan columnas 'question_id' o 'correct_answer'.")
-            continue
+def validate_and_load_answer_keys(path: str) -> dict:
+    """
+    Valida y carga en una sola llamada las claves de todas las versiones (temas) de un archivo Excel.
 
-        try:
-            question_id = int(row['question_id'])
-        except ValueError:
-            log_error(log_file, f"Fila {index}: question_id no es un número entero: {row['question_id']}")
-            continue
-
-        correct_answer = str(row['correct_answer']).upper()
-        
-        # Validar question_id
-        if not (1 <= question_id <= 100) or question_id <= question_id_anterior:
-            log_error(log_file, f"Fila {index}: question_id inválido o fuera de secuencia: {question_id}")
-            continue
-        
-        # Validar correct_answer
-        if correct_answer not in ('A', 'B', 'C', 'D'):
-            log_error(log_file, f"Fila {index}: correct_answer inválida: {correct_answer}")
-            continue
-        
-        # Convertir respuesta a valor numérico
-        if correct_answer == 'A':
-            answer_key[question_id] = 0
-        elif correct_answer == 'B':
-            answer_key[question_id] = 1
-        elif correct_answer == 'C':
-            answer_key[question_id] = 2
-        elif correct_answer == 'D':
-            answer_key[question_id] = 3
-            
-        question_id_anterior = question_id
-    
-    answer_key_series = pd.Series(answer_key)
+    El archivo puede incluir una columna 'version'; si no la tiene, todas las filas pertenecen a
+    DEFAULT_KEY_VERSION.
+
+    Args:
+        path (str): Ruta al archivo Excel con las claves de respuestas.
+
+    Returns:
+        dict: Versión -> arreglo int8 de 100 posiciones (0-3 para A-D, -1 sin clave válida).
+    """
+    log_file = "logs/validate_answer_key.jsonl"
+    os.makedirs(os.path.dirname(log_file), exist_ok=True)
+
+    arrays = _load_answer_key_arrays(path, log_file)
+    if arrays is None:
+        return {}
+    versions, question_ids, key_codes, _, labels = arrays
+    keys, errors = validate_key_arrays(versions, question_ids, key_codes, labels=labels)
+    log_entries(log_file, 'ERROR', errors)
+    return keys
+
+def validate_and_load_answer_key(path: str) -> pd.Series:
+    """
+    Valida question_id y correct_answer de un archivo Excel, convierte respuestas a valores numéricos,
+    registra errores en un archivo JSONL y retorna una Series indexada por question_id.
+
+    Args:
+        path (str): Ruta al archivo Excel con la clave de respuestas.
+
+    Returns:
+        pandas.Series: Series indexada por question_id con las respuestas correctas en formato numérico.
+    """
+    keys = validate_and_load_answer_keys(path)
+    if not keys:
+        return pd.Series()
+
+    # Con varias versiones se retorna la primera; validate_and_load_answer_keys las retorna todas
+    key = next(iter(keys.values()))
+    accepted = np.flatnonzero(key >= 0)
+    answer_key_series = pd.Series(key[accepted].astype(np.int64), index=accepted + 1)
     answer_key_series.index.name = 'question_id'
-    return answer_key_series
\ No newline at end of file
+    return answer_key_series
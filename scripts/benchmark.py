@@ -5,7 +5,6 @@ import os
 import plotly.express as px
 from frontend.benchmark_logic import run_full_benchmark, generate_benchmark_plot
 from frontend.config_utils import load_scoring_config
-import pyevalcore # Necesario para ScoringRule si se usa en create_sample_data
 
 def create_sample_data(num_students, num_questions):
     answers_np = np.random.randint(0, 4, size=(num_students, num_questions), dtype=np.int8)
@@ -0,0 +1,16 @@
+import pytest
+
+from frontend import native
+
+@pytest.fixture(params=["native", "numpy"])
+def backend(request, monkeypatch):
+    """
+    Ejecuta la prueba con el módulo nativo (si está compilado) y simulando una máquina sin pyevalcore,
+    donde las funciones de frontend usan sus versiones NumPy.
+    """
+    if request.param == "native":
+        pytest.importorskip("pyevalcore")
+    else:
+        monkeypatch.setattr(native, '_native_module', None)
+        monkeypatch.setattr(native, '_native_import_error', ImportError('pyevalcore no compilado'))
+    return request.param
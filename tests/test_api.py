@@ -0,0 +1,191 @@
+import io
+import json
+import time
+import threading
+import pytest
+import pandas as pd
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from frontend.api_routes import _evaluation_plan, _stream_results, evaluation_job, setup_api_routes
+from frontend.dataset_registry import dataset_registry
+from frontend.encoding import ANSWER_COLS
+from frontend.jobs import job_queue
+from frontend.results_cache import results_cache
+
+NUM_STUDENTS = 25
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """
+    Aplicación con solo las rutas de la API, ejecutada en un directorio temporal (caché, logs y
+    scoring.json por defecto) y con un dataset de NUM_STUDENTS estudiantes ya cargado.
+    """
+    monkeypatch.chdir(tmp_path)
+    results_cache.clear()
+    rng = np.random.default_rng(11)
+    responses = pd.DataFrame(rng.choice(['A', 'B', 'C', 'D', ''], size=(NUM_STUDENTS, len(ANSWER_COLS))), columns=ANSWER_COLS)
+    responses.insert(0, 'DNI', [f'{40000000 + i}' for i in range(NUM_STUDENTS)])
+    responses.to_csv('respuestas.csv', index=False)
+    pd.DataFrame({'question_id': range(1, 101), 'correct_answer': rng.choice(['A', 'B', 'C', 'D'], size=100)}).to_csv('clave.csv', index=False)
+
+    app = FastAPI()
+    setup_api_routes(app)
+    client = TestClient(app)
+    with open('respuestas.csv', 'rb') as students_file, open('clave.csv', 'rb') as key_file:
+        response = client.post('/upload', files={'students_file': ('respuestas.csv', students_file), 'key_file': ('clave.csv', key_file)})
+    assert response.json()['status'] == 'ok'
+    return client
+
+def _run(client, mode='numpy'):
+    """Encola /run y espera a que el trabajo termine; devuelve el identificador del trabajo."""
+    job_id = client.post('/run', data={'mode': mode}).json()['job_id']
+    for _ in range(200):
+        status = client.get(f'/jobs/{job_id}').json()['job']['status']
+        if status not in ('queued', 'running'):
+            break
+        time.sleep(0.05)
+    assert status == 'done'
+    return job_id
+
+def test_rescore_keeps_previous_key_df(backend, client):
+    """
+    Verifica que /rescore guarde una clave corregida nueva en el registro sin modificar la que
+    pudieran estar leyendo otros trabajos.
+    """
+    _run(client)
+    dataset = dataset_registry.get(client.app.state.current_dataset)
+    old_key_df = dataset['key_df']
+    old_answers = old_key_df['correct_answer'].copy()
+    question_id = str(old_key_df['question_id'].iloc[0])
+
+    response = client.post('/rescore', data={'corrections': f'{{"{question_id}": null}}'}).json()
+
+    assert response['status'] == 'ok'
+    assert old_key_df['correct_answer'].equals(old_answers)
+    new_key_df = dataset_registry.get(client.app.state.current_dataset)['key_df']
+    assert new_key_df is not old_key_df
+    assert new_key_df['correct_answer'].iloc[0] != old_answers.iloc[0]
+
+def test_ranking_uses_rescored_results(backend, client):
+    """
+    Verifica que /ranking use los puntajes recalificados por /rescore y no los de la evaluación anterior.
+    """
+    _run(client)
+    before = {row['student_id']: row['score'] for row in client.get('/ranking').json()['ranking']}
+    question_id = str(dataset_registry.get(client.app.state.current_dataset)['key_df']['question_id'].iloc[0])
+
+    rescored = client.post('/rescore', data={'corrections': f'{{"{question_id}": null}}'}).json()
+    after = {row['student_id']: row['score'] for row in client.get('/ranking').json()['ranking']}
+
+    assert after == {row['student_id']: row['score'] for row in rescored['results']}
+    assert after != before
+
+def test_run_packed_evaluates_stored_planes(client):
+    """
+    Verifica que /run en modo empaquetado guarde los planos de bits en el registro y puntúe igual que NumPy.
+    """
+    pytest.importorskip("pyevalcore")
+    packed_results = pd.DataFrame(client.get(f'/jobs/{_run(client, "packed")}/result').json()['results'])
+    dataset = dataset_registry.get(client.app.state.current_dataset)
+    assert 'packed' in dataset['arrays']
+
+    results_cache.clear()
+    numpy_results = pd.DataFrame(client.get(f'/jobs/{_run(client, "numpy")}/result').json()['results'])
+    pd.testing.assert_frame_equal(packed_results, numpy_results)
+
+def test_job_results_stream_ndjson_and_csv(client):
+    """
+    Verifica que /jobs/{job_id}/results transmita las mismas filas que /jobs/{job_id}/result en NDJSON y
+    en CSV, con el total en X-Total-Count y el rango pedido con offset y limit.
+    """
+    job_id = _run(client)
+    expected = pd.DataFrame(client.get(f'/jobs/{job_id}/result').json()['results'])
+
+    response = client.get(f'/jobs/{job_id}/results')
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    assert response.headers['x-total-count'] == str(NUM_STUDENTS)
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    pd.testing.assert_frame_equal(pd.DataFrame(rows), expected)
+
+    response = client.get(f'/jobs/{job_id}/results', params={'format': 'csv', 'offset': 20, 'limit': 10})
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/csv')
+    assert response.headers['x-total-count'] == str(NUM_STUDENTS)
+    page = pd.read_csv(io.StringIO(response.text), dtype={'student_id': str})
+    pd.testing.assert_frame_equal(page, expected.iloc[20:].reset_index(drop=True), check_dtype=False)
+
+def test_stream_results_partial_last_batch():
+    """
+    Verifica que _stream_results emita todas las filas una sola vez cuando batch_rows no divide al total.
+    """
+    results_df = pd.DataFrame({'student_id': [f'{i:08d}' for i in range(25)], 'score': np.arange(25) * 0.5})
+
+    ndjson_chunks = list(_stream_results(results_df, 'ndjson', batch_rows=10))
+    assert len(ndjson_chunks) == 3
+    rows = [json.loads(line) for chunk in ndjson_chunks for line in chunk.splitlines()]
+    assert [row['student_id'] for row in rows] == results_df['student_id'].tolist()
+
+    csv_chunks = list(_stream_results(results_df, 'csv', batch_rows=10))
+    assert csv_chunks[0] == 'student_id,score\n'
+    assert len(csv_chunks) == 4
+    streamed = pd.read_csv(io.StringIO(''.join(csv_chunks)), dtype={'student_id': str})
+    pd.testing.assert_frame_equal(streamed, results_df)
+
+def test_job_results_stream_errors(client):
+    """
+    Verifica los errores de /jobs/{job_id}/results: trabajo desconocido (404), trabajo sin terminar (409) y
+    formato o rango no válidos (400).
+    """
+    assert client.get('/jobs/desconocido/results').status_code == 404
+
+    release = threading.Event()
+    pending_id = job_queue.submit('run', lambda progress: release.wait(5))
+    try:
+        response = client.get(f'/jobs/{pending_id}/results')
+        assert response.status_code == 409
+        assert response.json()['status'] == 'error'
+    finally:
+        release.set()
+
+    job_id = _run(client)
+    assert client.get(f'/jobs/{job_id}/results', params={'format': 'xml'}).status_code == 400
+    assert client.get(f'/jobs/{job_id}/results', params={'offset': -1}).status_code == 400
+
+def test_evaluation_plan_rejects_invalid_configs(client):
+    """
+    Verifica que _evaluation_plan rechace, sin evaluar, un modo desconocido, pesos con varias versiones y un modo
+    sin soporte fuera de memoria.
+    """
+    dataset = dataset_registry.get(client.app.state.current_dataset)
+    config = {"scoring": {"correct": 1.0, "wrong": 0.0, "blank": 0.0}}
+    assert _evaluation_plan(dataset, 'numpy', config)["mode"] == 'numpy'
+
+    with pytest.raises(ValueError, match="Modo de ejecución no válido"):
+        _evaluation_plan(dataset, 'gpu', config)
+    with pytest.raises(ValueError, match="fuera de memoria"):
+        _evaluation_plan(dataset, 'packed', {**config, "out_of_core_memory_mb": 64})
+
+    key_df = dataset['key_df']
+    two_versions = pd.concat([key_df, key_df.assign(version='B')], ignore_index=True)
+    two_versions['weight_correct'] = 2.0
+    with pytest.raises(ValueError, match="pesos por pregunta"):
+        _evaluation_plan({**dataset, 'key_df': two_versions}, 'numpy', config)
+
+def test_evaluation_job_memoizes_and_records_state(client):
+    """
+    Verifica que evaluation_job, llamado sin la capa HTTP, reutilice los resultados memorizados y deje en el
+    registro el estado de /rescore y /ranking.
+    """
+    dataset_id = client.app.state.current_dataset
+    first = evaluation_job(dataset_registry.get(dataset_id), 'numpy')
+    second = evaluation_job(dataset_registry.get(dataset_id), 'numpy')
+
+    assert not first['cached'] and second['cached']
+    assert second['results'] is first['results']
+    assert len(first['results']) == NUM_STUDENTS
+    entry = dataset_registry.get(dataset_id)
+    assert entry['last_results'] is first['results']
+    assert entry['last_run']['results'] is first['results']
@@ -0,0 +1,98 @@
+import time
+import threading
+import pytest
+import pandas as pd
+from types import SimpleNamespace
+
+from frontend import backend_selection
+from frontend.backend_selection import fit_cost_model, predict_time, choose_mode, append_benchmark_history, candidate_modes
+from frontend.jobs import benchmark_queue, JOB_DONE
+
+def _history(costs: dict) -> pd.DataFrame:
+    """Observaciones exactas de tiempo = costo_fijo + costo_por_celda * celdas en dos tamaños por modo."""
+    rows = []
+    for mode, (overhead, per_cell) in costs.items():
+        for num_students in (1000, 100000):
+            rows.append({"mode": mode, "num_students": num_students, "num_questions": 100, "time": overhead + per_cell * num_students * 100})
+    return pd.DataFrame(rows)
+
+def test_fit_cost_model_recovers_coefficients():
+    """
+    Verifica que el ajuste lineal recupere el costo fijo y el costo por celda de cada modo.
+    """
+    model = fit_cost_model(_history({"serial": (0.001, 1e-8), "cuda": (1.3, 1e-10)}))
+
+    assert model["serial"] == pytest.approx((0.001, 1e-8))
+    assert model["cuda"] == pytest.approx((1.3, 1e-10))
+    # Con bloques el costo fijo se paga por bloque
+    assert predict_time(model["serial"], 1000, 100, chunk_size=100) == pytest.approx(10 * 0.001 + 1e-8 * 1000 * 100)
+
+def test_choose_mode_uses_history(tmp_path, monkeypatch):
+    """
+    Con historial para todos los candidatos no se calibra: 'auto' elige el modo de menor costo
+    fijo en entradas pequeñas y el de menor costo por celda en entradas grandes.
+    """
+    monkeypatch.setattr(backend_selection, "BENCHMARK_HISTORY_PATH", str(tmp_path / "benchmark_history.csv"))
+    monkeypatch.setattr(backend_selection, "schedule_calibration", lambda: pytest.fail("calibración inesperada"))
+    # Extensión nativa simulada (sin GPU): la prueba cubre la elección por historial, no la disponibilidad
+    monkeypatch.setattr(backend_selection, "load_native", lambda: SimpleNamespace(get_device_count=lambda: 0))
+    backend_selection.invalidate_cost_model()
+    costs = {mode: (0.01, 1e-8) for mode in candidate_modes()}
+    costs["serial"] = (0.0001, 2e-8)
+    costs["openmp_simd"] = (0.005, 1e-10)
+    append_benchmark_history(_history(costs))
+
+    assert choose_mode(100, 100) == "serial"
+    assert choose_mode(1000000, 100) == "openmp_simd"
+    assert choose_mode(1000000, 100, candidates=["serial", "openmp"]) == "openmp"
+    backend_selection.invalidate_cost_model()
+
+def test_choose_mode_without_native(tmp_path, monkeypatch):
+    """
+    Sin la extensión nativa el único candidato es 'numpy' y 'auto' lo elige (aunque aún no tenga historial).
+    """
+    monkeypatch.setattr(backend_selection, "BENCHMARK_HISTORY_PATH", str(tmp_path / "benchmark_history.csv"))
+    monkeypatch.setattr(backend_selection, "load_native", lambda: None)
+    monkeypatch.setattr(backend_selection, "schedule_calibration", lambda: None)
+    backend_selection.invalidate_cost_model()
+
+    assert candidate_modes() == ["numpy"]
+    assert choose_mode(1000, 100) == "numpy"
+    assert choose_mode(1000, 100, candidates=["serial", "openmp"]) == "numpy"
+    backend_selection.invalidate_cost_model()
+
+def test_calibration_runs_in_background(tmp_path, monkeypatch):
+    """
+    Sin historial, 'auto' devuelve el modo por defecto de inmediato y encola una sola calibración en
+    benchmark_queue; al terminar, la elección usa el modelo calibrado.
+    """
+    monkeypatch.setattr(backend_selection, "BENCHMARK_HISTORY_PATH", str(tmp_path / "benchmark_history.csv"))
+    monkeypatch.setattr(backend_selection, "load_native", lambda: SimpleNamespace(get_device_count=lambda: 0))
+    release = threading.Event()
+    calibrated = []
+
+    def calibrate(modes):
+        release.wait(5)
+        calibrated.append(modes)
+        costs = {mode: (0.01, 1e-8) for mode in modes}
+        costs["serial"] = (0.0001, 1e-9)
+        return _history(costs)
+
+    monkeypatch.setattr(backend_selection, "calibrate", calibrate)
+    backend_selection.invalidate_cost_model()
+
+    assert choose_mode(1000, 100) == "openmp"
+    job_id = backend_selection.schedule_calibration()
+    assert choose_mode(1000, 100) == "openmp"
+    assert backend_selection.schedule_calibration() == job_id
+    release.set()
+    for _ in range(100):
+        if benchmark_queue.get(job_id)["status"] == JOB_DONE:
+            break
+        time.sleep(0.05)
+
+    assert benchmark_queue.get(job_id)["status"] == JOB_DONE
+    assert len(calibrated) == 1
+    assert choose_mode(1000, 100) == "serial"
+    assert backend_selection.schedule_calibration() is None
+    backend_selection.invalidate_cost_model()
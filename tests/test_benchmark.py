@@ -0,0 +1,21 @@
+import pandas as pd
+import numpy as np
+
+from frontend import benchmark_logic
+from frontend.benchmark_logic import sample_students, reserve_benchmark_slot
+
+def test_sample_and_rate_limit(monkeypatch):
+    """
+    Verifica que la muestra del benchmark sea reproducible y conserve el orden, y que el intervalo mínimo se respete.
+    """
+    students_df = pd.DataFrame({'student_id': np.arange(1000)})
+    sample = sample_students(students_df, 100)
+    assert len(sample) == 100
+    assert sample['student_id'].is_monotonic_increasing
+    assert sample.equals(sample_students(students_df, 100))
+    assert sample_students(students_df, 0) is students_df
+
+    monkeypatch.setattr(benchmark_logic, '_last_benchmark_time', None)
+    assert reserve_benchmark_slot(60) == 0.0
+    assert 0 < reserve_benchmark_slot(60) <= 60
+    assert reserve_benchmark_slot(0) == 0.0
@@ -0,0 +1,69 @@
+import os
+import pytest
+import numpy as np
+
+from frontend.dataset_cache import CACHE_FORMAT_VERSION, DatasetCache, cache_key, hash_source
+
+def test_get_or_parse_uses_cache(tmp_path):
+    """
+    Verifica que un segundo parseo del mismo contenido se sirva desde la caché (memory-mapped).
+    """
+    source = tmp_path / "respuestas.bin"
+    source.write_bytes(b"contenido de prueba")
+    cache = DatasetCache(cache_dir=str(tmp_path / "cache"), max_bytes=10 * 1024 * 1024)
+    calls = []
+
+    def parse(path):
+        calls.append(path)
+        return np.array(['12345678'], dtype=str), np.zeros((1, 100), dtype=np.int8)
+
+    first = cache.get_or_parse(str(source), 'responses', parse, ('student_ids', 'answers'))
+    second = cache.get_or_parse(str(source), 'responses', parse, ('student_ids', 'answers'))
+
+    assert len(calls) == 1
+    assert isinstance(second[1], np.memmap)
+    assert second[0].tolist() == first[0].tolist()
+    assert np.array_equal(second[1], first[1])
+
+def test_cache_key_includes_extension_and_format_version(tmp_path, monkeypatch):
+    """
+    Verifica que el mismo contenido con otra extensión (otro lector) o con otra versión del formato
+    use una entrada distinta de la caché.
+    """
+    source = tmp_path / "respuestas.csv"
+    source.write_bytes(b"contenido de prueba")
+    key = cache_key(str(source), 'responses')
+
+    assert key.startswith(f'responses-csv-v{CACHE_FORMAT_VERSION}-')
+    with open(source, 'rb') as f:
+        assert cache_key(f, 'responses', 'RESPUESTAS.CSV') == key
+        assert cache_key(f, 'responses', 'respuestas.parquet') != key
+    monkeypatch.setattr('frontend.dataset_cache.CACHE_FORMAT_VERSION', CACHE_FORMAT_VERSION + 1)
+    assert cache_key(str(source), 'responses') != key
+
+def test_evict_least_recently_used(tmp_path):
+    """
+    Verifica que, al superar el presupuesto, se desaloje la entrada usada hace más tiempo.
+    """
+    cache = DatasetCache(cache_dir=str(tmp_path / "cache"), max_bytes=2500)
+    block = np.zeros(1000, dtype=np.int8)
+
+    cache.put('a', {'answers': block})
+    cache.put('b', {'answers': block})
+    os.utime(os.path.join(cache.cache_dir, 'a'), (1, 1))
+    os.utime(os.path.join(cache.cache_dir, 'b'), (2, 2))
+    cache.put('c', {'answers': block})
+
+    assert cache.get('a') is None
+    assert cache.get('b') is not None
+    assert cache.get('c') is not None
+
+def test_hash_source_rewinds_file(tmp_path):
+    """
+    Verifica que el hash de un archivo abierto lo deje listo para volver a leerse.
+    """
+    source = tmp_path / "clave.bin"
+    source.write_bytes(b"abc")
+    with open(source, 'rb') as f:
+        assert hash_source(f) == hash_source(str(source))
+        assert f.read() == b"abc"
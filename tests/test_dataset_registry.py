@@ -0,0 +1,81 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from frontend import dataset_registry as dataset_registry_module
+from frontend.dataset_cache import DatasetCache
+from frontend.dataset_registry import DatasetRegistry, RESPONSE_ARRAYS
+from frontend.encoding import INVALID_CODE
+
+def _arrays(num_students: int, value: int):
+    student_ids = np.array([f'{i:08d}' for i in range(num_students)])
+    answers = np.full((num_students, 100), value, dtype=np.int8)
+    versions = np.array(['A'] * num_students)
+    return student_ids, answers, versions
+
+def _key_df():
+    return pd.DataFrame({'version': ['A'] * 100, 'question_id': range(1, 101), 'correct_answer': [0] * 100})
+
+def test_evicts_least_recently_used_and_reloads(tmp_path):
+    """
+    Verifica que, al superar el presupuesto, se descargue el dataset usado hace más tiempo y que
+    vuelva a cargarse desde la caché en disco con los mismos datos y su estado de evaluación.
+    """
+    cache = DatasetCache(cache_dir=str(tmp_path / "cache"), max_bytes=10 * 1024 * 1024)
+    # Cada dataset ocupa unos 136 KB (respuestas + identificadores): caben dos residentes, no tres
+    registry = DatasetRegistry(cache=cache, max_bytes=300_000)
+
+    registry.register('ciencias', _arrays(1000, 1), _key_df(), dataset_id='ciencias')
+    registry.update('ciencias', last_results='resultados')
+    registry.register('letras', _arrays(1000, 2), _key_df(), dataset_id='letras')
+    registry.get('ciencias')
+    registry.register('ingenierias', _arrays(1000, 3), _key_df(), dataset_id='ingenierias')
+
+    resident = {entry['dataset_id']: entry['resident'] for entry in registry.list()}
+    assert resident == {'ciencias': True, 'letras': False, 'ingenierias': True}
+
+    letras = registry.get('letras')
+    assert np.array_equal(letras['arrays']['answers'], np.full((1000, 100), 2, dtype=np.int8))
+    assert len(letras['students_df']) == 1000
+    assert registry.get('ciencias')['last_results'] == 'resultados'
+    assert registry.resident_bytes() <= 300_000
+
+def test_unknown_dataset_raises(tmp_path):
+    """
+    Verifica que un dataset inexistente o eliminado produzca KeyError.
+    """
+    registry = DatasetRegistry(cache=DatasetCache(cache_dir=str(tmp_path / "cache")), max_bytes=1024 * 1024)
+    dataset_id = registry.register('k', _arrays(10, 0), _key_df())
+
+    assert registry.remove(dataset_id)
+    with pytest.raises(KeyError):
+        registry.get(dataset_id)
+
+def test_packed_answers_are_packed_once_and_persisted(tmp_path, monkeypatch):
+    """
+    Verifica que los planos de bits se empaqueten una sola vez, cuenten como memoria residente y queden en la
+    entrada de la caché en disco, de donde los reutiliza otro registro sin volver a empaquetar.
+    """
+    pytest.importorskip("pyevalcore")
+    cache = DatasetCache(cache_dir=str(tmp_path / "cache"), max_bytes=10 * 1024 * 1024)
+    arrays = _arrays(200, 2)
+    arrays[1][:, 0] = INVALID_CODE
+    cache.put('ciencias', dict(zip(RESPONSE_ARRAYS, arrays)))
+    calls = []
+    pack_answers = dataset_registry_module.pack_answers
+    monkeypatch.setattr(dataset_registry_module, 'pack_answers', lambda answers: calls.append(len(answers)) or pack_answers(answers))
+
+    registry = DatasetRegistry(cache=cache, max_bytes=10 * 1024 * 1024)
+    registry.register('ciencias', arrays, _key_df(), dataset_id='ciencias')
+    bytes_before = registry.resident_bytes()
+    packed = registry.packed_answers('ciencias')
+
+    assert registry.packed_answers('ciencias') is packed
+    assert calls == [200]
+    assert registry.resident_bytes() == bytes_before + packed.nbytes
+    assert np.array_equal(cache.get('ciencias')['packed'], packed)
+
+    other = DatasetRegistry(cache=cache, max_bytes=10 * 1024 * 1024)
+    other.register('ciencias', arrays, _key_df(), dataset_id='ciencias')
+    assert np.array_equal(other.packed_answers('ciencias'), packed)
+    assert calls == [200]
@@ -0,0 +1,39 @@
+import pytest
+import pandas as pd
+import numpy as np
+
+from frontend.encoding import ANSWER_COLS, encode_answers, encode_key, encode_answer_bytes
+
+def test_encode_answers_letters(backend):
+    """
+    Verifica que letras, minúsculas, espacios, NaN y valores inválidos se codifiquen igual que antes.
+    """
+    df = pd.DataFrame([['A', ' b', 'c ', 'D', '', np.nan, 'X'] + ['A'] * 93], columns=ANSWER_COLS)
+    encoded = encode_answers(df)
+    assert encoded.dtype == np.int8
+    assert encoded.shape == (1, 100)
+    assert encoded[0, :7].tolist() == [0, 1, 2, 3, -1, -1, -1]
+
+def test_encode_answers_numeric(backend):
+    """
+    Verifica que un DataFrame ya codificado (0-3, -1) se conserve sin cambios.
+    """
+    values = np.random.randint(-1, 4, size=(5, 100)).astype(np.int8)
+    df = pd.DataFrame(values, columns=ANSWER_COLS)
+    assert np.array_equal(encode_answers(df), values)
+
+def test_encode_key_letters_and_codes(backend):
+    """
+    Verifica que la clave se ordene por question_id y acepte letras o códigos numéricos.
+    """
+    key_letters = pd.Series(['B', 'A', 'D'], index=[2, 1, 3])
+    key_codes = pd.Series([1, 0, 3], index=[2, 1, 3])
+    assert encode_key(key_letters).tolist() == [0, 1, 3]
+    assert encode_key(key_codes).tolist() == [0, 1, 3]
+
+def test_encode_answer_bytes(backend):
+    """
+    Verifica la tabla de búsqueda (nativa o NumPy) sobre celdas de un byte.
+    """
+    cells = np.array([[b'A', b'b', b' ', b'D', b'*']], dtype='S1')
+    assert encode_answer_bytes(cells).tolist() == [[0, 1, -1, 3, -1]]
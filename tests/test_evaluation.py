@@ -0,0 +1,427 @@
+import pytest
+import pandas as pd
+import numpy as np
+
+from types import SimpleNamespace
+from frontend import native
+from frontend.numpy_backend import RESULT_DTYPE, evaluate_numpy, item_analysis_numpy
+from frontend.out_of_core import OUT_OF_CORE_MODES, answers_file, evaluate_out_of_core, window_rows
+from frontend.encoding import ANSWER_COLS, ANNULLED_CODE, INVALID_CODE, encode_answers, encode_key, encode_answer_bytes
+from frontend.evaluation_logic import pack_answers, run_packed_planes, run_serial, run_openmp, run_pthreads, run_packed, run_simd, run_openmp_simd, run_pthreads_simd, run_numpy, run_versions, run_weighted, run_sections, section_labels, career_coefficients, run_item_analysis, rescore, run_out_of_core
+
+try:
+    import pyevalcore
+except ImportError:
+    pyevalcore = None
+
+# Pruebas de los kernels nativos; las de frontend usan el fixture backend y también corren sin pyevalcore
+requires_native = pytest.mark.skipif(pyevalcore is None, reason="pyevalcore no está compilado")
+
+RULE = {'correct': 20.0, 'wrong': -1.125, 'blank': 0.0}
+
+def _sample_data(num_students=50):
+    rng = np.random.default_rng(7)
+    answers = rng.integers(-1, 4, size=(num_students, 100)).astype(np.int8)
+    df_answers = pd.DataFrame(answers, columns=ANSWER_COLS)
+    df_answers.insert(0, 'student_id', [f'{10000000 + i}' for i in range(num_students)])
+    series_key = pd.Series(rng.integers(0, 4, size=100), index=range(1, 101))
+    return df_answers, series_key
+
+def _scoring_rule():
+    rule = pyevalcore.ScoringRule()
+    rule.correct = RULE['correct']
+    rule.wrong = RULE['wrong']
+    rule.blank = RULE['blank']
+    return rule
+
+@requires_native
+def test_array_entry_points_match_dict_results():
+    """
+    Verifica que las funciones columnares devuelvan lo mismo que las basadas en listas de diccionarios.
+    """
+    df_answers, series_key = _sample_data()
+    answers = np.ascontiguousarray(df_answers[ANSWER_COLS].to_numpy())
+    key = series_key.to_numpy().astype(np.int8)
+
+    expected = pd.DataFrame(pyevalcore.run_serial(answers, key, _scoring_rule()))
+    results_arr = pyevalcore.run_serial_array(answers, key, _scoring_rule())
+
+    assert results_arr.dtype.names == ('score', 'correct', 'wrong', 'blank')
+    for field in results_arr.dtype.names:
+        assert np.array_equal(results_arr[field], expected[field].to_numpy())
+
+@requires_native
+@pytest.mark.parametrize("run_fn", [run_serial, run_openmp, run_pthreads, run_packed, run_simd, run_openmp_simd, run_pthreads_simd, run_numpy])
+def test_modes_agree(run_fn):
+    """
+    Verifica que todos los modos CPU produzcan resultados idénticos al modo serial.
+    """
+    df_answers, series_key = _sample_data()
+    expected = run_serial(df_answers, series_key, RULE)
+    results = run_fn(df_answers, series_key, RULE)
+
+    assert list(results.columns) == ['student_id', 'score', 'correct', 'wrong', 'blank']
+    assert results['student_id'].tolist() == df_answers['student_id'].tolist()
+    pd.testing.assert_frame_equal(results, expected)
+
+@requires_native
+def test_modes_return_identical_scores():
+    """
+    Verifica que con pesos no enteros todos los modos devuelvan exactamente el mismo puntaje (sin diferencias
+    de redondeo), ya que la caché de resultados no distingue el modo con el que se calculó.
+    """
+    df_answers, series_key = _sample_data(500)
+    rule = {'correct': 1 / 3, 'wrong': -0.1, 'blank': 0.0}
+    expected = run_serial(df_answers, series_key, rule)['score'].to_numpy()
+
+    for run_fn in (run_openmp, run_pthreads, run_packed, run_simd, run_openmp_simd, run_pthreads_simd, run_numpy):
+        assert np.array_equal(run_fn(df_answers, series_key, rule)['score'].to_numpy(), expected), run_fn.__name__
+
+@requires_native
+@pytest.mark.parametrize("num_questions", [5, 64, 100, 130])
+def test_packed_matches_serial_with_invalid_key(num_questions):
+    """
+    Verifica el kernel empaquetado con anchos que no son múltiplo de 64 y claves inválidas (-1).
+    """
+    rng = np.random.default_rng(num_questions)
+    answers = rng.integers(-1, 4, size=(40, num_questions)).astype(np.int8)
+    key = rng.integers(-1, 4, size=num_questions).astype(np.int8)
+
+    packed = pyevalcore.pack_answers(answers)
+    assert packed.shape == (40, 3 * ((num_questions + 63) // 64))
+
+    expected = pyevalcore.run_serial_array(answers, key, _scoring_rule())
+    results = pyevalcore.run_packed_array(packed, key, _scoring_rule())
+    for field in ('correct', 'wrong', 'blank'):
+        assert np.array_equal(results[field], expected[field])
+    assert np.allclose(results['score'], expected['score'])
+
+@requires_native
+def test_packed_planes_reject_or_normalize_invalid_codes():
+    """
+    Verifica que el kernel nativo rechace empaquetar códigos fuera de -1..3 (que los planos contarían como
+    blanco) y que pack_answers los normalice a blanco, igual que los demás modos.
+    """
+    df_answers, series_key = _sample_data()
+    df_answers.iloc[::3, 1:11] = INVALID_CODE
+    answers = np.ascontiguousarray(df_answers[ANSWER_COLS].to_numpy(dtype=np.int8))
+    with pytest.raises(ValueError, match="outside -1..3"):
+        pyevalcore.pack_answers(answers)
+
+    results = run_packed_planes(pack_answers(answers), df_answers['student_id'].to_numpy(), series_key, RULE)
+    pd.testing.assert_frame_equal(results, run_serial(df_answers, series_key, RULE))
+
+@requires_native
+@pytest.mark.parametrize("instruction_set", ["avx2", "sse2", "scalar"])
+def test_simd_kernels_match_serial(instruction_set):
+    """
+    Verifica cada ruta del despacho SIMD (limitada a lo que soporta la CPU) con anchos que no son
+    múltiplo de 16/32, respuestas inválidas (-2) y claves inválidas (-1).
+    """
+    rng = np.random.default_rng(11)
+    original = pyevalcore.simd_instruction_set()
+    try:
+        active = pyevalcore.set_simd_instruction_set(instruction_set)
+        assert active in ("avx2", "sse2", "scalar")
+        for num_questions in (7, 16, 33, 100):
+            answers = rng.integers(-2, 4, size=(600, num_questions)).astype(np.int8)
+            key = rng.integers(-1, 4, size=num_questions).astype(np.int8)
+            expected = pyevalcore.run_serial_array(answers, key, _scoring_rule())
+            for native_fn in (pyevalcore.run_simd_array, pyevalcore.run_openmp_simd_array, pyevalcore.run_pthreads_simd_array):
+                assert np.array_equal(native_fn(answers, key, _scoring_rule()), expected)
+    finally:
+        pyevalcore.set_simd_instruction_set(original)
+
+@requires_native
+def test_numpy_backend_without_native_module(monkeypatch):
+    """
+    Simula una máquina sin pyevalcore: el modo NumPy y la codificación siguen funcionando
+    (y coinciden con el kernel nativo), mientras que los modos nativos fallan con un error claro.
+    """
+    rng = np.random.default_rng(2)
+    answers = rng.integers(-2, 4, size=(300, 37)).astype(np.int8)
+    key = rng.integers(-1, 4, size=37).astype(np.int8)
+    cells = np.array([b'A', b'b', b' ', b'X', b'\0'], dtype='S1')
+    expected = pyevalcore.run_serial_array(answers, key, _scoring_rule())
+    expected_codes = encode_answer_bytes(cells, INVALID_CODE)
+    df_answers, series_key = _sample_data()
+    expected_frame = run_serial(df_answers, series_key, RULE)
+
+    monkeypatch.setattr(native, '_native_module', None)
+    monkeypatch.setattr(native, '_native_import_error', ImportError('pyevalcore no compilado'))
+
+    assert np.array_equal(evaluate_numpy(answers, key, SimpleNamespace(**RULE)), expected)
+    assert np.array_equal(encode_answer_bytes(cells, INVALID_CODE), expected_codes)
+    pd.testing.assert_frame_equal(run_numpy(df_answers, series_key, RULE), expected_frame)
+    with pytest.raises(RuntimeError, match='numpy'):
+        run_serial(df_answers, series_key, RULE)
+
+def test_run_versions_matches_per_version_scoring(backend):
+    """
+    Verifica que la evaluación multi-versión en una pasada coincida con evaluar cada versión por separado.
+    """
+    df_answers, _ = _sample_data(90)
+    df_answers.insert(1, 'version', ['A', 'B', 'C'] * 30)
+    rng = np.random.default_rng(13)
+    key_df = pd.concat([
+        pd.DataFrame({'version': version, 'question_id': np.arange(1, 101), 'correct_answer': rng.integers(0, 4, size=100)})
+        for version in ('C', 'A', 'B')
+    ], ignore_index=True)
+
+    results = run_versions(df_answers, key_df, RULE)
+
+    for version in ('A', 'B', 'C'):
+        rows = df_answers['version'] == version
+        group_key = key_df[key_df['version'] == version].set_index('question_id')['correct_answer']
+        expected = run_numpy(df_answers[rows], group_key, RULE)
+        pd.testing.assert_frame_equal(results[rows.to_numpy()].reset_index(drop=True), expected)
+
+    df_answers.loc[0, 'version'] = 'Z'
+    with pytest.raises(ValueError):
+        run_versions(df_answers, key_df, RULE)
+
+@pytest.mark.parametrize("mode", ["serial", "openmp", "pthreads"])
+def test_run_weighted_matches_numpy_reference(mode, backend):
+    """
+    Verifica la puntuación ponderada por pregunta contra un cálculo de referencia con NumPy.
+    """
+    df_answers, series_key = _sample_data(600)
+    rng = np.random.default_rng(17)
+    weights = pd.DataFrame({
+        'correct': rng.uniform(1, 5, size=100),
+        'wrong': rng.uniform(-1, 0, size=100),
+        'blank': np.where(rng.random(100) < 0.5, np.nan, 0.25),
+    }, index=series_key.index)
+
+    results = run_weighted(df_answers, series_key, weights, RULE, mode=mode)
+
+    answers = df_answers[ANSWER_COLS].to_numpy()
+    key = series_key.to_numpy()
+    is_blank = answers == -1
+    is_correct = answers == key
+    is_wrong = ~is_blank & ~is_correct
+    blank_weights = weights['blank'].fillna(RULE['blank']).to_numpy()
+    expected_score = is_correct @ weights['correct'].to_numpy() + is_wrong @ weights['wrong'].to_numpy() + is_blank @ blank_weights
+
+    assert np.allclose(results['score'], expected_score)
+    assert np.array_equal(results['correct'], is_correct.sum(axis=1))
+    assert np.array_equal(results['wrong'], is_wrong.sum(axis=1))
+    assert np.array_equal(results['blank'], is_blank.sum(axis=1))
+
+def test_run_sections_subscores_and_careers(backend):
+    """
+    Verifica que los subpuntajes por sección sumen el total y que los compuestos por carrera sean su combinación lineal.
+    """
+    df_answers, series_key = _sample_data()
+    labels = section_labels(series_key.index, {'matematica': [1, 40], 'verbal': [41, 70], 'ciencias': [71, 95]})
+    sections = pd.Series(labels, index=series_key.index)
+    careers = career_coefficients({'ingenieria': {'matematica': 0.6, 'ciencias': 0.4}, 'derecho': {'verbal': 1.0}})
+
+    results = run_sections(df_answers, series_key, sections, RULE, careers)
+    expected = run_numpy(df_answers, series_key, RULE)
+    pd.testing.assert_frame_equal(results[expected.columns], expected)
+
+    answers = df_answers[ANSWER_COLS].to_numpy()
+    key = series_key.to_numpy()
+    points = np.where(answers == key, RULE['correct'], np.where(answers == -1, 0.0, RULE['wrong']))
+    for name, (first, last) in {'matematica': (1, 40), 'verbal': (41, 70), 'ciencias': (71, 95)}.items():
+        assert np.allclose(results[f'section_{name}'], points[:, first - 1:last].sum(axis=1))
+    assert np.allclose(results['career_ingenieria'], 0.6 * results['section_matematica'] + 0.4 * results['section_ciencias'])
+    assert np.allclose(results['career_derecho'], results['section_verbal'])
+
+def test_run_item_analysis_matches_numpy_reference(backend):
+    """
+    Compara las frecuencias, la dificultad y la discriminación nativas con un cálculo directo en NumPy.
+    """
+    df_answers, series_key = _sample_data(200)
+    # Puntajes sin empates para que los grupos superior e inferior estén definidos de forma única
+    scores = np.random.default_rng(3).permutation(len(df_answers)).astype(np.float64)
+    items = run_item_analysis(df_answers, series_key, scores)
+
+    answers = df_answers[ANSWER_COLS].to_numpy()
+    key = series_key.sort_index().to_numpy()
+    for code, option in enumerate(['A', 'B', 'C', 'D']):
+        assert np.array_equal(items[f'count_{option}'], (answers == code).sum(axis=0))
+    assert np.array_equal(items['count_blank'], (answers == -1).sum(axis=0))
+    assert np.allclose(items['difficulty'], (answers == key).mean(axis=0))
+
+    group_size = int(0.27 * len(scores))
+    order = np.argsort(scores)
+    lower, upper = order[:group_size], order[-group_size:]
+    expected = ((answers[upper] == key).sum(axis=0) - (answers[lower] == key).sum(axis=0)) / group_size
+    assert np.allclose(items['discrimination'], expected)
+    assert np.array_equal(items['question_id'], series_key.index)
+
+@requires_native
+def test_item_analysis_numpy_matches_native():
+    """
+    Verifica que el análisis de ítems en NumPy (sin módulo nativo) coincida con el nativo.
+    """
+    df_answers, series_key = _sample_data(200)
+    answers_np, key_np = encode_answers(df_answers), encode_key(series_key)
+    scores = np.random.default_rng(5).permutation(len(df_answers)).astype(np.float64)
+
+    expected = pyevalcore.item_analysis(answers_np, key_np, scores, 0.27)
+    actual = item_analysis_numpy(answers_np, key_np, scores, 0.27)
+    assert np.array_equal(actual['option_counts'], expected['option_counts'])
+    assert np.allclose(actual['difficulty'], expected['difficulty'])
+    assert np.allclose(actual['discrimination'], expected['discrimination'])
+
+def test_rescore_matches_full_evaluation(backend):
+    """
+    Corrige dos preguntas y anula una: el delta incremental debe coincidir con evaluar desde cero
+    con la clave corregida (la pregunta anulada equivale a quitar su columna).
+    """
+    df_answers, series_key = _sample_data(300)
+    answers_np = encode_answers(df_answers)
+    old_key_np = encode_key(series_key)
+    df_results = run_numpy(df_answers, series_key, RULE)
+
+    new_key_np = old_key_np.copy()
+    new_key_np[4] = (new_key_np[4] + 1) % 4
+    new_key_np[40] = (new_key_np[40] + 2) % 4
+    new_key_np[70] = ANNULLED_CODE
+    rescored = rescore(df_results, answers_np, old_key_np, new_key_np, RULE)
+
+    kept = new_key_np != ANNULLED_CODE
+    expected = evaluate_numpy(answers_np[:, kept], new_key_np[kept], SimpleNamespace(**RULE))
+    assert np.array_equal(rescored['score'], expected['score'])
+    for field in ('correct', 'wrong', 'blank'):
+        assert np.array_equal(rescored[field], expected[field])
+    assert np.array_equal(rescored['student_id'], df_results['student_id'])
+
+    # Revertir la corrección devuelve los resultados originales
+    restored = rescore(rescored, answers_np, new_key_np, old_key_np, RULE)
+    assert np.array_equal(restored['score'], df_results['score'])
+    assert np.array_equal(restored['correct'], df_results['correct'])
+
+@requires_native
+def test_pthreads_pool_reuse_and_resize():
+    """
+    Verifica que el pool persistente de pthreads reparta bien el trabajo entre llamadas y tras cambiar de tamaño.
+    """
+    rng = np.random.default_rng(11)
+    answers = rng.integers(-1, 4, size=(3000, 100)).astype(np.int8)
+    key = rng.integers(0, 4, size=100).astype(np.int8)
+    expected = pyevalcore.run_serial_array(answers, key, _scoring_rule())
+
+    original_size = pyevalcore.pthreads_pool_size()
+    try:
+        for num_threads in (3, 3, 1, 5):
+            pyevalcore.set_pthreads_pool_size(num_threads)
+            assert pyevalcore.pthreads_pool_size() == num_threads
+            results = pyevalcore.run_pthreads_array(answers, key, _scoring_rule())
+            assert np.array_equal(results, expected)
+    finally:
+        pyevalcore.set_pthreads_pool_size(original_size)
+
+@requires_native
+def test_pthreads_pool_shared_by_concurrent_evaluations():
+    """
+    Verifica que dos evaluaciones pthreads simultáneas compartan el pool: una pequeña no espera a que termine
+    otra grande en curso, y ambas dan los mismos resultados que el modo serial.
+    """
+    import threading
+    import time
+
+    rng = np.random.default_rng(13)
+    large = rng.integers(-1, 4, size=(1000000, 100)).astype(np.int8)
+    small = rng.integers(-1, 4, size=(3000, 100)).astype(np.int8)
+    key = rng.integers(0, 4, size=100).astype(np.int8)
+    results = {}
+    durations = {}
+
+    def evaluate(name, answers):
+        start = time.perf_counter()
+        results[name] = pyevalcore.run_pthreads_array(answers, key, _scoring_rule())
+        durations[name] = time.perf_counter() - start
+
+    original_size = pyevalcore.pthreads_pool_size()
+    try:
+        pyevalcore.set_pthreads_pool_size(2)
+        worker = threading.Thread(target=evaluate, args=('large', large))
+        worker.start()
+        time.sleep(0.05)
+        evaluate('small', small)
+        worker.join()
+    finally:
+        pyevalcore.set_pthreads_pool_size(original_size)
+
+    # Con el pool serializado, la evaluación pequeña duraría casi lo mismo que la grande
+    assert durations['small'] < durations['large'] / 4
+    assert np.array_equal(results['small'], pyevalcore.run_serial_array(small, key, _scoring_rule()))
+    assert np.array_equal(results['large'], pyevalcore.run_serial_array(large, key, _scoring_rule()))
+
+@requires_native
+def test_evaluation_releases_gil():
+    """
+    Verifica que la evaluación nativa libere el GIL: el hilo principal sigue avanzando mientras otro hilo evalúa.
+    """
+    import threading
+    import time
+
+    rng = np.random.default_rng(5)
+    answers = rng.integers(-1, 4, size=(400000, 100)).astype(np.int8)
+    key = rng.integers(0, 4, size=100).astype(np.int8)
+    durations = []
+
+    def evaluate():
+        start = time.perf_counter()
+        pyevalcore.run_serial_array(answers, key, _scoring_rule())
+        durations.append(time.perf_counter() - start)
+
+    # Mayor pausa del hilo principal mientras el otro hilo evalúa; con el GIL retenido sería toda la evaluación
+    max_gap = 0.0
+    last = time.perf_counter()
+    worker = threading.Thread(target=evaluate)
+    worker.start()
+    while worker.is_alive():
+        now = time.perf_counter()
+        max_gap = max(max_gap, now - last)
+        last = now
+    worker.join()
+
+    assert max_gap < durations[0] / 2
+
+@requires_native
+def test_out_of_core_matches_in_memory(tmp_path):
+    """
+    Verifica que la evaluación por ventanas desde un .npy memory-mapped coincida con la evaluación en memoria,
+    con una ventana que no divide exactamente al número de estudiantes.
+    """
+    df_answers, series_key = _sample_data(num_students=53)
+    answers = encode_answers(df_answers)
+    key = encode_key(series_key)
+    expected = run_serial(df_answers, series_key, RULE)
+    memory_mb = 7 * (2 * 100 + pyevalcore.RESULT_DTYPE.itemsize) / (1024 * 1024)
+    assert window_rows(100, memory_mb) == 7
+
+    answers_path = answers_file(answers, memory_mb, directory=str(tmp_path))
+    # Un memory-map completo del .npy se reutiliza sin copiarlo
+    assert answers_file(np.load(answers_path, mmap_mode='r'), memory_mb) == answers_path
+    for mode in OUT_OF_CORE_MODES:
+        results = evaluate_out_of_core(answers_path, key, _scoring_rule(), str(tmp_path / f'{mode}.npy'), mode, memory_mb)
+        assert isinstance(results, np.memmap)
+        np.testing.assert_allclose(results['score'], expected['score'].to_numpy())
+        for field in ('correct', 'wrong', 'blank'):
+            np.testing.assert_array_equal(results[field], expected[field].to_numpy())
+
+def test_out_of_core_normalizes_invalid_codes(tmp_path, monkeypatch, backend):
+    """
+    Verifica que run_out_of_core cuente como en blanco las respuestas inválidas y anuladas igual que la
+    evaluación en memoria, y que no deje archivos temporales en OUT_OF_CORE_DIR.
+    """
+    monkeypatch.chdir(tmp_path)
+    df_answers, series_key = _sample_data(num_students=53)
+    df_answers.iloc[::3, 1:11] = INVALID_CODE
+    df_answers.iloc[1::4, 50:60] = ANNULLED_CODE
+    answers = np.ascontiguousarray(df_answers[ANSWER_COLS].to_numpy(dtype=np.int8))
+    expected = run_numpy(df_answers, series_key, RULE)
+    memory_mb = 7 * (2 * 100 + RESULT_DTYPE.itemsize) / (1024 * 1024)
+    mode = 'serial' if backend == 'native' else 'numpy'
+
+    results = run_out_of_core(answers, df_answers['student_id'].to_numpy(), series_key, RULE, mode, memory_mb)
+
+    pd.testing.assert_frame_equal(results, expected)
+    assert (results['blank'] > 0).all()
+    assert list((tmp_path / 'cache' / 'out_of_core').iterdir()) == []
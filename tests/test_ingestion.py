@@ -0,0 +1,97 @@
+import pytest
+import pandas as pd
+import numpy as np
+
+from frontend.encoding import ANSWER_COLS, INVALID_CODE, encode_values
+from frontend.ingestion import DEFAULT_KEY_VERSION, read_responses, read_responses_xlsx, read_responses_fixed_width, responses_frame
+
+def _write_responses(path, num_students=30):
+    rng = np.random.default_rng(3)
+    data = {'DNI': [10000000 + i for i in range(num_students)]}
+    for col in ANSWER_COLS:
+        data[col] = rng.choice(['A', 'B', 'C', 'D', '', 'x'], size=num_students)
+    df = pd.DataFrame(data)
+    df.to_excel(path, index=False)
+    return df
+
+def test_read_responses_xlsx_matches_pandas(tmp_path, backend):
+    """
+    Verifica que la lectura por lotes produzca la misma matriz que pd.read_excel + encode_answers.
+    """
+    path = tmp_path / "respuestas.xlsx"
+    df = _write_responses(path)
+
+    student_ids, answers, versions = read_responses_xlsx(path, batch_rows=7)
+
+    assert answers.dtype == np.int8
+    assert answers.shape == (len(df), 100)
+    assert student_ids.tolist() == df['DNI'].astype(str).tolist()
+    expected = encode_values(pd.read_excel(path)[ANSWER_COLS].to_numpy(dtype=object), invalid_code=INVALID_CODE)
+    assert np.array_equal(answers, expected)
+    assert (answers == INVALID_CODE).any()
+    assert (versions == DEFAULT_KEY_VERSION).all()
+
+    df_compact = responses_frame(student_ids, answers)
+    assert list(df_compact.columns) == ['student_id'] + ANSWER_COLS
+
+def test_read_responses_xlsx_missing_columns(tmp_path):
+    """
+    Verifica que se rechace un archivo sin la columna 'DNI'.
+    """
+    path = tmp_path / "sin_dni.xlsx"
+    _write_responses(path).drop(columns=['DNI']).to_excel(path, index=False)
+
+    with pytest.raises(ValueError):
+        read_responses_xlsx(path)
+
+@pytest.mark.parametrize("extension", [".csv", ".parquet", ".feather"])
+def test_read_responses_formats_match_xlsx(tmp_path, extension, backend):
+    """
+    Verifica que los lectores CSV y Parquet/Arrow produzcan la misma matriz que el lector xlsx.
+    """
+    if extension != ".csv":
+        pytest.importorskip("pyarrow")
+    xlsx_path = tmp_path / "respuestas.xlsx"
+    df = _write_responses(xlsx_path)
+    df.insert(1, 'version', ['A', 'B', None] * (len(df) // 3))
+    df.to_excel(xlsx_path, index=False)
+    path = tmp_path / f"respuestas{extension}"
+    if extension == ".csv":
+        df.to_csv(path, index=False)
+    elif extension == ".parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_feather(path)
+
+    student_ids, answers, versions = read_responses(path, str(path))
+    expected_ids, expected_answers, expected_versions = read_responses_xlsx(xlsx_path)
+
+    assert student_ids.tolist() == expected_ids.tolist()
+    assert np.array_equal(answers, expected_answers)
+    assert versions.tolist() == expected_versions.tolist() == ['A', 'B', DEFAULT_KEY_VERSION] * (len(df) // 3)
+
+def test_read_responses_fixed_width(tmp_path, backend):
+    """
+    Verifica la lectura del texto de ancho fijo de la lectora óptica (con y sin salto final).
+    """
+    lines = ["02929581" + "ABCD x" * 16 + "ABCD", "10000001" + " " * 100]
+    path = tmp_path / "lectora.txt"
+    path.write_bytes("\r\n".join(lines).encode())
+
+    student_ids, answers, _ = read_responses_fixed_width(path)
+
+    assert student_ids.tolist() == ["02929581", "10000001"]
+    assert answers.shape == (2, 100)
+    assert answers[0, :6].tolist() == [0, 1, 2, 3, -1, INVALID_CODE]
+    assert (answers[1] == -1).all()
+
+    path.write_bytes(b"12345678ABC\n")
+    with pytest.raises(ValueError):
+        read_responses_fixed_width(path)
+
+def test_read_responses_unsupported_extension(tmp_path):
+    """
+    Verifica que se rechacen extensiones desconocidas.
+    """
+    with pytest.raises(ValueError):
+        read_responses(tmp_path / "respuestas.pdf", "respuestas.pdf")
@@ -0,0 +1,58 @@
+import time
+import threading
+
+from frontend.jobs import JobQueue, JOB_DONE, JOB_FAILED, JOB_RUNNING
+
+def _wait(queue, job_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while queue.get(job_id)["status"] not in (JOB_DONE, JOB_FAILED):
+        assert time.time() < deadline
+        time.sleep(0.01)
+    return queue.get(job_id)
+
+def test_job_reports_progress_and_result():
+    """
+    Verifica que submit responda antes de que el trabajo termine y que el progreso y el resultado se puedan consultar.
+    """
+    queue = JobQueue(max_workers=1)
+    release = threading.Event()
+
+    def work(total, progress=None):
+        for completed in range(1, total + 1):
+            progress(completed, total, 'evaluation')
+            if completed == 2:
+                release.wait(5)
+        return {"answer": 42}
+
+    job_id = queue.submit("run", work, 3)
+    deadline = time.time() + 5
+    while queue.get(job_id)["progress"]["completed"] < 2:
+        assert time.time() < deadline
+        time.sleep(0.01)
+    job = queue.get(job_id)
+    assert job["status"] == JOB_RUNNING
+    assert job["progress"] == {"completed": 2, "total": 3}
+    assert queue.result(job_id) is None
+
+    release.set()
+    job = _wait(queue, job_id)
+    assert job["status"] == JOB_DONE and job["stage"] == 'evaluation'
+    assert queue.result(job_id) == {"answer": 42}
+
+def test_failed_jobs_and_history_limit():
+    """
+    Verifica que una excepción marque el trabajo como fallido y que solo se conserven los trabajos más recientes.
+    """
+    queue = JobQueue(max_workers=1, max_history=2)
+
+    def fail(progress=None):
+        raise ValueError("configuración no válida")
+
+    failed = queue.submit("run", fail)
+    assert _wait(queue, failed)["error"] == "configuración no válida"
+
+    later = [queue.submit("run", lambda progress=None: None) for _ in range(2)]
+    for job_id in later:
+        _wait(queue, job_id)
+    assert queue.get(failed) is None
+    assert all(queue.get(job_id) is not None for job_id in later)
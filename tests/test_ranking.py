@@ -0,0 +1,57 @@
+import pytest
+import pandas as pd
+import numpy as np
+
+from frontend.ranking import rank_results, admission_cutoffs
+
+def _results(num_students=500):
+    rng = np.random.default_rng(4)
+    correct = rng.integers(0, 20, size=num_students)
+    # Puntajes con muchos empates para ejercitar el desempate y los rangos compartidos
+    return pd.DataFrame({
+        'student_id': [f'{20000000 + i}' for i in range(num_students)],
+        'score': rng.integers(0, 10, size=num_students).astype(np.float64) * 10,
+        'correct': correct,
+        'career_medicina': rng.integers(0, 50, size=num_students).astype(np.float64),
+        'career_derecho': rng.integers(0, 50, size=num_students).astype(np.float64),
+    })
+
+@pytest.mark.parametrize("method,pandas_method", [("competition", "min"), ("dense", "dense")])
+def test_rank_results_matches_pandas(method, pandas_method, backend):
+    """
+    Compara los rangos (nativos o NumPy) con pandas: el puntaje y el desempate forman juntos la clave de orden.
+    """
+    df_results = _results()
+    ranked = rank_results(df_results, tiebreak_col='correct', method=method)
+
+    combined_key = df_results['score'] * 1000 + df_results['correct']
+    expected = combined_key.rank(method=pandas_method, ascending=False).astype(int)
+    by_student = ranked.set_index('student_id')['rank']
+    assert np.array_equal(by_student.loc[df_results['student_id']].to_numpy(), expected.to_numpy())
+    # Orden de mérito: el puntaje nunca sube a lo largo del ranking
+    assert (np.diff(ranked['score']) <= 0).all()
+    assert (np.diff(ranked['rank']) >= 0).all()
+
+def test_admission_cutoffs_with_ties_and_applicants(backend):
+    """
+    Verifica la selección parcial por carrera contra un ordenamiento completo, con y sin empates
+    en la última vacante, y restringida a la carrera a la que postula cada estudiante.
+    """
+    df_results = _results()
+    vacancies = {'medicina': 7, 'derecho': 30}
+
+    for include_ties in (True, False):
+        admitted, cutoffs = admission_cutoffs(df_results, vacancies, tiebreak_col=None, include_ties=include_ties)
+        for career, k in vacancies.items():
+            scores = df_results[f'career_{career}']
+            cutoff = scores.sort_values(ascending=False).iloc[k - 1]
+            expected_count = (scores >= cutoff).sum() if include_ties else k
+            career_rows = admitted[admitted['career'] == career]
+            assert len(career_rows) == expected_count
+            assert career_rows['score'].min() == cutoff
+            assert cutoffs.set_index('career').loc[career, 'cutoff_score'] == cutoff
+
+    applicant_career = pd.Series(np.where(np.arange(len(df_results)) % 2 == 0, 'medicina', 'derecho'))
+    admitted, _ = admission_cutoffs(df_results, vacancies, applicant_career=applicant_career)
+    medicina_ids = set(df_results['student_id'][applicant_career == 'medicina'])
+    assert set(admitted.loc[admitted['career'] == 'medicina', 'student_id']) <= medicina_ids
@@ -0,0 +1,36 @@
+import pandas as pd
+
+from frontend.results_cache import ResultsCache, results_key
+
+def _key_df(answer: int = 0):
+    return pd.DataFrame({'version': ['A'] * 3, 'question_id': [1, 2, 3], 'correct_answer': [answer] * 3})
+
+def test_results_key_changes_with_inputs():
+    """
+    Verifica que la clave cambie con el dataset, la clave de respuestas, la regla o la evaluación desde
+    disco, y no con chunk_size.
+    """
+    config = {"chunk_size": 0, "scoring": {"correct": 20.0, "wrong": -1.125, "blank": 0.0}}
+    base = results_key('responses-abc', _key_df(), config)
+
+    assert results_key('responses-abc', _key_df(), {**config, "chunk_size": 5000}) == base
+    assert results_key('responses-def', _key_df(), config) != base
+    assert results_key('responses-abc', _key_df(answer=1), config) != base
+    assert results_key('responses-abc', _key_df(), {**config, "scoring": {"correct": 10.0, "wrong": 0.0, "blank": 0.0}}) != base
+    assert results_key('responses-abc', _key_df(), config, out_of_core=True) != base
+
+def test_hits_misses_and_lru():
+    """
+    Verifica los contadores de aciertos y fallos y el desalojo de la entrada usada hace más tiempo.
+    """
+    cache = ResultsCache(max_entries=2)
+    results_df = pd.DataFrame({'score': [1.0]})
+
+    assert cache.get('a') is None
+    cache.put('a', results_df)
+    cache.put('b', results_df)
+    assert cache.get('a') is results_df
+    cache.put('c', results_df)
+
+    assert cache.get('b') is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "hit_rate": 0.3333, "entries": 2, "max_entries": 2}
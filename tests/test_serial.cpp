@@ -101,8 +101,244 @@ TEST(OpenMPTest, StudentAnswers) {
     assert(result[2].score == 2);
 }
 
+TEST(EncoderTest, LookupTable) {
+    const uint8_t cells[8] = {'A', 'b', 'C', 'd', ' ', 'E', '\0', 'a'};
+    int8_t out[8];
+
+    encode_answers(cells, 8, out);
+
+    const int8_t expected[8] = {0, 1, 2, 3, -1, -1, -1, 0};
+    for (int i = 0; i < 8; ++i) {
+        ASSERT_EQ(out[i], expected[i]);
+    }
+
+    encode_answers(cells, 8, out, -2);
+    ASSERT_EQ(out[4], -1);  // espacio: blanco
+    ASSERT_EQ(out[5], -2);  // 'E': fuera de dominio
+}
+
+TEST(PackedTest, MatchesSerial) {
+    int8_t answers[15] = {
+        1, 2, -1, 1, 2,
+        2, 1, 2, -1, 1,
+        -1, 2, 1, 3, 0
+    };
+    int8_t key[5] = {1, 2, 1, 2, -1};
+    ScoringRule rule = {4, -1, 0};
+    Result expected[3];
+    Result result[3];
+    uint64_t packed[3 * kPackedPlanes];
+
+    ASSERT_EQ(packed_words(5), 1u);
+    evaluate_serial(answers, 3, key, 5, rule, expected);
+    ASSERT_TRUE(pack_answers(answers, 3, 5, packed));
+    evaluate_packed(packed, 3, key, 5, rule, result);
+
+    for (int i = 0; i < 3; ++i) {
+        ASSERT_EQ(result[i].correct, expected[i].correct);
+        ASSERT_EQ(result[i].wrong, expected[i].wrong);
+        ASSERT_EQ(result[i].blank, expected[i].blank);
+        ASSERT_DOUBLE_EQ(result[i].score, expected[i].score);
+    }
+}
+
+TEST(PackedTest, ReportsCodesOutsideDomain) {
+    int8_t answers[4] = {0, -1, 3, -2};
+    uint64_t packed[kPackedPlanes];
+
+    ASSERT_TRUE(pack_answers(answers, 1, 3, packed));
+    ASSERT_FALSE(pack_answers(answers, 1, 4, packed));
+}
+
+TEST(VersionsTest, UsesKeyOfEachStudent) {
+    int8_t answers[10] = {
+        0, 1, 2, 3, -1,
+        0, 1, 2, 3, -1
+    };
+    int8_t keys[10] = {
+        0, 1, 2, 3, 0,
+        3, 2, 1, 0, 0
+    };
+    int32_t version_index[2] = {0, 1};
+    ScoringRule rule = {1, 0, 0};
+    Result result[2];
+
+    evaluate_versions(answers, 2, keys, 2, version_index, 5, rule, result);
+
+    ASSERT_EQ(result[0].correct, 4u);
+    ASSERT_EQ(result[0].wrong, 0u);
+    ASSERT_EQ(result[0].blank, 1u);
+    ASSERT_EQ(result[1].correct, 0u);
+    ASSERT_EQ(result[1].wrong, 4u);
+    ASSERT_EQ(result[1].blank, 1u);
+}
+
+TEST(WeightedTest, PerQuestionWeights) {
+    int8_t answers[10] = {
+        0, 1, -1, 3, 2,
+        0, 0, 0, 0, 0
+    };
+    int8_t key[5] = {0, 1, 2, 3, -1};
+    double correct[5] = {1, 2, 3, 4, 5};
+    double wrong[5] = {-1, -1, -1, -1, -0.5};
+    double blank[5] = {0.5, 0.5, 0.5, 0.5, 0.5};
+    QuestionWeights weights = {correct, wrong, blank};
+    Result serial[2];
+    Result openmp[2];
+    Result pthreads[2];
+
+    evaluate_weighted_serial(answers, 2, key, 5, weights, serial);
+    evaluate_weighted_openmp(answers, 2, key, 5, weights, openmp);
+    evaluate_weighted_pthreads(answers, 2, key, 5, weights, pthreads);
+
+    ASSERT_EQ(serial[0].correct, 3u);
+    ASSERT_EQ(serial[0].wrong, 1u);
+    ASSERT_EQ(serial[0].blank, 1u);
+    ASSERT_DOUBLE_EQ(serial[0].score, 1 + 2 + 4 - 0.5 + 0.5);
+    ASSERT_EQ(serial[1].correct, 1u);
+    ASSERT_EQ(serial[1].wrong, 4u);
+    ASSERT_DOUBLE_EQ(serial[1].score, 1 - 1 - 1 - 1 - 0.5);
+    for (int i = 0; i < 2; ++i) {
+        ASSERT_DOUBLE_EQ(openmp[i].score, serial[i].score);
+        ASSERT_DOUBLE_EQ(pthreads[i].score, serial[i].score);
+        ASSERT_EQ(pthreads[i].correct, serial[i].correct);
+    }
+}
+
+TEST(SectionsTest, SubscoresAndComposites) {
+    int8_t answers[5] = {0, 1, 2, 3, 0};
+    int8_t key[5] = {0, 1, 0, 3, 0};
+    int32_t sections[5] = {0, 0, 1, 1, -1};
+    ScoringRule rule = {2, -1, 0};
+    Result result[1];
+    double subscores[2];
+    double coefficients[4] = {
+        1.0, 0.0,
+        0.5, 0.5
+    };
+    double composites[2];
+
+    evaluate_sections(answers, 1, key, 5, sections, 2, rule, result, subscores);
+    combine_sections(subscores, 1, 2, coefficients, 2, composites);
+
+    ASSERT_DOUBLE_EQ(result[0].score, 7);
+    ASSERT_DOUBLE_EQ(subscores[0], 4);
+    ASSERT_DOUBLE_EQ(subscores[1], 1);
+    ASSERT_DOUBLE_EQ(composites[0], 4);
+    ASSERT_DOUBLE_EQ(composites[1], 2.5);
+}
+
+TEST(ItemAnalysisTest, CountsDifficultyAndDiscrimination) {
+    // 4 estudiantes x 2 preguntas; grupos de 1 estudiante (fracción 0.25)
+    int8_t answers[8] = {
+        0, 1,
+        0, -1,
+        1, 2,
+        -1, 1
+    };
+    int8_t key[2] = {0, 1};
+    double scores[4] = {10, 5, 1, 3};
+    uint64_t counts[2 * kItemOptions];
+    double difficulty[2];
+    double discrimination[2];
+
+    item_analysis(answers, 4, key, 2, scores, 0.25, counts, difficulty, discrimination);
+
+    ASSERT_EQ(counts[0], 2u);
+    ASSERT_EQ(counts[1], 1u);
+    ASSERT_EQ(counts[4], 1u);
+    ASSERT_EQ(counts[kItemOptions + 1], 2u);
+    ASSERT_EQ(counts[kItemOptions + 4], 1u);
+    ASSERT_DOUBLE_EQ(difficulty[0], 0.5);
+    ASSERT_DOUBLE_EQ(difficulty[1], 0.5);
+    ASSERT_DOUBLE_EQ(discrimination[0], 1.0);
+    ASSERT_DOUBLE_EQ(discrimination[1], 1.0);
+}
+
+TEST(RescoreTest, AppliesOnlyChangedQuestions) {
+    int8_t answers[6] = {
+        0, 1, 2,
+        -1, 3, 1
+    };
+    int8_t key[3] = {0, 1, 1};
+    ScoringRule rule = {4, -1, 0};
+    Result results[2];
+
+    evaluate_serial(answers, 2, key, 3, rule, results);
+    // Pregunta 1 corregida (B -> D) y pregunta 2 anulada
+    int32_t questions[2] = {1, 2};
+    int8_t old_codes[2] = {1, 1};
+    int8_t new_codes[2] = {3, kAnnulledKey};
+    rescore_questions(answers, 2, 3, questions, old_codes, new_codes, 2, rule, results);
+
+    ASSERT_DOUBLE_EQ(results[0].score, 3);
+    ASSERT_EQ(results[0].correct, 1u);
+    ASSERT_EQ(results[0].wrong, 1u);
+    ASSERT_DOUBLE_EQ(results[1].score, 4);
+    ASSERT_EQ(results[1].correct, 1u);
+    ASSERT_EQ(results[1].wrong, 0u);
+    ASSERT_EQ(results[1].blank, 1u);
+}
+
+TEST(SimdTest, AllInstructionSetsMatchSerial) {
+    // 37 preguntas: un bloque AVX2, un resto SSE2 y una cola escalar
+    const size_t num_students = 3;
+    const size_t num_questions = 37;
+    int8_t answers[num_students * num_questions];
+    int8_t key[num_questions];
+    for (size_t j = 0; j < num_questions; ++j) {
+        key[j] = static_cast<int8_t>(j % 5 == 4 ? -1 : j % 4);
+        for (size_t i = 0; i < num_students; ++i) {
+            answers[i * num_questions + j] = static_cast<int8_t>((i + 3 * j) % 6) - 2;
+        }
+    }
+    ScoringRule rule = {4, -1, 0};
+    Result expected[num_students];
+    Result results[num_students];
+    evaluate_serial(answers, num_students, key, num_questions, rule, expected);
+
+    const SimdLevel original = simd_level();
+    for (SimdLevel level : {SimdLevel::AVX2, SimdLevel::SSE2, SimdLevel::Scalar}) {
+        set_simd_level(level);
+        evaluate_simd(answers, num_students, key, num_questions, rule, results);
+        for (size_t i = 0; i < num_students; ++i) {
+            ASSERT_DOUBLE_EQ(results[i].score, expected[i].score);
+            ASSERT_EQ(results[i].correct, expected[i].correct);
+            ASSERT_EQ(results[i].wrong, expected[i].wrong);
+            ASSERT_EQ(results[i].blank, expected[i].blank);
+        }
+    }
+    set_simd_level(original);
+}
+
+TEST(RankingTest, CompetitionDenseAndTopK) {
+    double scores[5] = {10, 30, 20, 30, 20};
+    double tiebreak[5] = {0, 1, 5, 1, 5};
+    int32_t order[5];
+    uint32_t ranks[5];
+
+    rank_scores(scores, tiebreak, 5, RankMethod::Competition, order, ranks);
+    ASSERT_EQ(order[0], 1);
+    ASSERT_EQ(order[4], 0);
+    ASSERT_EQ(ranks[1], 1u);
+    ASSERT_EQ(ranks[3], 1u);
+    ASSERT_EQ(ranks[2], 3u);
+    ASSERT_EQ(ranks[0], 5u);
+    rank_scores(scores, tiebreak, 5, RankMethod::Dense, order, ranks);
+    ASSERT_EQ(ranks[2], 2u);
+    ASSERT_EQ(ranks[0], 3u);
+
+    // Tres vacantes: el tercero empata con el cuarto (20, desempate 5), que también ingresa
+    uint32_t vacancies[1] = {3};
+    std::vector<std::vector<int32_t>> selected;
+    select_top_k(scores, 5, 1, tiebreak, NULL, vacancies, true, selected);
+    ASSERT_EQ(selected[0].size(), 4u);
+    select_top_k(scores, 5, 1, tiebreak, NULL, vacancies, false, selected);
+    ASSERT_EQ(selected[0].size(), 3u);
+}
+
 int main() {
     // Aquí se ejecutarán las pruebas de GTest si se configura así.
     // Para este ejercicio, solo se requiere la estructura.
     return 0;
-}
\ No newline at end of file
+}
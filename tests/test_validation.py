@@ -1,8 +1,10 @@
 import pytest
 import pandas as pd
+import numpy as np
 import json
 import os
-from frontend.validation import validate_and_load_responses, validate_and_load_answer_key
+from frontend.encoding import INVALID_CODE
+from frontend.validation import validate_and_load_responses, validate_and_load_answer_key, validate_response_arrays, validate_key_arrays
 
 # Rutas a los archivos de prueba
 RESPONSES_FILE = "data/respuestas_postulantes.xlsx"
@@ -44,6 +46,32 @@ def test_validate_and_load_responses():
     # assert "DNI inválido" in errors[0]['message']
     # assert "Respuesta inválida" in errors[1]['message']
 
+@pytest.mark.parametrize("extension", ["xlsx", "csv"])
+def test_invalid_answer_message_keeps_raw_value(tmp_path, monkeypatch, extension):
+    """
+    Verifica que el mensaje de una respuesta inválida muestre el valor original de la celda.
+    """
+    monkeypatch.chdir(tmp_path)
+    responses = pd.DataFrame([['A'] * 100, ['B'] * 100, ['C'] * 100], columns=[f'answer_{i + 1}' for i in range(100)])
+    responses.loc[1, 'answer_20'] = 'X'
+    responses.loc[2, 'answer_100'] = 'Z'
+    responses.insert(0, 'DNI', ['12345678', '23456789', '34567890'])
+    path = f'respuestas.{extension}'
+    if extension == 'xlsx':
+        responses.to_excel(path, index=False)
+    else:
+        responses.to_csv(path, index=False)
+
+    df_responses = validate_and_load_responses(path)
+
+    assert df_responses['DNI'].tolist() == ['12345678']
+    with open(LOG_RESPONSES_FILE, 'r') as f:
+        errors = [log['message'] for log in map(json.loads, f) if log['level'] == 'ERROR']
+    assert errors == [
+        "Fila 1, Columna answer_20: Respuesta inválida: X",
+        "Fila 2, Columna answer_100: Respuesta inválida: Z",
+    ]
+
 def test_validate_and_load_answer_key():
     """
     Verifica que validate_and_load_answer_key carga correctamente la clave de respuestas.
@@ -56,4 +84,53 @@ def test_validate_and_load_answer_key():
     
     # Verificar algunos valores esperados si se conoce la estructura de la clave
     # assert answer_key[1] == 0 # Ejemplo: pregunta 1, respuesta A (0)
-    # assert answer_key[100] == 3 # Ejemplo: pregunta 100, respuesta D (3)
\ No newline at end of file
+    # assert answer_key[100] == 3 # Ejemplo: pregunta 100, respuesta D (3)
+
+def test_validate_response_arrays():
+    """
+    Verifica las máscaras vectorizadas: formato de DNI, duplicados y respuestas fuera de dominio.
+    """
+    student_ids = np.array(['12345678', '1234567', '87654321', '87654321', '11111111', '22222222'])
+    answers = np.zeros((6, 100), dtype=np.int8)
+    answers[1, 5] = INVALID_CODE  # ya inválida por DNI: solo se reporta el DNI
+    answers[4, 10] = INVALID_CODE
+    answers[4, 20] = INVALID_CODE  # solo se reporta la primera celda inválida de la fila
+
+    requested = []
+
+    def read_cells(cells):
+        requested.extend(cells)
+        return {(4, 10): 'X'}
+
+    valid_mask, errors = validate_response_arrays(student_ids, answers, read_cells)
+
+    assert valid_mask.tolist() == [True, False, False, False, False, True]
+    assert errors == [
+        "Fila 1: DNI inválido (formato o longitud): 1234567",
+        "Fila 2: DNI duplicado: 87654321",
+        "Fila 3: DNI duplicado: 87654321",
+        "Fila 4, Columna answer_11: Respuesta inválida: X",
+    ]
+    # Solo se releen las celdas que se reportan
+    assert requested == [(4, 10)]
+
+def test_validate_key_arrays_multiple_versions():
+    """
+    Verifica la validación vectorizada de claves de varias versiones en una sola llamada.
+    """
+    versions = np.array(['A', 'A', 'A', 'A', 'B', 'B', 'B'])
+    question_ids = np.array([1, 2, 2, np.nan, 1, 3, 2], dtype=np.float64)
+    key_codes = np.array([0, 1, 2, 3, INVALID_CODE, 3, 2], dtype=np.int8)
+
+    labels = np.array(['A', 'B', 'C', 'D', 'E', 'D', 'C'])
+
+    keys, errors = validate_key_arrays(versions, question_ids, key_codes, num_questions=3, labels=labels)
+
+    assert keys['A'].tolist() == [0, 1, -1]
+    assert keys['B'].tolist() == [-1, -1, 3]
+    assert errors == [
+        "Fila 2: question_id inválido o fuera de secuencia: 2 (versión A)",
+        "Fila 3: question_id no es un número entero: nan (versión A)",
+        "Fila 4: correct_answer inválida: E (question_id 1) (versión B)",
+        "Fila 6: question_id inválido o fuera de secuencia: 2 (versión B)",
+    ]